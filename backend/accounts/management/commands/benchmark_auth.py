@@ -0,0 +1,78 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIRequestFactory
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+from school_report_saas.authentication import CachedJWTAuthentication, invalidate_auth_user
+from school_report_saas.tenant import invalidate_tenant
+from schools.dashboard import invalidate_dashboard
+from schools.models import School
+from schools.provisioning import provision_school
+from schools.views import SchoolDashboardView
+
+
+class Command(BaseCommand):
+    help = 'Compare queries and latency per request for stock and cached JWT authentication (seeded data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=50, help='Timed requests per authentication class')
+
+    def handle(self, *args, **options):
+        self.repeat = options['repeat']
+
+        with transaction.atomic():
+            user = self._seed()
+            host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost')
+            self.factory = APIRequestFactory(HTTP_HOST=host)
+            self.token = str(RefreshToken.for_user(user).access_token)
+
+            results = [
+                (label, *self._measure(auth_class))
+                for label, auth_class in (('JWTAuthentication', JWTAuthentication),
+                                          ('CachedJWTAuthentication', CachedJWTAuthentication))
+            ]
+            transaction.set_rollback(True)
+        # The rows are gone; drop what the run cached for them
+        invalidate_auth_user(user)
+        invalidate_tenant(user.school_id)
+        invalidate_dashboard(user.school_id)
+
+        for label, queries, elapsed in results:
+            self.stdout.write(f"{label:<26} {queries:3d} queries {elapsed * 1000:8.2f} ms")
+
+    def _seed(self):
+        school = School.objects.create(
+            name='Auth Benchmark', address='-', location='-', phone_number='0',
+            email='auth-benchmark@example.com'
+        )
+        user = User.objects.create_user(
+            email='auth-benchmark@example.com', password=None, first_name='Bench', last_name='Mark',
+            role='SCHOOL_ADMIN', school=school
+        )
+        provision_school(school)
+        return user
+
+    def _get(self, view):
+        request = self.factory.get('/api/schools/dashboard/', HTTP_AUTHORIZATION=f'Bearer {self.token}')
+        response = view(request)
+        response.render()
+        assert response.status_code == 200, response.status_code
+        return response
+
+    def _measure(self, auth_class):
+        """Queries on a warm request, and the median latency over ``repeat`` requests"""
+        view = SchoolDashboardView.as_view(authentication_classes=[auth_class])
+        self._get(view)  # warm up the user, tenant and dashboard caches
+        with CaptureQueriesContext(connection) as queries:
+            self._get(view)
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self._get(view)
+            timings.append(time.perf_counter() - start)
+        return len(queries), statistics.median(timings)
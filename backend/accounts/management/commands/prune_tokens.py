@@ -0,0 +1,25 @@
+from django.core.management.base import BaseCommand
+from rest_framework_simplejwt.token_blacklist.models import BlacklistedToken, OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+from accounts.tokens import PRUNE_BATCH_SIZE, prune_expired_tokens
+
+
+class Command(BaseCommand):
+    help = 'Delete expired refresh tokens and their blacklist entries in batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=PRUNE_BATCH_SIZE, help='Rows deleted per transaction')
+        parser.add_argument('--dry-run', action='store_true', help='Only report how many rows would be deleted')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            now = aware_utcnow()
+            outstanding = OutstandingToken.objects.filter(expires_at__lte=now).count()
+            blacklisted = BlacklistedToken.objects.filter(token__expires_at__lte=now).count()
+            self.stdout.write(f"Would delete {outstanding} expired tokens ({blacklisted} blacklisted)")
+            return
+
+        outstanding, blacklisted = prune_expired_tokens(batch_size=options['batch_size'])
+        self.stdout.write(self.style.SUCCESS(
+            f"Deleted {outstanding} expired tokens ({blacklisted} blacklisted)"
+        ))
@@ -0,0 +1,19 @@
+from django.db import migrations
+
+# token_blacklist only indexes jti; pruning scans by expires_at
+INDEX_NAME = 'token_outstanding_expires_idx'
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0002_initial'),
+        ('token_blacklist', '0012_alter_outstandingtoken_user'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            f'CREATE INDEX IF NOT EXISTS {INDEX_NAME} ON token_blacklist_outstandingtoken (expires_at)',
+            f'DROP INDEX IF EXISTS {INDEX_NAME}',
+        ),
+    ]
@@ -1,11 +1,16 @@
 from rest_framework import serializers
 from django.contrib.auth import get_user_model
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_str
+from django.utils.http import urlsafe_base64_decode
 from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
-from schools.models import School, AcademicYear, Term, Subject, GradingScale
-from datetime import date
+from schools.models import School
+from schools.provisioning import DEFAULT_TEMPLATE, provision_school
 
 User = get_user_model()
 
+REGISTRATION_TEMPLATE = {**DEFAULT_TEMPLATE, 'class_sections': ['A']}
+
 
 class UserSerializer(serializers.ModelSerializer):
     """User serializer"""
@@ -64,7 +69,7 @@ class SchoolRegistrationSerializer(serializers.Serializer):
         validated_data.pop('password_confirm')
         school_name = validated_data.pop('school_name')
         admin_email = validated_data.pop('admin_email')
-        levels = validated_data.pop('levels', ['BOTH'])
+        levels = validated_data.pop('levels', None) or ['BOTH']
 
         # Create School
         school = School.objects.create(
@@ -76,47 +81,9 @@ class SchoolRegistrationSerializer(serializers.Serializer):
             subscription_plan='FREE'
         )
 
-        # Create initial academic year & term
-        today = date.today()
-        year_span = f"{today.year}/{today.year+1}" if today.month >= 9 else f"{today.year-1}/{today.year}"
-        academic_year = AcademicYear.objects.create(
-            school=school,
-            name=year_span,
-            start_date=date(today.year if today.month>=9 else today.year-1, 9, 1),
-            end_date=date(today.year+1 if today.month>=9 else today.year, 7, 31),
-            is_current=True
-        )
-        Term.objects.create(
-            academic_year=academic_year,
-            name='FIRST',
-            start_date=academic_year.start_date,
-            end_date=date(academic_year.start_date.year, 12, 15),
-            is_current=True,
-            total_days=0
-        )
-
-        # Default grading scale (Ghana style)
-        default_grades = [
-            ('A', 80, 100, 'Excellent'),
-            ('B', 70, 79, 'Very Good'),
-            ('C', 60, 69, 'Good'),
-            ('D', 50, 59, 'Average'),
-            ('E', 40, 49, 'Pass'),
-            ('F', 0, 39, 'Fail'),
-        ]
-        for grade, min_s, max_s, remark in default_grades:
-            GradingScale.objects.create(school=school, grade=grade, min_score=min_s, max_score=max_s, remark=remark)
-
-        # Default subjects minimal set
-        base_subjects = [
-            ('English Language','ENG','BOTH'),
-            ('Mathematics','MATH','BOTH'),
-            ('Integrated Science','SCI','BOTH'),
-            ('Creative Art','ART','BOTH'),
-            ('Computing','COMP','BOTH'),
-        ]
-        for name, code, cat in base_subjects:
-            Subject.objects.get_or_create(name=name, code=code, defaults={'category': cat})
+        # Current academic year, first term, grading scale, default subjects and
+        # one section per level in the chosen level groups
+        provision_school(school, REGISTRATION_TEMPLATE, levels=levels)
 
         # Create Admin User
         user = User.objects.create_user(
@@ -151,6 +118,28 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
         return data
 
 
+class SetPasswordSerializer(serializers.Serializer):
+    """First password from the one-time link in a welcome email"""
+
+    uid = serializers.CharField()
+    token = serializers.CharField()
+    new_password = serializers.CharField(required=True, min_length=8)
+    confirm_password = serializers.CharField(required=True, min_length=8)
+
+    def validate(self, attrs):
+        if attrs['new_password'] != attrs['confirm_password']:
+            raise serializers.ValidationError({"new_password": "Passwords do not match"})
+        try:
+            user = User.objects.get(pk=force_str(urlsafe_base64_decode(attrs['uid'])))
+        except (TypeError, ValueError, OverflowError, User.DoesNotExist):
+            user = None
+        # The token covers the password hash, so it stops working once used
+        if user is None or not default_token_generator.check_token(user, attrs['token']):
+            raise serializers.ValidationError({"token": "This link is invalid or has expired"})
+        attrs['user'] = user
+        return attrs
+
+
 class ChangePasswordSerializer(serializers.Serializer):
     """Change password serializer"""
     
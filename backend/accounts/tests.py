@@ -0,0 +1,108 @@
+from datetime import date
+from unittest import mock
+from urllib.parse import parse_qsl, urlsplit
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from school_report_saas.authentication import auth_user_cache_key
+from schools.models import Class
+from schools.tests import make_school
+from teachers.email_utils import set_password_url, welcome_email
+from teachers.models import Teacher
+from .models import User
+
+
+class CachedJWTAuthenticationTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _, self.admin = make_school()
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.admin).access_token}')
+
+    def get(self):
+        return self.client.get('/api/schools/classes/').status_code
+
+    def deactivate_without_signal(self):
+        User.objects.filter(pk=self.admin.pk).update(is_active=False)
+
+    def test_shared_cache_serves_user_until_invalidated(self):
+        self.assertEqual(self.get(), 200)
+        self.deactivate_without_signal()
+        self.assertEqual(self.get(), 200)
+        self.admin.refresh_from_db()
+        self.admin.save()
+        self.assertEqual(self.get(), 401)
+
+    def test_cache_key_follows_the_user_id_claim(self):
+        self.assertEqual(self.get(), 200)
+        self.assertIsNotNone(cache.get(auth_user_cache_key(self.admin.id)))
+        # simplejwt reads these from api_settings, which override_settings does not reach
+        with mock.patch.object(api_settings, 'USER_ID_FIELD', 'email'), mock.patch.object(api_settings, 'USER_ID_CLAIM', 'email'):
+            token = RefreshToken.for_user(self.admin).access_token
+            self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {token}')
+            self.assertEqual(self.get(), 200)
+            key = auth_user_cache_key(self.admin.email)
+            self.assertEqual(key, 'auth-user:email:admin@school@example.com')
+            self.assertIsNotNone(cache.get(key))
+            self.admin.save()
+            self.assertIsNone(cache.get(key))
+
+    @override_settings(CACHE_USER_STATE=False)
+    def test_without_a_fast_cache_loads_user_every_request(self):
+        self.assertEqual(self.get(), 200)
+        self.deactivate_without_signal()
+        self.assertEqual(self.get(), 401)
+
+
+class SchoolRegistrationTests(TestCase):
+    def register(self, email, **extra):
+        return APIClient().post('/api/auth/register-school/', {
+            'school_name': 'New School', 'admin_email': email,
+            'password': 'long-password-1', 'password_confirm': 'long-password-1', **extra,
+        }, format='json')
+
+    def class_levels(self, response):
+        return set(Class.objects.filter(school_id=response.data['school']['id']).values_list('level', flat=True))
+
+    def test_creates_classes_for_chosen_levels(self):
+        response = self.register('jhs@example.com', levels=['JHS'])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(self.class_levels(response), {'BASIC_7', 'BASIC_8', 'BASIC_9'})
+
+    def test_no_levels_means_both(self):
+        response = self.register('both@example.com', levels=[])
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(self.class_levels(response)), 9)
+
+
+class SetPasswordTests(TestCase):
+    def setUp(self):
+        _, self.admin = make_school()
+
+    def post(self, url, password='new-password-1'):
+        query = dict(parse_qsl(urlsplit(url).query))
+        return APIClient().post('/api/auth/set-password/', {
+            **query, 'new_password': password, 'confirm_password': password,
+        })
+
+    def test_link_sets_password_once(self):
+        url = set_password_url(self.admin)
+        self.assertEqual(self.post(url).status_code, 200)
+        self.admin.refresh_from_db()
+        self.assertTrue(self.admin.check_password('new-password-1'))
+
+        response = self.post(url, 'other-password-2')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('token', response.data)
+        self.admin.refresh_from_db()
+        self.assertTrue(self.admin.check_password('new-password-1'))
+
+    def test_welcome_email_has_link_not_password(self):
+        teacher = Teacher.objects.create(user=self.admin, school=self.admin.school, employee_id='T1', hire_date=date.today())
+        context = welcome_email(teacher)['context']
+        self.assertNotIn('password', context)
+        self.assertEqual(self.post(context['set_password_url']).status_code, 200)
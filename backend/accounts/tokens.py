@@ -0,0 +1,75 @@
+"""
+Refresh token rotation backed by the token_blacklist app.
+
+Every refresh blacklists the token it replaces, so the outstanding and
+blacklisted tables grow with use; prune_expired_tokens (run by the
+prune_tokens command) removes rows whose tokens have expired anyway.
+
+With TOKEN_DENYLIST_CACHE on, blacklisted jtis are also written to the shared
+cache until the token expires, and refresh checks the cache instead of the
+table. The cache is then the source of truth, so only enable it with a cache
+every worker shares and that is not flushed (e.g. Redis), never LocMem.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt import serializers as jwt_serializers
+from rest_framework_simplejwt import tokens
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.token_blacklist.models import OutstandingToken
+from rest_framework_simplejwt.utils import aware_utcnow
+
+PRUNE_BATCH_SIZE = 1000
+
+
+def denylist_enabled():
+    return getattr(settings, 'TOKEN_DENYLIST_CACHE', False)
+
+
+def denylist_cache_key(jti):
+    return f"token-denylist:{jti}"
+
+
+class RefreshToken(tokens.RefreshToken):
+    """RefreshToken that consults the cache denylist when it is enabled"""
+
+    def check_blacklist(self):
+        if not denylist_enabled():
+            return super().check_blacklist()
+        if cache.get(denylist_cache_key(self.payload[api_settings.JTI_CLAIM])):
+            raise TokenError(_("Token is blacklisted"))
+
+    def blacklist(self):
+        result = super().blacklist()
+        if denylist_enabled():
+            remaining = int(self.payload['exp'] - aware_utcnow().timestamp())
+            cache.set(denylist_cache_key(self.payload[api_settings.JTI_CLAIM]), True, max(remaining, 1))
+        return result
+
+
+class TokenRefreshSerializer(jwt_serializers.TokenRefreshSerializer):
+    token_class = RefreshToken
+
+
+def prune_expired_tokens(batch_size=PRUNE_BATCH_SIZE, now=None):
+    """
+    Delete outstanding tokens that have expired, with their blacklist entries.
+
+    Works through the rows in batches of ``batch_size`` so no single DELETE
+    holds locks on the whole table. Returns (outstanding, blacklisted) counts.
+    """
+    cutoff = now or aware_utcnow()
+    outstanding = blacklisted = 0
+    while True:
+        ids = list(OutstandingToken.objects.filter(expires_at__lte=cutoff)
+                   .order_by('expires_at').values_list('id', flat=True)[:batch_size])
+        if not ids:
+            break
+        with transaction.atomic():
+            _, counts = OutstandingToken.objects.filter(id__in=ids).delete()
+        outstanding += counts.get('token_blacklist.OutstandingToken', 0)
+        blacklisted += counts.get('token_blacklist.BlacklistedToken', 0)
+    return outstanding, blacklisted
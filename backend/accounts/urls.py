@@ -5,6 +5,7 @@ from .views import (
     RegisterView,
     UserProfileView,
     ChangePasswordView,
+    SetPasswordView,
     UserListView,
     CreateTeacherView,
     RegisterSchoolView,
@@ -17,6 +18,7 @@ urlpatterns = [
     path('register-school/', RegisterSchoolView.as_view(), name='register_school'),
     path('profile/', UserProfileView.as_view(), name='profile'),
     path('change-password/', ChangePasswordView.as_view(), name='change_password'),
+    path('set-password/', SetPasswordView.as_view(), name='set_password'),
     path('users/', UserListView.as_view(), name='user_list'),
     path('teachers/create/', CreateTeacherView.as_view(), name='create_teacher'),
 ]
@@ -10,6 +10,7 @@ from .serializers import (
     UserRegistrationSerializer, 
     CustomTokenObtainPairSerializer,
     ChangePasswordSerializer,
+    SetPasswordSerializer,
     SchoolRegistrationSerializer
 )
 
@@ -17,35 +18,20 @@ User = get_user_model()
 from schools.models import Class as SchoolClass
 
 
-class CORSMixin:
-    """Mixin to add CORS headers to all responses"""
-    
-    def finalize_response(self, request, response, *args, **kwargs):
-        response = super().finalize_response(request, response, *args, **kwargs)
-        
-        # Add CORS headers
-        response['Access-Control-Allow-Origin'] = '*'
-        response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-        response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With'
-        response['Access-Control-Allow-Credentials'] = 'true'
-        
-        return response
-
-
-class CustomTokenObtainPairView(CORSMixin, TokenObtainPairView):
+class CustomTokenObtainPairView(TokenObtainPairView):
     """Custom login view with user data"""
     permission_classes = [permissions.AllowAny]
     serializer_class = CustomTokenObtainPairSerializer
 
 
-class RegisterView(CORSMixin, generics.CreateAPIView):
+class RegisterView(generics.CreateAPIView):
     """User registration view"""
     queryset = User.objects.all()
     permission_classes = [permissions.AllowAny]
     serializer_class = UserRegistrationSerializer
 
 
-class UserProfileView(CORSMixin, generics.RetrieveUpdateAPIView):
+class UserProfileView(generics.RetrieveUpdateAPIView):
     """Get and update user profile"""
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -54,7 +40,7 @@ class UserProfileView(CORSMixin, generics.RetrieveUpdateAPIView):
         return self.request.user
 
 
-class ChangePasswordView(CORSMixin, APIView):
+class ChangePasswordView(APIView):
     """Change user password"""
     permission_classes = [permissions.IsAuthenticated]
     
@@ -81,7 +67,21 @@ class ChangePasswordView(CORSMixin, APIView):
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
-class UserListView(CORSMixin, generics.ListAPIView):
+class SetPasswordView(APIView):
+    """Set a password from a one-time welcome email link"""
+    permission_classes = [permissions.AllowAny]
+
+    def post(self, request):
+        serializer = SetPasswordSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        user = serializer.validated_data['user']
+        user.set_password(serializer.validated_data['new_password'])
+        user.save()
+        return Response({"message": "Password set successfully"}, status=status.HTTP_200_OK)
+
+
+class UserListView(generics.ListAPIView):
     """List users (admin only)"""
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -97,7 +97,7 @@ class UserListView(CORSMixin, generics.ListAPIView):
             return User.objects.filter(id=user.id)
 
 
-class CreateTeacherView(CORSMixin, generics.CreateAPIView):
+class CreateTeacherView(generics.CreateAPIView):
     """Create teacher account (school admin only)"""
     serializer_class = UserRegistrationSerializer
     permission_classes = [permissions.IsAuthenticated]
@@ -135,7 +135,7 @@ class CreateTeacherView(CORSMixin, generics.CreateAPIView):
         serializer.save(school=user.school, role='TEACHER')
 
 
-class RegisterSchoolView(CORSMixin, APIView):
+class RegisterSchoolView(APIView):
     """Endpoint for a new school to self-register and obtain JWT tokens"""
     permission_classes = [permissions.AllowAny]
 
@@ -1,7 +1,27 @@
 """
 Gunicorn configuration to prevent worker timeouts and memory issues
 """
+import glob
 import multiprocessing
+import os
+import tempfile
+
+import decouple
+
+# ASGI_MODE=True serves school_report_saas.asgi:application with uvicorn workers,
+# so slow clients wait on the event loop instead of holding a worker
+# (gunicorn reads every module-level name here, hence no bare `config`)
+ASGI_MODE = decouple.config('ASGI_MODE', default=False, cast=bool)
+
+# Workers write request metrics (school_report_saas/metrics.py) to files here so
+# /api/metrics/ can merge them. It must be set before the app imports
+# prometheus_client; files left by an earlier run are removed.
+metrics_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(tempfile.gettempdir(), 'school_report_saas_metrics')
+)
+os.makedirs(metrics_dir, exist_ok=True)
+for stale_file in glob.glob(os.path.join(metrics_dir, "*.db")):
+    os.remove(stale_file)
 
 # Server socket
 bind = "0.0.0.0:8000"
@@ -9,7 +29,8 @@ backlog = 2048
 
 # Worker processes
 workers = multiprocessing.cpu_count() * 2 + 1
-worker_class = "sync"
+worker_class = "uvicorn.workers.UvicornWorker" if ASGI_MODE else "sync"
+wsgi_app = "school_report_saas.asgi:application" if ASGI_MODE else "school_report_saas.wsgi:application"
 worker_connections = 1000
 timeout = 120  # Increase timeout from default 30s
 keepalive = 30
@@ -39,4 +60,18 @@ daemon = False
 pidfile = None
 tmp_upload_dir = None
 user = None
-group = None
\ No newline at end of file
+group = None
+
+def when_ready(server):
+    """With preload_app the app is loaded in the master; warm it once before workers fork"""
+    if not preload_app:
+        return
+    from school_report_saas.warmup import warmup
+    timings = warmup()
+    server.log.info("Warmup: %s", ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in timings.items()))
+
+
+def worker_exit(server, worker):
+    """Write the request counts the worker still batches (school_report_saas/metrics.py) before it exits"""
+    from school_report_saas.metrics import flush_request_counts
+    flush_request_counts()
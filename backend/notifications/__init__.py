@@ -0,0 +1 @@
+# Notifications App
@@ -0,0 +1,11 @@
+from django.contrib import admin
+from .models import OutboxEmail
+
+
+@admin.register(OutboxEmail)
+class OutboxEmailAdmin(admin.ModelAdmin):
+	list_display = ("to_email", "subject", "status", "attempts", "next_attempt_at", "created_at", "sent_at")
+	list_filter = ("status",)
+	search_fields = ("to_email", "subject")
+	# Pending welcome emails carry the teacher's set-password link
+	exclude = ("context",)
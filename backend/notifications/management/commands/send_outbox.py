@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from notifications.outbox import send_pending
+
+
+class Command(BaseCommand):
+    help = 'Deliver queued emails from the outbox'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--limit', type=int, default=100, help='Maximum number of emails per batch')
+        parser.add_argument('--drain', action='store_true',
+                            help='Keep sending batches until no email is due')
+
+    def handle(self, *args, **options):
+        sent = failed = 0
+        while True:
+            batch_sent, batch_failed = send_pending(limit=options['limit'])
+            sent += batch_sent
+            failed += batch_failed
+            # A batch that sent nothing means the queue is empty or the server is down
+            if not options['drain'] or not batch_sent:
+                break
+        self.stdout.write(f"Sent {sent} emails, {failed} failed")
@@ -0,0 +1,42 @@
+from django.db import models
+from schools.models import School
+
+
+class OutboxEmail(models.Model):
+    """Email queued for out-of-band delivery by the send_outbox command"""
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        # Claimed by a send_outbox run; next_attempt_at is when the claim lapses
+        ('SENDING', 'Sending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    school = models.ForeignKey(School, on_delete=models.CASCADE, null=True, blank=True, related_name='outbox_emails')
+    to_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    
+    # Rendered by the worker so enqueueing stays cheap
+    template_name = models.CharField(max_length=255)
+    context = models.JSONField(default=dict, blank=True)
+    
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.IntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    # Set after a failed attempt; the worker skips the row until then
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'email_outbox'
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['status', 'created_at']),
+            models.Index(fields=['status', 'next_attempt_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.subject} -> {self.to_email} ({self.status})"
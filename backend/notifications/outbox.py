@@ -0,0 +1,170 @@
+from datetime import timedelta
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db import transaction
+from django.db.models import Q
+from django.template.loader import render_to_string
+from django.utils.html import strip_tags
+from django.utils import timezone
+from django.conf import settings
+from .models import OutboxEmail
+import logging
+
+logger = logging.getLogger(__name__)
+
+# A failed email is retried after 1, 2, 4 and 8 minutes, then marked FAILED
+MAX_ATTEMPTS = 5
+RETRY_BASE_DELAY = timedelta(minutes=1)
+
+# A claimed (SENDING) email whose worker has not reported back after this long
+# is due again; only the one in flight when a worker dies can be sent twice
+SEND_LEASE = timedelta(minutes=10)
+
+# Dropped from the stored context once an email is finished with; 'password'
+# only appears in welcome emails queued before they switched to a link
+SENSITIVE_CONTEXT_KEYS = ('password', 'set_password_url')
+
+
+def queue_emails(messages):
+    """
+    Queue several emails with a single INSERT
+
+    Args:
+        messages: Iterable of dicts with to_email, subject, template_name and
+            optional context and school keys
+    """
+    rows = [
+        OutboxEmail(
+            school=message.get('school'),
+            to_email=message['to_email'],
+            subject=message['subject'],
+            template_name=message['template_name'],
+            context=message.get('context') or {},
+        )
+        for message in messages
+    ]
+    if rows:
+        OutboxEmail.objects.bulk_create(rows)
+    return len(rows)
+
+
+def queue_email(to_email, subject, template_name, context=None, school=None):
+    """Queue a single email for delivery by the outbox worker"""
+    return OutboxEmail.objects.create(
+        school=school,
+        to_email=to_email,
+        subject=subject,
+        template_name=template_name,
+        context=context or {},
+    )
+
+
+def _build_message(outbox_email, connection):
+    html_message = render_to_string(outbox_email.template_name, outbox_email.context)
+    message = EmailMultiAlternatives(
+        subject=outbox_email.subject,
+        body=strip_tags(html_message),
+        from_email=settings.DEFAULT_FROM_EMAIL,
+        to=[outbox_email.to_email],
+        connection=connection,
+    )
+    message.attach_alternative(html_message, 'text/html')
+    return message
+
+
+def retry_delay(attempts):
+    """Back-off before the next try of an email that has failed ``attempts`` times"""
+    return RETRY_BASE_DELAY * (2 ** (attempts - 1))
+
+
+def _finish(outbox_email, status):
+    outbox_email.status = status
+    outbox_email.next_attempt_at = None
+    for key in SENSITIVE_CONTEXT_KEYS:
+        outbox_email.context.pop(key, None)
+
+
+def _record_failure(outbox_email, error, now):
+    outbox_email.last_error = str(error)
+    if outbox_email.attempts >= MAX_ATTEMPTS:
+        _finish(outbox_email, 'FAILED')
+    else:
+        outbox_email.status = 'PENDING'
+        outbox_email.next_attempt_at = now + retry_delay(outbox_email.attempts)
+
+
+RESULT_FIELDS = ['status', 'attempts', 'sent_at', 'last_error', 'next_attempt_at', 'context']
+
+
+def claim_due(limit, now=None):
+    """
+    Mark up to ``limit`` due emails SENDING and return them
+
+    Rows are locked with SKIP LOCKED while they are claimed, so overlapping
+    workers each get different emails. The claim lasts SEND_LEASE; an email
+    whose lease lapsed on its last attempt is marked FAILED instead.
+    """
+    now = now or timezone.now()
+    due = Q(status='PENDING') & (Q(next_attempt_at__isnull=True) | Q(next_attempt_at__lte=now))
+    abandoned = Q(status='SENDING', next_attempt_at__lte=now)
+    with transaction.atomic():
+        rows = list(
+            OutboxEmail.objects.select_for_update(skip_locked=True)
+            .filter(due | abandoned)
+            .order_by('created_at')[:limit]
+        )
+        batch = []
+        for outbox_email in rows:
+            if outbox_email.attempts >= MAX_ATTEMPTS:
+                outbox_email.last_error = 'Worker stopped before reporting a result'
+                _finish(outbox_email, 'FAILED')
+                continue
+            outbox_email.status = 'SENDING'
+            outbox_email.attempts += 1
+            outbox_email.next_attempt_at = now + SEND_LEASE
+            batch.append(outbox_email)
+        OutboxEmail.objects.bulk_update(rows, RESULT_FIELDS)
+    return batch
+
+
+def send_pending(limit=100):
+    """
+    Deliver up to ``limit`` due emails over one SMTP connection
+
+    Each email's result is saved as soon as it is known. Emails that fail go
+    back to PENDING with an exponential back-off until they reach MAX_ATTEMPTS.
+    Returns a (sent, failed) tuple for this batch.
+    """
+    now = timezone.now()
+    batch = claim_due(limit, now)
+    if not batch:
+        return 0, 0
+
+    sent = failed = 0
+    connection = get_connection()
+    try:
+        connection.open()
+    except Exception as e:
+        # Server unreachable: every email in the batch counts as a failed attempt
+        logger.error(f"Could not connect to the mail server: {str(e)}")
+        for outbox_email in batch:
+            _record_failure(outbox_email, e, now)
+        OutboxEmail.objects.bulk_update(batch, RESULT_FIELDS)
+        return 0, len(batch)
+
+    try:
+        for outbox_email in batch:
+            try:
+                _build_message(outbox_email, connection).send()
+                _finish(outbox_email, 'SENT')
+                outbox_email.sent_at = timezone.now()
+                outbox_email.last_error = ''
+                sent += 1
+            except Exception as e:
+                _record_failure(outbox_email, e, now)
+                failed += 1
+                logger.error(f"Failed to send outbox email {outbox_email.id} to {outbox_email.to_email}: {str(e)}")
+            outbox_email.save(update_fields=RESULT_FIELDS)
+    finally:
+        connection.close()
+
+    return sent, failed
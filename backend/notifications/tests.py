@@ -0,0 +1,99 @@
+from datetime import timedelta
+from unittest import mock
+
+from django.core import mail
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts.models import User
+
+from .models import OutboxEmail
+from .outbox import MAX_ATTEMPTS, claim_due, queue_email, send_pending
+
+WELCOME = {
+    'to_email': 'teacher@example.com',
+    'subject': 'Welcome',
+    'template_name': 'emails/teacher_welcome.html',
+    'context': {'email': 'teacher@example.com', 'set_password_url': 'https://app.example.com/set-password?uid=MQ&token=s3cret-token', 'school': {'name': 'Test School'}},
+}
+
+
+@override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+class OutboxDeliveryTests(TestCase):
+    def test_sends_pending_email_and_drops_link(self):
+        outbox_email = queue_email(**WELCOME)
+        self.assertEqual(send_pending(), (1, 0))
+
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['teacher@example.com'])
+        self.assertEqual(message.subject, 'Welcome')
+        self.assertIn('s3cret-token', message.alternatives[0][0])
+
+        outbox_email.refresh_from_db()
+        self.assertEqual((outbox_email.status, outbox_email.attempts), ('SENT', 1))
+        self.assertNotIn('set_password_url', outbox_email.context)
+        self.assertEqual(send_pending(), (0, 0))
+
+    @override_settings(
+        EMAIL_BACKEND='django.core.mail.backends.smtp.EmailBackend',
+        EMAIL_HOST='127.0.0.1', EMAIL_PORT=1, EMAIL_USE_TLS=False, EMAIL_TIMEOUT=1,
+    )
+    def test_unreachable_server_schedules_retry(self):
+        outbox_email = queue_email(**WELCOME)
+        self.assertEqual(send_pending(), (0, 1))
+
+        outbox_email.refresh_from_db()
+        self.assertEqual((outbox_email.status, outbox_email.attempts), ('PENDING', 1))
+        self.assertIsNotNone(outbox_email.next_attempt_at)
+        self.assertIn('set_password_url', outbox_email.context)
+
+    # The admin pages link static files that collectstatic has not hashed here
+    @override_settings(STATICFILES_STORAGE='django.contrib.staticfiles.storage.StaticFilesStorage')
+    def test_admin_hides_link(self):
+        outbox_email = queue_email(**WELCOME)
+        self.client.force_login(User.objects.create_superuser('root@example.com', 'pw', first_name='R', last_name='T'))
+        response = self.client.get(f'/admin/notifications/outboxemail/{outbox_email.id}/change/')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotContains(response, 's3cret-token')
+
+
+class OutboxClaimTests(TestCase):
+    def test_claimed_email_is_not_claimed_again(self):
+        outbox_email = queue_email(**WELCOME)
+        self.assertEqual(claim_due(10), [outbox_email])
+        outbox_email.refresh_from_db()
+        self.assertEqual((outbox_email.status, outbox_email.attempts), ('SENDING', 1))
+        self.assertEqual(claim_due(10), [])
+
+    def test_lapsed_claim_is_taken_again(self):
+        outbox_email = queue_email(**WELCOME)
+        claim_due(10)
+        later = timezone.now() + timedelta(hours=1)
+        self.assertEqual(claim_due(10, now=later), [outbox_email])
+        outbox_email.refresh_from_db()
+        self.assertEqual((outbox_email.status, outbox_email.attempts), ('SENDING', 2))
+
+    def test_lapsed_claim_on_last_attempt_fails(self):
+        outbox_email = queue_email(**WELCOME)
+        OutboxEmail.objects.filter(pk=outbox_email.pk).update(
+            status='SENDING', attempts=MAX_ATTEMPTS, next_attempt_at=timezone.now(),
+        )
+        self.assertEqual(claim_due(10), [])
+        outbox_email.refresh_from_db()
+        self.assertEqual(outbox_email.status, 'FAILED')
+        self.assertNotIn('set_password_url', outbox_email.context)
+
+    @override_settings(EMAIL_BACKEND='django.core.mail.backends.locmem.EmailBackend')
+    def test_each_result_is_saved_after_its_send(self):
+        queue_email(**WELCOME)
+        queue_email(**WELCOME)
+        statuses = []
+
+        def send(message, *args, **kwargs):
+            statuses.append(list(OutboxEmail.objects.order_by('created_at').values_list('status', flat=True)))
+            return 1
+
+        with mock.patch('notifications.outbox.EmailMultiAlternatives.send', send):
+            self.assertEqual(send_pending(), (2, 0))
+        self.assertEqual(statuses, [['SENDING', 'SENDING'], ['SENT', 'SENDING']])
@@ -0,0 +1,33 @@
+from .models import ReportCard
+from notifications.outbox import queue_emails
+
+
+def queue_guardian_notifications(report_ids):
+    """Queue one email per guardian for the given (just published) report cards"""
+    if not report_ids:
+        return 0
+
+    report_cards = ReportCard.objects.filter(
+        id__in=report_ids
+    ).exclude(
+        student__guardian_email__isnull=True
+    ).exclude(
+        student__guardian_email=''
+    ).select_related('student__school', 'term__academic_year')
+
+    return queue_emails(
+        {
+            'school': report_card.student.school,
+            'to_email': report_card.student.guardian_email,
+            'subject': f'Report Card Published - {report_card.student.school.name}',
+            'template_name': 'emails/report_published.html',
+            'context': {
+                'school': {'name': report_card.student.school.name},
+                'guardian_name': report_card.student.guardian_name,
+                'student_name': report_card.student.get_full_name(),
+                'term_name': str(report_card.term),
+                'report_code': report_card.report_code,
+            },
+        }
+        for report_card in report_cards
+    )
@@ -102,8 +102,13 @@ class ReportGenerator:
             except Exception:
                 return None
 
-        school_logo = _get_image(getattr(getattr(self.school, 'logo', None), 'path', None), 0.8*inch, 0.8*inch)
-        student_photo = _get_image(getattr(getattr(self.student, 'photo', None), 'path', None), 1.2*inch, 1.5*inch)
+        # Prefer the print-sized derivatives built on upload over the originals
+        def _image_path(obj, derivative, original):
+            field_file = getattr(obj, derivative, None) or getattr(obj, original, None)
+            return getattr(field_file, 'path', None) if field_file else None
+
+        school_logo = _get_image(_image_path(self.school, 'report_logo', 'logo'), 0.8*inch, 0.8*inch)
+        student_photo = _get_image(_image_path(self.student, 'report_photo', 'photo'), 1.2*inch, 1.5*inch)
 
         # School Header Section (Logo | School Info | Student Photo)
         header_data = []
@@ -309,6 +314,112 @@ class ReportGenerator:
         self.buffer.seek(0)
         return self.buffer
 
+    def generate_transcript_pdf(self, transcript):
+        """Generate a multi-term academic transcript.
+
+        Parameters
+        ----------
+        transcript : dict
+            Output of ``students.transcript.build_transcript``: student_id, name
+            and a ``terms`` list, each with subjects, aggregates and attendance.
+        """
+        try:
+            from reportlab.lib.pagesizes import A4
+            from reportlab.lib import colors
+            from reportlab.lib.units import inch
+            from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image, KeepTogether
+            from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
+            from reportlab.lib.enums import TA_CENTER
+            from reportlab.lib.utils import ImageReader
+        except Exception as e:
+            raise RuntimeError("reportlab is not installed. Add 'reportlab' to requirements to enable PDF generation.") from e
+
+        doc = SimpleDocTemplate(self.buffer, pagesize=A4,
+                    rightMargin=0.5*inch, leftMargin=0.5*inch,
+                    topMargin=0.4*inch, bottomMargin=0.45*inch)
+        elements = []
+        styles = getSampleStyleSheet()
+        title_style = ParagraphStyle(
+            'TranscriptTitle',
+            parent=styles['Heading1'],
+            fontSize=13,
+            alignment=TA_CENTER,
+            spaceAfter=2,
+            fontName='Helvetica-Bold'
+        )
+        term_style = ParagraphStyle(
+            'TranscriptTerm',
+            parent=styles['Normal'],
+            fontSize=10,
+            fontName='Helvetica-Bold',
+            spaceBefore=6,
+            spaceAfter=3
+        )
+
+        logo_file = getattr(self.school, 'report_logo', None) or getattr(self.school, 'logo', None)
+        logo_path = getattr(logo_file, 'path', None) if logo_file else None
+        if logo_path:
+            try:
+                iw, ih = ImageReader(logo_path).getSize()
+                scale = min(0.8*inch/iw, 0.8*inch/ih)
+                elements.append(Image(logo_path, width=iw*scale, height=ih*scale))
+            except Exception:
+                pass
+
+        elements.append(Paragraph(f"{getattr(self.school, 'name', '')}", title_style))
+        elements.append(Paragraph("ACADEMIC TRANSCRIPT", title_style))
+        elements.append(Spacer(1, 0.08*inch))
+        elements.append(Paragraph(f"NAME: {transcript['name']}    STUDENT ID: {transcript['student_id']}", styles['Normal']))
+        elements.append(Spacer(1, 0.12*inch))
+
+        if not transcript['terms']:
+            elements.append(Paragraph("No results recorded.", styles['Normal']))
+
+        for term in transcript['terms']:
+            heading = f"{term['academic_year']} - {term['term']}"
+            if term['class_name']:
+                heading += f" ({term['class_name']})"
+
+            rows = [['SUBJECT', 'CA', 'EXAM', 'TOTAL', 'GRADE', 'REMARK']]
+            for subject in term['subjects']:
+                rows.append([
+                    subject['subject'], subject['ca_score'], subject['exam_score'],
+                    subject['total_score'], subject['grade'], subject['remark'],
+                ])
+            table = Table(rows, colWidths=[2.3*inch, 0.8*inch, 0.8*inch, 0.8*inch, 0.7*inch, 1.6*inch])
+            table.setStyle(TableStyle([
+                ('BACKGROUND', (0, 0), (-1, 0), colors.lightgrey),
+                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+                ('FONTSIZE', (0, 0), (-1, -1), 8.5),
+                ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+                ('GRID', (0, 0), (-1, -1), 0.5, colors.black),
+                ('TOPPADDING', (0, 0), (-1, -1), 2),
+                ('BOTTOMPADDING', (0, 0), (-1, -1), 2),
+            ]))
+
+            summary = []
+            if term['average_score'] is not None:
+                summary.append(f"AVERAGE: {term['average_score']}")
+            if term['class_position']:
+                summary.append(f"POSITION: {term['class_position']} OUT OF {term['total_students']}")
+            if term['attendance']:
+                attendance = term['attendance']
+                summary.append(
+                    f"ATTENDANCE: {attendance['days_present']} OUT OF "
+                    f"{attendance['days_present'] + attendance['days_absent']}"
+                )
+
+            block = [Paragraph(heading, term_style), table]
+            if summary:
+                block.append(Spacer(1, 0.04*inch))
+                block.append(Paragraph("    ".join(summary), styles['Normal']))
+            elements.append(KeepTogether(block))
+            elements.append(Spacer(1, 0.1*inch))
+
+        doc.build(elements)
+        self.buffer.seek(0)
+        return self.buffer
+
     def _get_grade(self, score):
         """Get grade based on school's grading scale or default"""
         if hasattr(self.school, 'get_grade_for_score'):
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from school_report_saas.serializers import SparseFieldsetMixin
 from .models import ReportCard
 
 
-class ReportCardSerializer(serializers.ModelSerializer):
+class ReportCardSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     student_id = serializers.CharField(source='student.student_id', read_only=True)
     term_name = serializers.CharField(source='term.__str__', read_only=True)
@@ -11,3 +12,9 @@ class ReportCardSerializer(serializers.ModelSerializer):
         model = ReportCard
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at', 'generated_at', 'published_at']
+
+
+class BulkPublishSerializer(serializers.Serializer):
+    term_id = serializers.IntegerField()
+    class_id = serializers.IntegerField(required=False, allow_null=True)
+    report_ids = serializers.ListField(child=serializers.IntegerField(), required=False, allow_empty=True)
@@ -0,0 +1,46 @@
+from datetime import date
+
+from rest_framework.test import APITestCase
+
+from accounts.models import User
+from schools.models import School, AcademicYear, Term
+
+
+class BulkPublishTests(APITestCase):
+    def setUp(self):
+        school = School.objects.create(
+            name='Test School', address='-', location='-', phone_number='0', email='school@example.com'
+        )
+        year = AcademicYear.objects.create(
+            school=school, name='2024/2025', start_date=date(2024, 9, 1), end_date=date(2025, 7, 31), is_current=True
+        )
+        self.term = Term.objects.create(
+            academic_year=year, name='FIRST', start_date=date(2024, 9, 1), end_date=date(2024, 12, 15), is_current=True
+        )
+        admin = User.objects.create_user(
+            email='admin@example.com', password='pw', first_name='A', last_name='D', role='SCHOOL_ADMIN', school=school
+        )
+        self.client.force_authenticate(admin)
+
+    def publish(self, **data):
+        return self.client.post('/api/reports/report-cards/bulk_publish/', data, format='json')
+
+    def test_requires_term(self):
+        response = self.publish()
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('term_id', response.data)
+
+    def test_rejects_non_numeric_class_id(self):
+        response = self.publish(term_id=self.term.id, class_id='abc')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('class_id', response.data)
+
+    def test_rejects_string_report_ids(self):
+        response = self.publish(term_id=self.term.id, report_ids='123')
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('report_ids', response.data)
+
+    def test_publishes_nothing_without_generated_cards(self):
+        response = self.publish(term_id=self.term.id, class_id=None, report_ids=[1, 2])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['published_count'], 0)
@@ -1,6 +1,7 @@
+from django.conf import settings
 from django.urls import path
 from rest_framework.routers import DefaultRouter
-from .views import ReportCardViewSet, template_preview_pdf
+from .views import ReportCardViewSet, template_preview_pdf, verify_report
 
 router = DefaultRouter()
 # Use explicit prefix to avoid action name collision with detail routes
@@ -15,4 +16,7 @@ urlpatterns = [
 	path('template-preview-standalone/', template_preview_pdf, name='template-preview-standalone'),
 ]
 
+if settings.ASGI_MODE:
+	urlpatterns.append(path('report-cards/verify/', verify_report, name='report-card-verify'))
+
 urlpatterns += router.urls
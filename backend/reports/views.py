@@ -1,18 +1,25 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
+from rest_framework.request import Request
 from rest_framework.response import Response
+from django.http import JsonResponse
+from school_report_saas.async_views import async_api_view
+from school_report_saas.pagination import KeysetPaginationMixin
+from school_report_saas.tenant import TenantContextMixin
 from django.core.files.base import ContentFile
 from django.utils import timezone
-from django.db import transaction
+from django.db import transaction, connection
 from .models import ReportCard
-from .serializers import ReportCardSerializer
+from .serializers import ReportCardSerializer, BulkPublishSerializer
 from .pdf_generator import ReportGenerator
+from .notifications import queue_guardian_notifications
 from students.models import Student, Attendance, Behaviour
 from scores.models import SubjectResult, TermResult
 from schools.models import Term
+from schools.stats import adjust_stats
 
 
-class ReportCardViewSet(viewsets.ModelViewSet):
+class ReportCardViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """Report Card management"""
     queryset = ReportCard.objects.all()
     serializer_class = ReportCardSerializer
@@ -25,12 +32,9 @@ class ReportCardViewSet(viewsets.ModelViewSet):
             
             # Class teachers can only see reports for their class students
             if user.role == 'TEACHER':
-                # Find classes where user is class teacher
-                from schools.models import Class
-                teacher_classes = Class.objects.filter(school=user.school, class_teacher=user)
-                if teacher_classes.exists():
+                class_ids = self.tenant.teacher_scope.class_ids
+                if class_ids:
                     # Filter to only students in their classes
-                    class_ids = teacher_classes.values_list('id', flat=True)
                     queryset = queryset.filter(student__current_class_id__in=class_ids)
                 else:
                     # Teacher is not a class teacher, no access to reports
@@ -69,18 +73,11 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         
         try:
             student = Student.objects.get(id=student_id, school=request.user.school)
-            term = Term.objects.get(id=term_id)
+            term = self.tenant.get_term(term_id)
             
             # Check permissions for class teachers
             if request.user.role == 'TEACHER':
-                from schools.models import Class
-                teacher_class = Class.objects.filter(
-                    school=request.user.school, 
-                    class_teacher=request.user,
-                    id=student.current_class_id
-                ).first()
-                
-                if not teacher_class:
+                if not self.tenant.teacher_scope.is_class_teacher_of(student.current_class_id):
                     return Response(
                         {"error": "You can only generate reports for students in your assigned class"},
                         status=status.HTTP_403_FORBIDDEN
@@ -218,18 +215,11 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         
         try:
             student = Student.objects.get(id=student_id, school=request.user.school)
-            term = Term.objects.get(id=term_id)
+            term = self.tenant.get_term(term_id)
             
             # Check permissions for class teachers
             if request.user.role == 'TEACHER':
-                from schools.models import Class
-                teacher_class = Class.objects.filter(
-                    school=request.user.school, 
-                    class_teacher=request.user,
-                    id=student.current_class_id
-                ).first()
-                
-                if not teacher_class:
+                if not self.tenant.teacher_scope.is_class_teacher_of(student.current_class_id):
                     return Response(
                         {"error": "You can only generate terminal reports for students in your assigned class"},
                         status=status.HTTP_403_FORBIDDEN
@@ -360,18 +350,11 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         
         try:
             student = Student.objects.get(id=student_id, school=request.user.school)
-            term = Term.objects.get(id=term_id)
+            term = self.tenant.get_term(term_id)
             
             # Check permissions for class teachers
             if request.user.role == 'TEACHER':
-                from schools.models import Class
-                teacher_class = Class.objects.filter(
-                    school=request.user.school, 
-                    class_teacher=request.user,
-                    id=student.current_class_id
-                ).first()
-                
-                if not teacher_class:
+                if not self.tenant.teacher_scope.is_class_teacher_of(student.current_class_id):
                     return Response(
                         {"error": "You can only preview reports for students in your assigned class"},
                         status=status.HTTP_403_FORBIDDEN
@@ -685,14 +668,7 @@ class ReportCardViewSet(viewsets.ModelViewSet):
             
             # Check permissions
             if request.user.role == 'TEACHER':
-                from schools.models import Class
-                teacher_class = Class.objects.filter(
-                    school=request.user.school, 
-                    class_teacher=request.user,
-                    id=student.current_class_id
-                ).first()
-                
-                if not teacher_class:
+                if not self.tenant.teacher_scope.is_class_teacher_of(student.current_class_id):
                     return Response(
                         {"error": "You can only preview terminal reports for students in your assigned class"},
                         status=status.HTTP_403_FORBIDDEN
@@ -764,25 +740,20 @@ class ReportCardViewSet(viewsets.ModelViewSet):
             )
         
         try:
-            term = Term.objects.get(id=term_id)
+            term = self.tenant.get_term(term_id)
             students = Student.objects.filter(school=request.user.school, is_active=True)
             
             # Handle permissions for class teachers
             if request.user.role == 'TEACHER':
-                from schools.models import Class
-                teacher_classes = Class.objects.filter(
-                    school=request.user.school, 
-                    class_teacher=request.user
-                )
+                teacher_class_ids = self.tenant.teacher_scope.class_ids
                 
-                if not teacher_classes.exists():
+                if not teacher_class_ids:
                     return Response(
                         {"error": "You are not assigned as a class teacher"},
                         status=status.HTTP_403_FORBIDDEN
                     )
                 
                 # Filter to only their class students
-                teacher_class_ids = teacher_classes.values_list('id', flat=True)
                 students = students.filter(current_class_id__in=teacher_class_ids)
                 
                 # If class_id is provided, ensure it's their class
@@ -873,12 +844,77 @@ class ReportCardViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        report_card.status = 'PUBLISHED'
-        report_card.published_at = timezone.now()
-        report_card.save()
+        with transaction.atomic():
+            report_card.status = 'PUBLISHED'
+            report_card.published_at = timezone.now()
+            report_card.save()
+            queue_guardian_notifications([report_card.id])
         
         return Response({"message": "Report card published successfully"})
     
+    @action(detail=False, methods=['post'])
+    def bulk_publish(self, request):
+        """Publish all generated report cards for a term, optionally limited to a class or ids"""
+        # A non-numeric class_id would fail inside the ORM filter and a string
+        # report_ids would be read character by character
+        serializer = BulkPublishSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        term_id = serializer.validated_data['term_id']
+        class_id = serializer.validated_data.get('class_id')
+        report_ids = serializer.validated_data.get('report_ids')
+        
+        try:
+            term = self.tenant.get_term(term_id)
+        except Term.DoesNotExist:
+            return Response(
+                {"error": "Term not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        # get_queryset already scopes to the school and, for teachers, their classes
+        queryset = self.get_queryset().filter(term=term)
+        if class_id:
+            queryset = queryset.filter(student__current_class_id=class_id)
+        if report_ids:
+            queryset = queryset.filter(id__in=report_ids)
+        
+        with transaction.atomic():
+            published_ids = self._publish_generated(queryset)
+            # The UPDATE bypasses signals, so move the counter here
+            adjust_stats(school_id=request.user.school_id, reports_published=len(published_ids))
+            notifications_queued = queue_guardian_notifications(published_ids)
+        
+        return Response({
+            "message": f"Published {len(published_ids)} report cards",
+            "published_count": len(published_ids),
+            "report_ids": published_ids,
+            "notifications_queued": notifications_queued
+        })
+    
+    def _publish_generated(self, queryset):
+        """Move GENERATED cards in queryset to PUBLISHED with one UPDATE and return their ids"""
+        now = timezone.now()
+        queryset = queryset.filter(status='GENERATED').order_by()
+        
+        if not connection.features.can_return_columns_from_insert:
+            # No RETURNING support: lock the rows, then update them by id
+            ids = list(queryset.select_for_update().values_list('id', flat=True))
+            ReportCard.objects.filter(id__in=ids).update(status='PUBLISHED', published_at=now, updated_at=now)
+            return ids
+        
+        subquery, params = queryset.values('id').query.sql_with_params()
+        qn = connection.ops.quote_name
+        timestamp = connection.ops.adapt_datetimefield_value(now)
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"UPDATE {qn(ReportCard._meta.db_table)} "
+                f"SET {qn('status')} = %s, {qn('published_at')} = %s, {qn('updated_at')} = %s "
+                f"WHERE {qn('id')} IN ({subquery}) RETURNING {qn('id')}",
+                ['PUBLISHED', timestamp, timestamp, *params]
+            )
+            return [row[0] for row in cursor.fetchall()]
+    
     @action(detail=False, methods=['get'])
     def verify(self, request):
         """Verify a report card by code"""
@@ -1206,6 +1242,25 @@ class ReportCardViewSet(viewsets.ModelViewSet):
         }
 
 
+@async_api_view
+async def verify_report(request):
+    """ReportCardViewSet.verify as an async view, routed in its place under ASGI_MODE"""
+    report_code = request.GET.get('code')
+    if not report_code:
+        return JsonResponse({"error": "Report code is required"}, status=400)
+
+    try:
+        report_card = await ReportCard.objects.select_related(
+            'student', 'term__academic_year'
+        ).aget(report_code=report_code)
+    except ReportCard.DoesNotExist:
+        return JsonResponse({"valid": False, "message": "Invalid report code"})
+
+    # Everything the serializer reads was selected above, so it runs on the event loop
+    serializer = ReportCardSerializer(report_card, context={'request': Request(request)})
+    return JsonResponse({"valid": True, "report": serializer.data})
+
+
 from django.views.decorators.clickjacking import xframe_options_exempt
 
 @xframe_options_exempt
@@ -0,0 +1,54 @@
+"""
+Helpers for async read-only endpoints.
+
+DRF 3.14 has no async views, so the endpoints served natively under ASGI
+(ASGI_MODE, see gunicorn.conf.py) are plain Django async views. async_api_view
+gives them the same bearer-token authentication and tenant context as the DRF
+views and answers errors in DRF's JSON shape.
+"""
+
+from functools import wraps
+
+from asgiref.sync import sync_to_async
+from django.http import JsonResponse
+from rest_framework.exceptions import APIException
+
+from .authentication import CachedJWTAuthentication
+from .tenant import build_tenant
+
+authenticator = CachedJWTAuthentication()
+
+
+def _unauthorized(detail):
+    # Same body as DRF's exception handler: dict details are sent as they are
+    response = JsonResponse(detail if isinstance(detail, dict) else {'detail': detail}, status=401)
+    response['WWW-Authenticate'] = authenticator.authenticate_header(None)
+    return response
+
+
+@sync_to_async
+def _authenticate(request):
+    """(user, tenant) for the request's bearer token, or None without one"""
+    result = authenticator.authenticate(request)
+    if result is None:
+        return None
+    return result[0], build_tenant(result[0])
+
+
+def async_api_view(view):
+    """Authenticated GET-only async view; sets request.user and request.tenant"""
+
+    @wraps(view)
+    async def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return JsonResponse({'detail': f'Method "{request.method}" not allowed.'}, status=405)
+        try:
+            result = await _authenticate(request)
+        except APIException as exc:
+            return _unauthorized(exc.detail)
+        if result is None:
+            return _unauthorized('Authentication credentials were not provided.')
+        request.user, request.tenant = result
+        return await view(request, *args, **kwargs)
+
+    return wrapper
@@ -0,0 +1,72 @@
+"""
+JWT authentication with a cached user lookup.
+
+simplejwt loads the user row on every request. Here the row is kept in the
+cache under the token's user id and dropped by accounts.signals whenever the
+user is saved or deleted, which covers role, school and password changes. The
+user's school is attached from the tenant context cache, so a warm request needs
+no query for either. This only pays off with a fast cache every worker shares
+(settings.CACHE_USER_STATE); otherwise stock simplejwt loads the row and the
+school is loaded on first access, as before.
+"""
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+from .tenant import load_school_context
+
+AUTH_USER_TTL = 5 * 60
+
+
+def auth_user_cache_key(user_id):
+    """Key for the user whose USER_ID_FIELD is ``user_id``, the value tokens carry in USER_ID_CLAIM"""
+    return f"auth-user:{api_settings.USER_ID_FIELD}:{user_id}"
+
+
+def invalidate_auth_user(user):
+    user_id = getattr(user, api_settings.USER_ID_FIELD, None)
+    if user_id:
+        cache.delete(auth_user_cache_key(user_id))
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """JWTAuthentication that resolves the token's user from the cache"""
+
+    def get_user(self, validated_token):
+        if not settings.CACHE_USER_STATE:
+            return super().get_user(validated_token)
+        user = self._cached_user(validated_token)
+        if user.school_id:
+            context = load_school_context(user.school_id)
+            if context is not None:
+                user._meta.get_field('school').set_cached_value(user, context['school'])
+        return user
+
+    def _cached_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = auth_user_cache_key(user_id)
+        user = cache.get(key)
+        if user is None:
+            try:
+                user = get_user_model().objects.get(**{api_settings.USER_ID_FIELD: user_id})
+            except get_user_model().DoesNotExist:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            cache.set(key, user, AUTH_USER_TTL)
+
+        # Same checks as JWTAuthentication.get_user, against the cached row
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != get_md5_hash_password(user.password):
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+        return user
@@ -0,0 +1,29 @@
+"""
+Minimal background execution for work that should not hold up a request.
+Work runs in a daemon thread with its own database connection; anything that
+must survive a worker restart should also be picked up by a management command.
+"""
+
+import logging
+import threading
+
+from django.db import connections, transaction
+
+logger = logging.getLogger(__name__)
+
+
+def run_in_background(func, *args, **kwargs):
+    """Start func(*args, **kwargs) in a daemon thread once the current transaction commits"""
+
+    def runner():
+        try:
+            func(*args, **kwargs)
+        except Exception:
+            logger.exception(f"Background task {getattr(func, '__name__', func)} failed")
+        finally:
+            connections.close_all()
+
+    def start():
+        threading.Thread(target=runner, daemon=True).start()
+
+    transaction.on_commit(start)
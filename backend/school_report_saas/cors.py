@@ -0,0 +1,99 @@
+"""
+The project's single CORS layer.
+
+Origin rules and header values are compiled once, when Django builds the
+middleware chain. Preflight requests are answered here, before any other
+middleware or view runs, with Access-Control-Max-Age so browsers reuse the
+answer instead of preflighting every API call; a disallowed origin gets a 403. The settings keep the names
+django-cors-headers used (CORS_ALLOWED_ORIGINS, CORS_ALLOW_ALL_ORIGINS, ...).
+"""
+
+import re
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+from django.utils.cache import patch_vary_headers
+
+
+class CORSMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+
+        self.allow_all = getattr(settings, 'CORS_ALLOW_ALL_ORIGINS', False)
+        self.allow_credentials = getattr(settings, 'CORS_ALLOW_CREDENTIALS', False)
+        self.origins = frozenset(
+            origin.strip().rstrip('/') for origin in getattr(settings, 'CORS_ALLOWED_ORIGINS', []) if origin.strip()
+        )
+        self.origin_regexes = [re.compile(pattern) for pattern in getattr(settings, 'CORS_ALLOWED_ORIGIN_REGEXES', [])]
+        self.preflight_headers = {
+            'Access-Control-Allow-Methods': ', '.join(getattr(settings, 'CORS_ALLOW_METHODS', [])),
+            'Access-Control-Allow-Headers': ', '.join(getattr(settings, 'CORS_ALLOW_HEADERS', [])),
+            'Access-Control-Max-Age': str(getattr(settings, 'CORS_PREFLIGHT_MAX_AGE', 86400)),
+        }
+        self.expose_headers = ', '.join(getattr(settings, 'CORS_EXPOSE_HEADERS', []))
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        origin = request.META.get('HTTP_ORIGIN')
+        if origin and self.is_preflight(request):
+            return self.preflight_response(origin)
+        return self.add_headers(origin, self.get_response(request))
+
+    async def __acall__(self, request):
+        origin = request.META.get('HTTP_ORIGIN')
+        if origin and self.is_preflight(request):
+            return self.preflight_response(origin)
+        return self.add_headers(origin, await self.get_response(request))
+
+    @staticmethod
+    def is_preflight(request):
+        return request.method == 'OPTIONS' and 'HTTP_ACCESS_CONTROL_REQUEST_METHOD' in request.META
+
+    def allowed_origin(self, origin):
+        """Access-Control-Allow-Origin value for ``origin``, or None if it is not allowed"""
+        if self.allow_all:
+            # Browsers reject '*' on credentialed requests
+            return origin if self.allow_credentials else '*'
+        if origin in self.origins or any(regex.match(origin) for regex in self.origin_regexes):
+            return origin
+        return None
+
+    def set_origin_headers(self, response, allow_origin):
+        response['Access-Control-Allow-Origin'] = allow_origin
+        if self.allow_credentials:
+            response['Access-Control-Allow-Credentials'] = 'true'
+        if allow_origin != '*':
+            patch_vary_headers(response, ('Origin',))
+
+    def preflight_response(self, origin):
+        allow_origin = self.allowed_origin(origin)
+        if allow_origin is None:
+            # A 403 without CORS headers, so neither the browser nor a reader of the logs takes it for a pass
+            response = HttpResponseForbidden()
+            patch_vary_headers(response, ('Origin',))
+            return response
+        response = HttpResponse()
+        self.set_origin_headers(response, allow_origin)
+        for header, value in self.preflight_headers.items():
+            response[header] = value
+        return response
+
+    def add_headers(self, origin, response):
+        if not origin:
+            return response
+        allow_origin = self.allowed_origin(origin)
+        if allow_origin is not None:
+            self.set_origin_headers(response, allow_origin)
+            if self.expose_headers:
+                response['Access-Control-Expose-Headers'] = self.expose_headers
+        elif not self.allow_all:
+            patch_vary_headers(response, ('Origin',))
+        return response
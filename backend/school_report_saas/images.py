@@ -0,0 +1,108 @@
+"""
+Upload-time image handling for photos, logos and signatures.
+
+Originals are kept as uploaded. Report-sized JPEG derivatives are written next to
+them so renderers never have to decode a multi-megabyte phone photo.
+"""
+
+import logging
+import os
+from io import BytesIO
+
+from django.core.exceptions import ValidationError
+from django.core.files.base import ContentFile
+
+logger = logging.getLogger(__name__)
+
+# Print resolution of the report PDF
+REPORT_DPI = 300
+THUMBNAIL_SIZE = (120, 120)
+ALLOWED_FORMATS = {'JPEG', 'PNG', 'GIF', 'WEBP', 'BMP'}
+MAX_PIXELS = 40_000_000
+
+
+def inches(width, height, dpi=REPORT_DPI):
+    """Pixel box for a printed size in inches"""
+    return round(width * dpi), round(height * dpi)
+
+
+def validate_image(upload):
+    """Reject files that are not a decodable image of a supported format"""
+    if not upload:
+        return upload
+    from PIL import Image
+    try:
+        upload.seek(0)
+        with Image.open(upload) as image:
+            image_format = image.format
+            width, height = image.size
+            image.verify()
+    except Exception:
+        raise ValidationError("Upload a valid image file")
+    finally:
+        upload.seek(0)
+
+    if image_format not in ALLOWED_FORMATS:
+        raise ValidationError(f"Unsupported image format {image_format}")
+    if width * height > MAX_PIXELS:
+        raise ValidationError("Image dimensions are too large")
+    return upload
+
+
+def render_jpeg(field_file, size):
+    """Return a JPEG ContentFile fitting within ``size`` pixels, tagged with the report DPI"""
+    from PIL import Image, ImageOps
+    with field_file.open('rb') as source, Image.open(source) as image:
+        # Let the JPEG decoder downscale while reading; far less work and memory
+        image.draft('RGB', size)
+        image = ImageOps.exif_transpose(image)
+        if image.mode in ('RGBA', 'LA', 'P'):
+            image = image.convert('RGBA')
+            background = Image.new('RGB', image.size, (255, 255, 255))
+            background.paste(image, mask=image.getchannel('A'))
+            image = background
+        elif image.mode != 'RGB':
+            image = image.convert('RGB')
+        image.thumbnail(size, Image.LANCZOS)
+
+        buffer = BytesIO()
+        image.save(buffer, 'JPEG', quality=85, optimize=True, dpi=(REPORT_DPI, REPORT_DPI))
+    return ContentFile(buffer.getvalue())
+
+
+def _derivative_prefix(source_name, suffix):
+    stem, _ = os.path.splitext(os.path.basename(source_name))
+    return f"{stem}_{suffix}"
+
+
+def refresh_derivatives(instance, source_field, targets):
+    """
+    Bring the derivative fields of ``instance`` in line with ``source_field``.
+
+    ``targets`` maps a derivative field name to (suffix, pixel size). Derivatives
+    already built from the current source are left alone; stale ones are replaced
+    and removed from storage. Returns the list of fields that changed.
+    """
+    source = getattr(instance, source_field)
+    changed = []
+    for field_name, (suffix, size) in targets.items():
+        derivative = getattr(instance, field_name)
+        expected = _derivative_prefix(source.name, suffix) if source else None
+        if expected and derivative and os.path.basename(derivative.name).startswith(expected):
+            continue
+        if not expected and not derivative:
+            continue
+
+        if derivative:
+            derivative.delete(save=False)
+        if expected:
+            try:
+                derivative.save(f"{expected}.jpg", render_jpeg(source, size), save=False)
+            except Exception as e:
+                logger.warning(f"Could not build {field_name} for {instance!r}: {str(e)}")
+                setattr(instance, field_name, None)
+        changed.append(field_name)
+
+    if changed:
+        instance.save(update_fields=changed)
+    return changed
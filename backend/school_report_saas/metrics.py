@@ -0,0 +1,224 @@
+"""
+Per-endpoint request metrics, scraped in the Prometheus text format.
+
+MetricsMiddleware counts every request by route, method and status code; the
+counts are batched in a dict and added to http_requests every FLUSH_EVERY
+requests (and when a gunicorn worker exits), as each prometheus_client update
+takes a lock and, under gunicorn, writes to a memory-mapped file. For a sample
+of requests (METRICS_SAMPLE_RATE) it also observes the request duration, the
+database queries and their time, and the response size, so those histograms
+describe the sampled requests only; the rest skip the timer. Queries are
+counted by an execute wrapper installed on every connection as it opens (this
+module is imported by SchoolsConfig.ready), which adds them to the QueryTimer of
+the sampled request running in the current context. Under ASGI that context is
+carried into the thread a sync view runs in, and concurrent requests each keep
+their own timer.
+
+gunicorn.conf.py sets PROMETHEUS_MULTIPROC_DIR before the app loads:
+prometheus_client then keeps each worker's values in memory-mapped files there,
+and /api/metrics/ merges every worker's files when scraped. Without it
+(runserver, management commands) the values live in the process.
+"""
+
+import os
+import random
+import time
+from collections import defaultdict
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+from django.http import Http404, HttpResponse
+from prometheus_client import REGISTRY, CONTENT_TYPE_LATEST, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+LABELS = ('route', 'method')
+# Anything else is counted as OTHER so clients cannot invent label values
+METHODS = frozenset(['GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS'])
+
+REQUEST_DURATION = Histogram(
+    'http_request_duration_seconds', 'Time spent answering the request (sampled requests)', LABELS,
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS = Counter('http_requests', 'Requests answered, by status code', LABELS + ('status',))
+DB_QUERIES = Histogram(
+    'http_request_db_queries', 'Database queries per request (sampled requests)', LABELS,
+    buckets=(0, 1, 2, 5, 10, 20, 50, 100, 200),
+)
+DB_QUERY_DURATION = Counter('http_request_db_query_seconds', 'Time spent in database queries (sampled requests)', LABELS)
+RESPONSE_SIZE = Histogram(
+    'http_response_size_bytes', 'Response body size (sampled requests)', LABELS,
+    buckets=(256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304, 16777216),
+)
+
+
+class QueryTimer:
+    """Database execute wrapper that counts queries and sums their time"""
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.count += 1
+            self.seconds += time.perf_counter() - start
+
+
+# The QueryTimer of the request being answered in this context, if any
+current_timer = ContextVar('metrics_query_timer', default=None)
+
+
+def track_query(execute, sql, params, many, context):
+    timer = current_timer.get()
+    if timer is None:
+        return execute(sql, params, many, context)
+    return timer(execute, sql, params, many, context)
+
+
+@receiver(connection_created)
+def install_query_tracking(sender, connection, **kwargs):
+    if track_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(track_query)
+
+
+# Requests counted since the last flush into http_requests, by (route, method,
+# status). Sync workers and the ASGI event loop run one middleware call at a
+# time, so the counts are not locked.
+unflushed_requests = defaultdict(int)
+FLUSH_EVERY = 16
+
+
+def flush_request_counts():
+    """Add the requests counted since the last flush to http_requests"""
+    counts = list(unflushed_requests.items())
+    unflushed_requests.clear()
+    for key, count in counts:
+        REQUESTS.labels(*key).inc(count)
+
+
+def route_label(request):
+    """The URL pattern's name (its route if unnamed), so IDs in paths do not become labels"""
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unmatched'
+    return match.view_name or match.route
+
+
+def response_size(response):
+    length = response.get('Content-Length')
+    if length is not None:
+        return int(length)
+    # Streamed bodies are not read here
+    return None if response.streaming else len(response.content)
+
+
+class MetricsMiddleware:
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.is_async = iscoroutinefunction(get_response)
+        if self.is_async:
+            markcoroutinefunction(self)
+        self.sample_rate = settings.METRICS_SAMPLE_RATE
+        # labels() locks and builds a key on every call; resolve each child once
+        self.children = {}
+        self.unflushed = 0
+
+    def __call__(self, request):
+        if self.is_async:
+            return self.__acall__(request)
+        if random.random() >= self.sample_rate:
+            response = self.get_response(request)
+            self.record(request, response)
+            return response
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    async def __acall__(self, request):
+        if random.random() >= self.sample_rate:
+            response = await self.get_response(request)
+            self.record(request, response)
+            return response
+        # Each request is its own task, so the timer stays with it and with the
+        # sync_to_async threads it awaits
+        timer = QueryTimer()
+        token = current_timer.set(timer)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            current_timer.reset(token)
+        self.record(request, response, time.perf_counter() - start, timer)
+        return response
+
+    def record(self, request, response, duration=None, timer=None):
+        """Count the response, and observe the histograms if the request was sampled (has a timer)"""
+        method = request.method if request.method in METHODS else 'OTHER'
+        route = route_label(request)
+        unflushed_requests[route, method, response.status_code] += 1
+        self.unflushed += 1
+        if self.unflushed >= FLUSH_EVERY:
+            self.unflushed = 0
+            flush_request_counts()
+        if timer is None:
+            return
+
+        key = (route, method)
+        children = self.children.get(key)
+        if children is None:
+            children = self.children[key] = tuple(
+                metric.labels(route, method)
+                for metric in (REQUEST_DURATION, DB_QUERIES, DB_QUERY_DURATION, RESPONSE_SIZE)
+            )
+        duration_child, queries_child, query_seconds_child, size_child = children
+        duration_child.observe(duration)
+        queries_child.observe(timer.count)
+        if timer.seconds:
+            query_seconds_child.inc(timer.seconds)
+        size = response_size(response)
+        if size is not None:
+            size_child.observe(size)
+
+
+def scraper_address(request):
+    """
+    The address the scrape came from
+
+    Behind a proxy (Render's load balancer) REMOTE_ADDR is the proxy's own
+    address. With METRICS_TRUSTED_PROXIES set to the number of proxies in front
+    of the app, the address the outermost one saw is read from X-Forwarded-For
+    instead; entries further left are client supplied and ignored.
+    """
+    proxies = settings.METRICS_TRUSTED_PROXIES
+    if not proxies:
+        return request.META.get('REMOTE_ADDR')
+    forwarded = [address.strip() for address in request.META.get('HTTP_X_FORWARDED_FOR', '').split(',')]
+    return forwarded[-proxies] if len(forwarded) >= proxies else None
+
+
+def metrics_view(request):
+    """Prometheus scrape endpoint, answered only for METRICS_ALLOWED_IPS"""
+    if scraper_address(request) not in settings.METRICS_ALLOWED_IPS:
+        raise Http404
+    flush_request_counts()
+    if 'PROMETHEUS_MULTIPROC_DIR' in os.environ:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return HttpResponse(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
@@ -0,0 +1,37 @@
+"""
+Opt-in keyset pagination.
+
+The default PageNumberPagination runs COUNT(*) and an OFFSET scan for every page,
+which grows with the page number. Clients that only need next/previous links can
+ask for keyset pagination with ``?pagination=cursor`` (or by following a
+``cursor`` link); each page is then a single indexed range query.
+"""
+
+from rest_framework.pagination import CursorPagination
+
+
+class KeysetPagination(CursorPagination):
+    page_size = 50
+    page_size_query_param = 'page_size'
+    max_page_size = 500
+    ordering = '-id'
+
+
+class KeysetPaginationMixin:
+    """
+    Viewset mixin that switches to KeysetPagination when the client opts in.
+
+    ``keyset_ordering`` must be unique and indexed; the primary key is.
+    """
+    keyset_ordering = '-id'
+
+    @property
+    def paginator(self):
+        if not hasattr(self, '_paginator'):
+            params = self.request.query_params
+            if 'cursor' in params or params.get('pagination') == 'cursor':
+                self._paginator = KeysetPagination()
+                self._paginator.ordering = self.keyset_ordering
+            else:
+                self._paginator = super().paginator
+        return self._paginator
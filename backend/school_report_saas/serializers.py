@@ -0,0 +1,25 @@
+from rest_framework import serializers
+
+
+class SparseFieldsetMixin:
+    """
+    Serializer mixin honouring ``?fields=a,b,c`` on GET requests.
+
+    Only the top-level serializer (or the items of a top-level list) is trimmed,
+    and unknown names are ignored. Dropped fields are never evaluated, so the
+    related lookups behind them cost nothing.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        if request is None or request.method != 'GET' or not request.query_params.get('fields'):
+            return fields
+        if self.parent is not None and not (
+            isinstance(self.parent, serializers.ListSerializer) and self.parent.parent is None
+        ):
+            return fields
+
+        wanted = {name.strip() for name in request.query_params['fields'].split(',')}
+        trimmed = {name: field for name, field in fields.items() if name in wanted}
+        return trimmed or fields
@@ -30,7 +30,7 @@ INSTALLED_APPS = [
     # Third party apps
     'rest_framework',
     'rest_framework_simplejwt',
-    'corsheaders',
+    'rest_framework_simplejwt.token_blacklist',
     
     # Local apps
     'accounts',
@@ -40,12 +40,16 @@ INSTALLED_APPS = [
     'scores',
     'reports',
     'subscriptions',
+    'notifications',
 ]
 
 MIDDLEWARE = [
-    'corsheaders.middleware.CorsMiddleware',
+    # First, so preflights are answered before anything else runs
+    'school_report_saas.cors.CORSMiddleware',
+    # Outermost after CORS, so its timings cover every other middleware
+    'school_report_saas.metrics.MetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
-    'whitenoise.middleware.WhiteNoiseMiddleware',
+    'school_report_saas.staticfiles.AsyncWhiteNoiseMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -73,6 +77,11 @@ TEMPLATES = [
 ]
 
 WSGI_APPLICATION = 'school_report_saas.wsgi.application'
+ASGI_APPLICATION = 'school_report_saas.asgi.application'
+
+# Serve through school_report_saas.asgi with uvicorn workers (see gunicorn.conf.py).
+# Also routes the dashboard and report verification to their async views.
+ASGI_MODE = config('ASGI_MODE', default=False, cast=bool)
 
 # Database
 # Default to SQLite for easier local development; set DB_ENGINE=postgres in .env when PostgreSQL is available
@@ -104,6 +113,47 @@ else:
         }
     }
 
+if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+    # Trigram lookups for the student search
+    INSTALLED_APPS.append('django.contrib.postgres')
+
+# Cache
+# Tenant contexts, authenticated users, teacher scopes and dashboards are cached
+# and dropped on write, so every gunicorn worker must see the same cache: Redis
+# when REDIS_URL is set, otherwise a database table (`manage.py createcachetable`,
+# run by build.sh) that only keeps dashboards (see CACHE_USER_STATE). Only the
+# single-process development server uses local memory.
+REDIS_URL = config('REDIS_URL', default='')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+elif DEBUG:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': 'django_cache',
+        }
+    }
+
+# Per-request state (signed-in users, tenant contexts, teacher scopes) is only
+# cached where every worker sees the same cache and a hit is cheaper than the
+# rows it replaces: Redis or Memcached, or local memory under the single-process
+# development server. A database cache lookup is itself a query, so without
+# REDIS_URL these are read from their tables on each request instead.
+CACHE_USER_STATE = CACHES['default']['BACKEND'].endswith(('.RedisCache', '.PyMemcacheCache', '.PyLibMCCache')) or (
+    DEBUG and CACHES['default']['BACKEND'].endswith('.LocMemCache')
+)
+
 # Custom User Model
 AUTH_USER_MODEL = 'accounts.User'
 
@@ -145,7 +195,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework Configuration
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'school_report_saas.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
@@ -161,8 +211,12 @@ SIMPLE_JWT = {
     'ROTATE_REFRESH_TOKENS': True,
     'BLACKLIST_AFTER_ROTATION': True,
     'AUTH_HEADER_TYPES': ('Bearer',),
+    'TOKEN_REFRESH_SERIALIZER': 'accounts.tokens.TokenRefreshSerializer',
 }
-# CORS Settings - read allowed origins from environment for safer defaults
+# Check rotated refresh tokens against a cache denylist instead of the blacklist
+# table. Needs a shared, persistent cache (see accounts/tokens.py).
+TOKEN_DENYLIST_CACHE = config('TOKEN_DENYLIST_CACHE', default=False, cast=bool)
+# CORS Settings (school_report_saas/cors.py) - read allowed origins from environment for safer defaults
 # Set `CORS_ALLOWED_ORIGINS` env var to a comma-separated list like:
 #  https://elitetechreport.netlify.app,http://localhost:5173
 # If you need to allow all origins temporarily, set `CORS_ALLOW_ALL_ORIGINS=True` in env.
@@ -199,6 +253,19 @@ CORS_EXPOSE_HEADERS = [
     'x-total-count',
 ]
 
+# How long browsers may reuse a preflight answer, in seconds (browsers cap it:
+# Chrome at 2 hours, Firefox at 24)
+CORS_PREFLIGHT_MAX_AGE = config('CORS_PREFLIGHT_MAX_AGE', default=86400, cast=int)
+
+# Addresses allowed to scrape /api/metrics/ (school_report_saas/metrics.py)
+METRICS_ALLOWED_IPS = config('METRICS_ALLOWED_IPS', default='127.0.0.1,::1').split(',')
+# Proxies in front of the app whose X-Forwarded-For entries are trusted for that
+# check (1 on Render, where REMOTE_ADDR is the load balancer); 0 uses REMOTE_ADDR
+METRICS_TRUSTED_PROXIES = config('METRICS_TRUSTED_PROXIES', default=0, cast=int)
+# Share of requests whose duration, database queries and response size are
+# observed for /api/metrics/ (every request is counted)
+METRICS_SAMPLE_RATE = config('METRICS_SAMPLE_RATE', default=0.1, cast=float)
+
 # X-Frame-Options: Allow iframe embedding for preview functionality
 X_FRAME_OPTIONS = 'SAMEORIGIN'
 
@@ -216,6 +283,8 @@ if DEBUG and not config('EMAIL_HOST_USER', default=''):
 else:
     # Production mode - use SMTP
     EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+# Explicit override, e.g. SMTP against a local stand-in server during development
+EMAIL_BACKEND = config('EMAIL_BACKEND', default=EMAIL_BACKEND)
     
 EMAIL_HOST = config('EMAIL_HOST', default='smtp.gmail.com')
 EMAIL_PORT = config('EMAIL_PORT', default=587, cast=int)
@@ -224,9 +293,18 @@ EMAIL_HOST_PASSWORD = config('EMAIL_HOST_PASSWORD', default='')
 EMAIL_USE_TLS = config('EMAIL_USE_TLS', default=True, cast=bool)
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default=EMAIL_HOST_USER or 'noreply@schoolreport.com')
 
+# Student bulk uploads larger than this many bytes are processed in the background
+STUDENT_IMPORT_BACKGROUND_THRESHOLD = config('STUDENT_IMPORT_BACKGROUND_THRESHOLD', default=2 * 1024 * 1024, cast=int)
+
+# Teacher bulk uploads hash passwords in the request, about 0.3s per row
+TEACHER_IMPORT_MAX_ROWS = config('TEACHER_IMPORT_MAX_ROWS', default=100, cast=int)
+
 # Frontend URL for email templates
 FRONTEND_URL = config('FRONTEND_URL', default='https://elitetechreport.netlify.app')
 
+# Lifetime in seconds of the set-password link in teacher welcome emails
+PASSWORD_RESET_TIMEOUT = config('PASSWORD_RESET_TIMEOUT', default=7 * 24 * 60 * 60, cast=int)
+
 # Payment Configuration
 PAYSTACK_SECRET_KEY = config('PAYSTACK_SECRET_KEY', default='')
 PAYSTACK_PUBLIC_KEY = config('PAYSTACK_PUBLIC_KEY', default='')
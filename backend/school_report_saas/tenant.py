@@ -0,0 +1,126 @@
+"""
+Per-request tenant context.
+
+The school row and its current academic year and term are cached per school in
+the shared cache. schools.signals drops the entry whenever a school, year or term
+is saved or deleted, and TermViewSet.set_current drops it explicitly since it
+moves the flag with a bulk UPDATE first. Without a fast shared cache
+(settings.CACHE_USER_STATE off) they are read from the database each time.
+Views build the context on first use of self.tenant, so endpoints that never
+read it pay nothing.
+"""
+
+from django.conf import settings
+from django.core.cache import cache
+
+TENANT_TTL = 300
+
+MANAGING_ROLES = {'SUPER_ADMIN', 'SCHOOL_ADMIN', 'PRINCIPAL'}
+
+
+def tenant_cache_key(school_id):
+    return f"tenant-context:{school_id}"
+
+
+def invalidate_tenant(school_id):
+    if school_id:
+        cache.delete(tenant_cache_key(school_id))
+
+
+def load_school_context(school_id):
+    """Return {'school', 'academic_year', 'term'} for a school, cached"""
+    from schools.models import School, AcademicYear, Term
+
+    use_cache = settings.CACHE_USER_STATE
+    key = tenant_cache_key(school_id)
+    context = cache.get(key) if use_cache else None
+    if context is None:
+        school = School.objects.filter(pk=school_id).first()
+        if school is None:
+            return None
+        context = {
+            'school': school,
+            'academic_year': AcademicYear.objects.filter(school_id=school_id, is_current=True).first(),
+            'term': Term.objects.filter(
+                academic_year__school_id=school_id, is_current=True
+            ).select_related('academic_year').first(),
+        }
+        if use_cache:
+            cache.set(key, context, TENANT_TTL)
+    return context
+
+
+class TenantContext:
+    """The school, its current year and term, and the role scope of the requesting user"""
+
+    def __init__(self, user, school=None, academic_year=None, term=None):
+        self.user = user
+        self.school = school
+        self.academic_year = academic_year
+        self.term = term
+        self.role = getattr(user, 'role', None)
+
+    @property
+    def school_id(self):
+        return self.school.id if self.school else None
+
+    def get_term(self, term_id):
+        """
+        The school's term with ``term_id``; the current term costs no query.
+
+        Raises Term.DoesNotExist for terms of other schools, like a scoped get().
+        """
+        from schools.models import Term
+        if self.term is not None and str(self.term.id) == str(term_id):
+            return self.term
+        return Term.objects.select_related('academic_year').get(id=term_id, academic_year__school=self.school)
+
+    @property
+    def is_teacher(self):
+        return self.role == 'TEACHER'
+
+    @property
+    def teacher_scope(self):
+        """Cached TeacherScope for teachers, None for every other role"""
+        if not self.is_teacher:
+            return None
+        if not hasattr(self, '_teacher_scope'):
+            from teachers.scope import get_teacher_scope
+            self._teacher_scope = get_teacher_scope(self.user)
+        return self._teacher_scope
+
+    @property
+    def manages_school(self):
+        """Admins and principals see and manage everything in their school"""
+        return self.role in MANAGING_ROLES
+
+
+def build_tenant(user):
+    if not getattr(user, 'is_authenticated', False) or not getattr(user, 'school_id', None):
+        return TenantContext(user)
+    context = load_school_context(user.school_id)
+    if context is None:
+        return TenantContext(user)
+
+    # Hand the cached row to user.school so existing code reads it without a query
+    school_field = user._meta.get_field('school')
+    if not school_field.is_cached(user):
+        school_field.set_cached_value(user, context['school'])
+    return TenantContext(user, **context)
+
+
+def get_tenant(request):
+    """The request's TenantContext, built on first use"""
+    tenant = getattr(request, 'tenant', None)
+    if tenant is None:
+        tenant = build_tenant(request.user)
+        request.tenant = tenant
+    return tenant
+
+
+class TenantContextMixin:
+    """self.tenant: the request's TenantContext, built the first time a view reads it"""
+
+    @property
+    def tenant(self):
+        return get_tenant(self.request)
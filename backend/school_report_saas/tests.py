@@ -0,0 +1,170 @@
+import asyncio
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import AsyncClient, Client, TestCase, override_settings
+from prometheus_client import REGISTRY
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from schools.tests import make_school
+from . import metrics, tenant
+
+ROUTE = {'route': 'grading-scale-list', 'method': 'GET'}
+PATH = '/api/schools/grading-scales/'
+
+
+def recorded():
+    """(requests, queries) observed so far for ROUTE"""
+    return (
+        REGISTRY.get_sample_value('http_request_db_queries_count', ROUTE) or 0,
+        REGISTRY.get_sample_value('http_request_db_queries_sum', ROUTE) or 0,
+    )
+
+
+def requests_counted():
+    return REGISTRY.get_sample_value('http_requests_total', {**ROUTE, 'status': '200'}) or 0
+
+
+@override_settings(METRICS_SAMPLE_RATE=1)
+class MetricsQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        _, admin = make_school()
+        self.headers = {'Authorization': f'Bearer {RefreshToken.for_user(admin).access_token}'}
+
+    def assert_recorded(self, before, requests, queries):
+        after = recorded()
+        self.assertEqual((after[0] - before[0], after[1] - before[1]), (requests, queries))
+
+    def test_sync_request(self):
+        client = Client(headers=self.headers)
+        # The first request caches the user and the tenant context
+        self.assertEqual(client.get(PATH).status_code, 200)
+        before = recorded()
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get(PATH).status_code, 200)
+        self.assert_recorded(before, 1, 1)
+
+    async def test_concurrent_async_requests(self):
+        # Default headers are not applied by the 4.2 AsyncClient; pass them per request
+        client = AsyncClient()
+        self.assertEqual((await client.get(PATH, headers=self.headers)).status_code, 200)
+        before = recorded()
+        responses = await asyncio.gather(*(client.get(PATH, headers=self.headers) for _ in range(3)))
+        self.assertEqual([response.status_code for response in responses], [200] * 3)
+        self.assert_recorded(before, 3, 3)
+
+    @override_settings(METRICS_SAMPLE_RATE=0)
+    def test_unsampled_request_is_only_counted(self):
+        client = Client(headers=self.headers)
+        self.assertEqual(client.get(PATH).status_code, 200)
+        metrics.flush_request_counts()
+        before = recorded(), requests_counted()
+        with mock.patch.object(metrics, 'QueryTimer') as timer, mock.patch.object(metrics, 'FLUSH_EVERY', 1):
+            self.assertEqual(client.get(PATH).status_code, 200)
+        timer.assert_not_called()
+        self.assert_recorded(before[0], 0, 0)
+        self.assertEqual(requests_counted(), before[1] + 1)
+
+    def test_request_counts_are_batched(self):
+        client = Client(headers=self.headers)
+        metrics.flush_request_counts()
+        before = requests_counted()
+        with mock.patch.object(metrics, 'FLUSH_EVERY', 3):
+            client.get(PATH)
+            client.get(PATH)
+            self.assertEqual(requests_counted(), before)
+            client.get(PATH)
+        self.assertEqual(requests_counted(), before + 3)
+
+
+@override_settings(METRICS_ALLOWED_IPS=['10.0.0.5'])
+class MetricsViewTests(TestCase):
+    def scrape(self, **meta):
+        return self.client.get('/api/metrics/', REMOTE_ADDR='10.0.0.1', **meta).status_code
+
+    def test_checks_remote_addr_by_default(self):
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='10.0.0.5'), 404)
+
+    @override_settings(METRICS_TRUSTED_PROXIES=1)
+    def test_reads_address_recorded_by_trusted_proxy(self):
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='10.0.0.5'), 200)
+        # Entries left of the proxy's own are client supplied
+        self.assertEqual(self.scrape(HTTP_X_FORWARDED_FOR='10.0.0.5, 203.0.113.9'), 404)
+        self.assertEqual(self.scrape(), 404)
+
+
+class TenantView(tenant.TenantContextMixin, APIView):
+    def get(self, request):
+        if 'school' in request.query_params:
+            return Response({'school': self.tenant.school_id})
+        return Response({})
+
+
+class TenantContextTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.school, self.admin = make_school()
+
+    def get(self, params):
+        request = APIRequestFactory().get('/', params)
+        force_authenticate(request, self.admin)
+        return TenantView.as_view()(request)
+
+    def test_built_only_when_a_view_reads_it(self):
+        with mock.patch.object(tenant, 'build_tenant', wraps=tenant.build_tenant) as build_tenant:
+            self.assertEqual(self.get({}).data, {})
+            build_tenant.assert_not_called()
+            self.assertEqual(self.get({'school': 1}).data, {'school': self.school.id})
+            build_tenant.assert_called_once()
+
+    @override_settings(CACHE_USER_STATE=False)
+    def test_read_from_the_database_without_a_fast_cache(self):
+        tenant.load_school_context(self.school.id)
+        with self.assertNumQueries(3):
+            self.assertEqual(tenant.load_school_context(self.school.id)['school'], self.school)
+        self.assertIsNone(cache.get(tenant.tenant_cache_key(self.school.id)))
+
+
+# The middleware reads its settings when the test client builds the handler
+@override_settings(CORS_ALLOWED_ORIGINS=['https://app.example.com'], CORS_ALLOW_ALL_ORIGINS=False)
+class CORSMiddlewareTests(TestCase):
+    ALLOWED = 'https://app.example.com'
+
+    def setUp(self):
+        self.client = Client()
+
+    def preflight(self, origin):
+        return self.client.options(
+            '/api/auth/login/', HTTP_ORIGIN=origin, HTTP_ACCESS_CONTROL_REQUEST_METHOD='POST',
+        )
+
+    def test_allowed_origin(self):
+        response = self.client.get('/api/cors-test/', HTTP_ORIGIN=self.ALLOWED)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Allow-Origin'], self.ALLOWED)
+        self.assertIn('Origin', response['Vary'])
+
+    def test_disallowed_origin(self):
+        response = self.client.get('/api/cors-test/', HTTP_ORIGIN='https://evil.example.com')
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Access-Control-Allow-Origin', response)
+        self.assertIn('Origin', response['Vary'])
+
+    def test_preflight_is_answered_without_queries(self):
+        with self.assertNumQueries(0):
+            response = self.preflight(self.ALLOWED)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Access-Control-Allow-Origin'], self.ALLOWED)
+        self.assertIn('POST', response['Access-Control-Allow-Methods'])
+        self.assertIn('authorization', response['Access-Control-Allow-Headers'])
+        self.assertEqual(response['Access-Control-Max-Age'], '86400')
+
+    def test_preflight_from_disallowed_origin_is_forbidden(self):
+        response = self.preflight('https://evil.example.com')
+        self.assertEqual(response.status_code, 403)
+        self.assertNotIn('Access-Control-Allow-Origin', response)
+        self.assertNotIn('Access-Control-Allow-Methods', response)
@@ -7,6 +7,7 @@ from django.conf import settings
 from django.conf.urls.static import static
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
+from .metrics import metrics_view
 
 def api_root(request):
     """API root endpoint showing available endpoints"""
@@ -47,6 +48,14 @@ def health_check(request):
     # CORS headers are handled by WSGI middleware
     return response
 
+async def async_health_check(request):
+    """health_check as an async view, routed in its place under ASGI_MODE"""
+    return health_check(request)
+
+
+# csrf_exempt() only learns to wrap async views in Django 5.0
+async_health_check.csrf_exempt = True
+
 @csrf_exempt
 def cors_test_endpoint(request):
     """Test CORS configuration"""
@@ -63,8 +72,9 @@ def cors_test_endpoint(request):
 urlpatterns = [
     path('', api_root, name='api_root'),
     path('api/', api_root, name='api_root_api'),
-    path('api/health/', health_check, name='health_check'),
+    path('api/health/', async_health_check if settings.ASGI_MODE else health_check, name='health_check'),
     path('api/cors-test/', cors_test_endpoint, name='cors_test'),
+    path('api/metrics/', metrics_view, name='metrics'),
     path('admin/', admin.site.urls),
     path('api/auth/', include('accounts.urls')),
     path('api/schools/', include('schools.urls')),
@@ -0,0 +1,105 @@
+"""
+Warm a freshly loaded application before gunicorn forks its workers.
+
+PDF, spreadsheet and image code import their libraries inside the functions
+that need them, so each new worker paid for ReportLab (~200 ms), openpyxl and
+Pillow on its first report or upload, and max_requests recycles workers often.
+With preload_app, gunicorn.conf.py calls warmup() once in the master: the
+imports, compiled templates, ReportLab font metrics and primed tenant contexts
+are then inherited by every worker it forks.
+"""
+
+import logging
+import time
+from importlib import import_module
+from io import BytesIO
+
+from django.db import connections
+from django.template import TemplateDoesNotExist
+from django.template.loader import get_template
+
+logger = logging.getLogger(__name__)
+
+HEAVY_MODULES = [
+    'reportlab.platypus',
+    'reportlab.lib.styles',
+    'reportlab.lib.utils',
+    'openpyxl',
+    'PIL.Image',
+    'PIL.ImageOps',
+    'rest_framework_simplejwt.authentication',
+    'rest_framework_simplejwt.tokens',
+]
+
+TEMPLATES = [
+    'reports/terminal_report_template.html',
+    'reports/preview_template.html',
+    'emails/report_published.html',
+    'emails/teacher_welcome.html',
+    'emails/teacher_assignment.html',
+]
+
+# Schools whose tenant context is primed, most recently updated first
+PRIME_SCHOOLS = 200
+
+
+def import_heavy_modules():
+    for name in HEAVY_MODULES:
+        try:
+            import_module(name)
+        except ImportError:
+            logger.warning("Warmup could not import %s", name)
+
+
+def compile_templates():
+    for name in TEMPLATES:
+        try:
+            get_template(name)
+        except TemplateDoesNotExist:
+            logger.warning("Warmup could not find template %s", name)
+
+
+def render_sample_pdf():
+    """Build a one-page PDF so ReportLab loads its font metrics and style sheet"""
+    from reportlab.lib.pagesizes import A4
+    from reportlab.lib.styles import getSampleStyleSheet
+    from reportlab.platypus import Paragraph, SimpleDocTemplate, Table
+
+    styles = getSampleStyleSheet()
+    doc = SimpleDocTemplate(BytesIO(), pagesize=A4)
+    doc.build([Paragraph('Warmup', styles['Title']), Table([['Subject', 'Score'], ['Warmup', '100']])])
+
+
+def prime_school_caches(limit=PRIME_SCHOOLS):
+    from schools.models import School
+    from .tenant import load_school_context
+
+    school_ids = School.objects.filter(is_active=True).order_by('-updated_at').values_list('id', flat=True)[:limit]
+    for school_id in school_ids:
+        load_school_context(school_id)
+    return len(school_ids)
+
+
+def warmup(prime_caches=True):
+    """Run every warmup step; returns {step: seconds}"""
+    timings = {}
+    steps = [
+        ('imports', import_heavy_modules),
+        ('templates', compile_templates),
+        ('pdf', render_sample_pdf),
+    ]
+    if prime_caches:
+        steps.append(('school_caches', prime_school_caches))
+
+    for name, step in steps:
+        start = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            # A cold worker still works; warmup must never stop the server starting
+            logger.exception("Warmup step %s failed", name)
+        timings[name] = time.perf_counter() - start
+
+    # Workers must not share the master's database connections after fork
+    connections.close_all()
+    return timings
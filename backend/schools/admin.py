@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import School, AcademicYear, Term, Class, Subject, ClassSubject, GradingScale
+from .models import School, AcademicYear, Term, Class, Subject, ClassSubject, GradingScale, SchoolStats
 
 
 @admin.register(School)
@@ -81,3 +81,9 @@ class ClassSubjectAdmin(admin.ModelAdmin):
 class GradingScaleAdmin(admin.ModelAdmin):
 	list_display = ("school", "grade", "min_score", "max_score", "remark")
 	list_filter = ("school", "grade")
+
+
+@admin.register(SchoolStats)
+class SchoolStatsAdmin(admin.ModelAdmin):
+	list_display = ("school", "active_students", "teachers", "classes", "reports_published", "storage_bytes", "rebuilt_at")
+	readonly_fields = ("rebuilt_at", "updated_at")
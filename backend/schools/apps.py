@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SchoolsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'schools'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+        # Connects the query tracking receiver before any connection is opened
+        from school_report_saas import metrics  # noqa: F401
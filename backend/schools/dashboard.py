@@ -0,0 +1,117 @@
+"""
+School dashboard metrics.
+
+The payload is built in four queries, plus the separately cached tenant context,
+and cached per school for a short time. Signal handlers in schools.signals drop
+the cached copy whenever the underlying records change, so the TTL only bounds
+staleness for bulk writes that bypass signals.
+"""
+
+import hashlib
+import json
+
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+from django.db.models import Count, Q
+
+from school_report_saas.tenant import load_school_context
+from students.models import Student
+from .models import Class, Subject, ClassSubject
+from .stats import get_school_stats
+
+DASHBOARD_TTL = 60
+
+
+def dashboard_cache_key(school_id):
+    return f"school-dashboard:{school_id}"
+
+
+def invalidate_dashboard(school_id):
+    if school_id:
+        cache.delete(dashboard_cache_key(school_id))
+
+
+def compute_dashboard(school):
+    # 1. Maintained counters for teachers and reports
+    stats = get_school_stats(school)
+
+    # 2. Students and their gender split in one pass; like the per-class figures
+    # below, every enrolled student counts, active or not
+    genders = [gender for gender, _ in Student.GENDER_CHOICES]
+    students = Student.objects.filter(school=school).aggregate(
+        total=Count('id'),
+        **{gender: Count('id', filter=Q(gender=gender)) for gender in genders}
+    )
+
+    # 3. Classes with their student counts
+    classes = list(Class.objects.filter(school=school).annotate(student_count=Count('students')))
+
+    # 4. Distinct subjects taught, overall and per category
+    categories = [category for category, _ in Subject.CATEGORY_CHOICES]
+    subjects = ClassSubject.objects.filter(class_instance__school=school).aggregate(
+        total=Count('subject', distinct=True),
+        **{
+            category: Count('subject', distinct=True, filter=Q(subject__category=category))
+            for category in categories
+        }
+    )
+
+    current = load_school_context(school.id) or {}
+    academic_year, term = current.get('academic_year'), current.get('term')
+    return {
+        "school": {
+            "id": school.id,
+            "name": school.name,
+            "score_entry_mode": school.score_entry_mode,
+            "report_template": school.report_template,
+            "show_class_average": school.show_class_average,
+            "show_position_in_class": school.show_position_in_class,
+        },
+        "counts": {
+            "students": students['total'],
+            "teachers": stats.teachers,
+            "classes": len(classes),
+            "subjects": subjects['total'],
+            "reports": stats.reports_generated,
+        },
+        "current": {
+            "academic_year": academic_year.name if academic_year else None,
+            "term": term.get_name_display() if term else None,
+        },
+        "charts": {
+            "students_by_class": [
+                {"name": f"{c.get_level_display() or c.level}{' ' + c.section if c.section else ''}", "students": c.student_count}
+                for c in classes
+            ],
+            "gender_distribution": [
+                {"name": gender, "value": students[gender]}
+                for gender in genders
+                if students[gender]
+            ],
+            "subjects_by_category": [
+                {"name": category, "value": subjects[category]}
+                for category in categories
+                if subjects[category]
+            ],
+        }
+    }
+
+
+def get_dashboard(school):
+    """Return (payload, etag), computing and caching the payload on a miss"""
+    key = dashboard_cache_key(school.id)
+    cached = cache.get(key)
+    if cached is None:
+        data = compute_dashboard(school)
+        etag = hashlib.md5(json.dumps(data, sort_keys=True, default=str).encode()).hexdigest()
+        cached = {'data': data, 'etag': f'"{etag}"'}
+        cache.set(key, cached, DASHBOARD_TTL)
+    return cached['data'], cached['etag']
+
+
+async def aget_dashboard(school):
+    """get_dashboard for async views; a cache hit never leaves the event loop"""
+    cached = await cache.aget(dashboard_cache_key(school.id))
+    if cached is None:
+        return await sync_to_async(get_dashboard)(school)
+    return cached['data'], cached['etag']
@@ -0,0 +1,88 @@
+import statistics
+import time
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.test import Client, override_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+from accounts.models import User
+from school_report_saas.authentication import invalidate_auth_user
+from school_report_saas.tenant import invalidate_tenant
+from schools.dashboard import invalidate_dashboard
+from schools.models import School
+from schools.provisioning import DEMO_TEMPLATE, provision_school
+
+METRICS_MIDDLEWARE = 'school_report_saas.metrics.MetricsMiddleware'
+PATHS = ['/api/health/', '/api/schools/dashboard/', '/api/students/', '/api/schools/classes/']
+
+
+class Command(BaseCommand):
+    help = (
+        'Compare request latency through the full middleware stack with and without MetricsMiddleware '
+        '(seeded data is rolled back). Set PROMETHEUS_MULTIPROC_DIR to measure the gunicorn file store.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=500, help='Timed requests per path and stack')
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            user = self._seed()
+            host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost')
+            headers = {'HTTP_HOST': host, 'HTTP_AUTHORIZATION': f'Bearer {RefreshToken.for_user(user).access_token}'}
+            without = [name for name in settings.MIDDLEWARE if name != METRICS_MIDDLEWARE]
+            # Each client builds its middleware chain on its first request
+            clients = {'with': Client(**headers)}
+            with override_settings(MIDDLEWARE=without):
+                clients['without'] = Client(**headers)
+                for path in PATHS:
+                    self._get(clients['without'], path)
+            for path in PATHS:
+                self._get(clients['with'], path)
+
+            results = [(path, *self._measure(clients, path, options['repeat'])) for path in PATHS]
+            transaction.set_rollback(True)
+        invalidate_auth_user(user)
+        invalidate_tenant(user.school_id)
+        invalidate_dashboard(user.school_id)
+
+        self.stdout.write(f"Median latency over {options['repeat']} requests (ms):")
+        self.stdout.write(f"{'':<28} {'without':>9} {'with':>9} {'added us':>9} {'overhead':>9}")
+        for path, without_ms, with_ms in results:
+            overhead = (with_ms - without_ms) / without_ms * 100
+            self.stdout.write(
+                f"{path:<28} {without_ms:9.3f} {with_ms:9.3f} {(with_ms - without_ms) * 1000:9.0f} {overhead:8.1f}%"
+            )
+
+    def _seed(self):
+        school = School.objects.create(
+            name='Metrics Benchmark', address='-', location='-', phone_number='0',
+            email='metrics-benchmark@example.com'
+        )
+        user = User.objects.create_user(
+            email='metrics-benchmark@example.com', password=None, first_name='Bench', last_name='Mark',
+            role='SCHOOL_ADMIN', school=school
+        )
+        provision_school(school, DEMO_TEMPLATE)
+        return user
+
+    def _get(self, client, path):
+        response = client.get(path)
+        assert response.status_code == 200, (path, response.status_code)
+
+    def _measure(self, clients, path, repeat):
+        """
+        Median ms per stack; requests alternate so both see the same conditions
+
+        The order flips every round: the stack that goes second runs measurably
+        faster on heavier paths, which otherwise shows up as overhead.
+        """
+        timings = {name: [] for name in clients}
+        order = list(clients.items())
+        for _ in range(repeat):
+            order.reverse()
+            for name, client in order:
+                start = time.perf_counter()
+                self._get(client, path)
+                timings[name].append(time.perf_counter() - start)
+        return statistics.median(timings['without']) * 1000, statistics.median(timings['with']) * 1000
@@ -0,0 +1,93 @@
+import socket
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlsplit
+import requests
+from django.core.management.base import BaseCommand, CommandError
+from rest_framework_simplejwt.tokens import AccessToken
+from accounts.models import User
+
+DEFAULT_PATHS = ['/api/health/', '/api/schools/dashboard/', '/api/reports/report-cards/']
+
+
+class Command(BaseCommand):
+    help = 'Load a running server with concurrent GETs and report throughput and latency per path'
+
+    def add_arguments(self, parser):
+        parser.add_argument('url', help='Server base URL, e.g. http://127.0.0.1:8000')
+        parser.add_argument('--path', action='append', dest='paths', help='Path to request (repeatable)')
+        parser.add_argument('--email', help='Authenticate as this user with a fresh access token')
+        parser.add_argument('--concurrency', type=int, default=50)
+        parser.add_argument('--requests', type=int, default=1000, help='Requests per path')
+        parser.add_argument('--timeout', type=float, default=10, help='Seconds before a request counts as an error')
+        parser.add_argument('--slow-clients', type=int, default=0,
+                            help='Connections that trickle their headers for the whole run, like clients on a poor mobile link')
+
+    def handle(self, *args, **options):
+        headers = {}
+        if options['email']:
+            user = User.objects.filter(email=options['email']).first()
+            if user is None:
+                raise CommandError(f"No user with email {options['email']}")
+            headers['Authorization'] = f'Bearer {AccessToken.for_user(user)}'
+
+        self.local = threading.local()
+        self.timeout = options['timeout']
+        stop = threading.Event()
+        for _ in range(options['slow_clients']):
+            threading.Thread(target=self._trickle, args=(options['url'], stop), daemon=True).start()
+        try:
+            self._run(options, headers)
+        finally:
+            stop.set()
+
+    def _run(self, options, headers):
+        self.stdout.write(
+            f"{options['requests']} requests per path, concurrency {options['concurrency']}, "
+            f"{options['slow_clients']} slow clients"
+        )
+        for path in options['paths'] or DEFAULT_PATHS:
+            url = options['url'].rstrip('/') + path
+            timings, errors, elapsed = self._load(url, headers, options['concurrency'], options['requests'])
+            if not timings:
+                self.stdout.write(f"{path:<32} all {errors} requests failed")
+                continue
+            cuts = statistics.quantiles(timings, n=100) if len(timings) > 1 else timings * 99
+            self.stdout.write(
+                f"{path:<32} {len(timings) / elapsed:8.1f} req/s  "
+                f"p50 {cuts[49] * 1000:7.1f} ms  p95 {cuts[94] * 1000:7.1f} ms  "
+                f"p99 {cuts[98] * 1000:7.1f} ms  errors {errors}"
+            )
+
+    def _get(self, url, headers):
+        session = getattr(self.local, 'session', None)
+        if session is None:
+            session = self.local.session = requests.Session()
+        start = time.perf_counter()
+        try:
+            ok = session.get(url, headers=headers, timeout=self.timeout).status_code < 400
+        except requests.RequestException:
+            ok = False
+        return ok, time.perf_counter() - start
+
+    def _trickle(self, url, stop):
+        """Hold a connection open by sending a header one byte per second"""
+        parts = urlsplit(url)
+        try:
+            with socket.create_connection((parts.hostname, parts.port or 80), timeout=5) as sock:
+                sock.sendall(f"GET / HTTP/1.1\r\nHost: {parts.hostname}\r\nX-Slow: ".encode())
+                while not stop.wait(1):
+                    sock.sendall(b'x')
+        except OSError:
+            pass
+
+    def _load(self, url, headers, concurrency, total):
+        self._get(url, headers)  # warm up caches and connections
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(lambda _: self._get(url, headers), range(total)))
+        elapsed = time.perf_counter() - start
+        timings = [duration for ok, duration in results if ok]
+        return timings, len(results) - len(timings), elapsed
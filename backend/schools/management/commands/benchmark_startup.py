@@ -0,0 +1,65 @@
+import json
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+# Runs in a fresh interpreter: load the WSGI app like a gunicorn master, optionally
+# warm it, then time one small PDF the way a worker's first report would
+SCRIPT = """
+import json, os, sys, time
+start = time.perf_counter()
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'school_report_saas.settings')
+import school_report_saas.wsgi
+loaded = time.perf_counter()
+from school_report_saas.warmup import render_sample_pdf, warmup
+if sys.argv[1] == 'warm':
+    warmup(prime_caches=False)
+warmed = time.perf_counter()
+render_sample_pdf()
+done = time.perf_counter()
+print(json.dumps({'load': loaded - start, 'warmup': warmed - loaded, 'first_pdf': done - warmed}))
+"""
+
+
+class Command(BaseCommand):
+    help = 'Measure cold start (python -X importtime), warmup cost and first-PDF latency in fresh interpreters'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='Fresh interpreters per mode')
+        parser.add_argument('--top', type=int, default=15, help='Packages to list by import time')
+
+    def handle(self, *args, **options):
+        results = {'cold': [], 'warm': []}
+        for _ in range(options['repeat']):
+            for mode in results:
+                timings, imports = self._run(mode)
+                results[mode].append(timings)
+
+        self.stdout.write(f"Median of {options['repeat']} fresh interpreters (ms):")
+        self.stdout.write(f"{'':<6} {'app load':>9} {'warmup':>9} {'first PDF':>10}")
+        for mode, runs in results.items():
+            load, warm, pdf = (statistics.median(run[key] for run in runs) * 1000 for key in ('load', 'warmup', 'first_pdf'))
+            self.stdout.write(f"{mode:<6} {load:9.1f} {warm:9.1f} {pdf:10.1f}")
+
+        self.stdout.write("\nImport time by top-level package, warm run (ms, self time summed):")
+        for package, micros in sorted(imports.items(), key=lambda item: -item[1])[:options['top']]:
+            self.stdout.write(f"{package:<32} {micros / 1000:8.1f}")
+
+    def _run(self, mode):
+        env = {**os.environ, 'PYTHONPATH': os.pathsep.join(filter(None, [str(settings.BASE_DIR), os.environ.get('PYTHONPATH')]))}
+        process = subprocess.run(
+            [sys.executable, '-X', 'importtime', '-c', SCRIPT, mode],
+            capture_output=True, text=True, env=env, cwd=settings.BASE_DIR, check=True,
+        )
+        imports = defaultdict(int)
+        for line in process.stderr.splitlines():
+            # "import time: self [us] | cumulative | name"
+            if not line.startswith('import time:') or '[us]' in line:
+                continue
+            own, _, name = line[len('import time:'):].split('|')
+            imports[name.strip().split('.')[0]] += int(own)
+        return json.loads(process.stdout.strip().splitlines()[-1]), imports
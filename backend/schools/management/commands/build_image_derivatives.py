@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Q
+from school_report_saas.images import refresh_derivatives
+from schools.models import School
+from schools.signals import LOGO_DERIVATIVES, SIGNATURE_DERIVATIVES
+from students.models import Student
+from students.signals import PHOTO_DERIVATIVES
+
+
+class Command(BaseCommand):
+    help = 'Build report-sized copies of existing logos, signatures and student photos'
+
+    def handle(self, *args, **options):
+        updated = 0
+        schools = School.objects.filter(
+            (Q(logo__gt='') & (Q(logo_report='') | Q(logo_report__isnull=True))) |
+            (Q(principal_signature__gt='') & (Q(principal_signature_report='') | Q(principal_signature_report__isnull=True)))
+        )
+        for school in schools.iterator():
+            updated += bool(refresh_derivatives(school, 'logo', LOGO_DERIVATIVES))
+            updated += bool(refresh_derivatives(school, 'principal_signature', SIGNATURE_DERIVATIVES))
+
+        students = Student.objects.filter(photo__gt='').filter(Q(photo_report='') | Q(photo_report__isnull=True))
+        for student in students.iterator():
+            updated += bool(refresh_derivatives(student, 'photo', PHOTO_DERIVATIVES))
+
+        self.stdout.write(f"Built derivatives for {updated} images")
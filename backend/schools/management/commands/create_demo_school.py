@@ -0,0 +1,35 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from accounts.models import User
+from schools.models import School
+from schools.provisioning import DEMO_TEMPLATE, provision_school
+
+
+class Command(BaseCommand):
+    help = 'Create a demo school with three terms, all classes and their subjects, and an admin login'
+
+    def add_arguments(self, parser):
+        parser.add_argument('email', help='Email for the school and its admin user')
+        parser.add_argument('--name', default='Demo School')
+        parser.add_argument('--password', default='demo-password')
+
+    def handle(self, *args, **options):
+        email = options['email']
+        if School.objects.filter(email=email).exists() or User.objects.filter(email=email).exists():
+            raise CommandError(f"{email} is already in use")
+
+        with transaction.atomic():
+            school = School.objects.create(
+                name=options['name'], address='-', location='-', phone_number='-', email=email
+            )
+            provisioned = provision_school(school, DEMO_TEMPLATE)
+            User.objects.create_user(
+                email=email, password=options['password'], first_name='Demo', last_name='Admin',
+                role='SCHOOL_ADMIN', school=school
+            )
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Created {school.name} (id {school.id}) with {len(provisioned['terms'])} terms, "
+            f"{len(provisioned['classes'])} classes and {len(provisioned['class_subjects'])} class subjects; "
+            f"log in as {email}"
+        ))
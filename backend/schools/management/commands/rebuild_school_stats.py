@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from schools.stats import rebuild_all
+
+
+class Command(BaseCommand):
+    help = 'Recount the cached per-school statistics and correct any drift'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--skip-storage', action='store_true',
+                            help='Leave storage_bytes alone; it reads the size of every stored file')
+
+    def handle(self, *args, **options):
+        drifted = rebuild_all(include_storage=not options['skip_storage'])
+        self.stdout.write(f"Rebuilt school stats; {drifted} schools had drifted")
@@ -0,0 +1,28 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_alter_school_report_template'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='school',
+            name='logo_report',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='school_logos/'),
+        ),
+        migrations.AddField(
+            model_name='school',
+            name='logo_thumbnail',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='school_logos/'),
+        ),
+        migrations.AddField(
+            model_name='school',
+            name='principal_signature_report',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='signatures/'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0005_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SchoolStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('active_students', models.IntegerField(default=0)),
+                ('teachers', models.IntegerField(default=0)),
+                ('classes', models.IntegerField(default=0)),
+                ('reports_generated', models.IntegerField(default=0, help_text='Report cards created, whatever their status')),
+                ('reports_published', models.IntegerField(default=0)),
+                ('storage_bytes', models.BigIntegerField(default=0, help_text='Size of uploaded and generated files, as of the last rebuild')),
+                ('rebuilt_at', models.DateTimeField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('school', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='schools.school')),
+            ],
+            options={
+                'verbose_name_plural': 'School stats',
+                'db_table': 'school_stats',
+            },
+        ),
+    ]
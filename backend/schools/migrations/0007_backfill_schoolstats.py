@@ -0,0 +1,41 @@
+from django.db import migrations
+from django.utils import timezone
+
+
+def backfill_stats(apps, schema_editor):
+    """Count existing schools; storage_bytes waits for rebuild_school_stats, which reads every file"""
+    School = apps.get_model('schools', 'School')
+    SchoolStats = apps.get_model('schools', 'SchoolStats')
+    Class = apps.get_model('schools', 'Class')
+    Student = apps.get_model('students', 'Student')
+    ReportCard = apps.get_model('reports', 'ReportCard')
+    User = apps.get_model('accounts', 'User')
+
+    now = timezone.now()
+    missing = School.objects.filter(stats__isnull=True)
+    SchoolStats.objects.bulk_create([
+        SchoolStats(
+            school=school,
+            active_students=Student.objects.filter(school=school, is_active=True).count(),
+            teachers=User.objects.filter(school=school, role='TEACHER').count(),
+            classes=Class.objects.filter(school=school).count(),
+            reports_generated=ReportCard.objects.filter(student__school=school).count(),
+            reports_published=ReportCard.objects.filter(student__school=school, status='PUBLISHED').count(),
+            rebuilt_at=now,
+        )
+        for school in missing.iterator()
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0006_schoolstats'),
+        ('students', '0005_image_derivatives'),
+        ('reports', '0001_initial'),
+        ('accounts', '0003_outstandingtoken_expires_at_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_stats, migrations.RunPython.noop),
+    ]
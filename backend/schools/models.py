@@ -25,6 +25,9 @@ class School(models.Model):
     email = models.EmailField(unique=True)
     # Use FileField initially to avoid Pillow requirement; can switch to ImageField later
     logo = models.FileField(upload_to='school_logos/', null=True, blank=True)
+    # Derivatives built from logo on upload (see school_report_saas.images)
+    logo_report = models.FileField(upload_to='school_logos/', null=True, blank=True, editable=False)
+    logo_thumbnail = models.FileField(upload_to='school_logos/', null=True, blank=True, editable=False)
     motto = models.CharField(max_length=255, blank=True)
     website = models.URLField(blank=True, null=True)
     
@@ -82,6 +85,7 @@ class School(models.Model):
         blank=True,
         help_text='Principal signature image for report cards'
     )
+    principal_signature_report = models.FileField(upload_to='signatures/', null=True, blank=True, editable=False)
     class_teacher_signature_required = models.BooleanField(
         default=False,
         help_text='Require class teacher signature on report cards'
@@ -119,6 +123,16 @@ class School(models.Model):
     def __str__(self):
         return self.name
     
+    @property
+    def report_logo(self):
+        """Print-sized logo for report rendering, falling back to the original"""
+        return self.logo_report or self.logo
+    
+    @property
+    def report_signature(self):
+        """Print-sized principal signature, falling back to the original"""
+        return self.principal_signature_report or self.principal_signature
+    
     def get_grade_for_score(self, score):
         """Return grade letter for given score based on school's grade scale"""
         if score >= self.grade_scale_a_min:
@@ -275,3 +289,24 @@ class GradingScale(models.Model):
     
     def __str__(self):
         return f"{self.grade} ({self.min_score}-{self.max_score})"
+
+
+class SchoolStats(models.Model):
+    """Running counters for a school, kept current by schools.stats"""
+    
+    school = models.OneToOneField(School, on_delete=models.CASCADE, related_name='stats')
+    active_students = models.IntegerField(default=0)
+    teachers = models.IntegerField(default=0)
+    classes = models.IntegerField(default=0)
+    reports_generated = models.IntegerField(default=0, help_text='Report cards created, whatever their status')
+    reports_published = models.IntegerField(default=0)
+    storage_bytes = models.BigIntegerField(default=0, help_text='Size of uploaded and generated files, as of the last rebuild')
+    rebuilt_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'school_stats'
+        verbose_name_plural = 'School stats'
+    
+    def __str__(self):
+        return f"{self.school.name} stats"
@@ -0,0 +1,157 @@
+"""
+Create a school's starting records from a declarative template.
+
+A template lists the terms, grading scale, subjects and (optionally) classes a
+new school starts with. provision_school inserts each kind of record with one
+bulk_create, so setting up a tenant costs a handful of queries however big the
+template is. Registration uses DEFAULT_TEMPLATE; DEMO_TEMPLATE and custom
+templates serve demo tenants and benchmark seeding.
+"""
+
+from datetime import date
+
+from django.db import transaction
+
+from school_report_saas.tenant import invalidate_tenant
+from .dashboard import invalidate_dashboard
+from .models import AcademicYear, Term, Class, Subject, ClassSubject, GradingScale
+from .stats import adjust_stats
+
+LEVEL_GROUPS = {
+    'PRIMARY': ['BASIC_1', 'BASIC_2', 'BASIC_3', 'BASIC_4', 'BASIC_5', 'BASIC_6'],
+    'JHS': ['BASIC_7', 'BASIC_8', 'BASIC_9'],
+}
+LEVEL_GROUPS['BOTH'] = LEVEL_GROUPS['PRIMARY'] + LEVEL_GROUPS['JHS']
+
+# (term, (start month, day), (end month, day)); months before September fall in
+# the second calendar year of the academic year
+TERM_DATES = [
+    ('FIRST', (9, 1), (12, 15)),
+    ('SECOND', (1, 6), (4, 10)),
+    ('THIRD', (4, 27), (7, 31)),
+]
+
+# Ghana style grading scale: (grade, min, max, remark)
+DEFAULT_GRADES = [
+    ('A', 80, 100, 'Excellent'),
+    ('B', 70, 79, 'Very Good'),
+    ('C', 60, 69, 'Good'),
+    ('D', 50, 59, 'Average'),
+    ('E', 40, 49, 'Pass'),
+    ('F', 0, 39, 'Fail'),
+]
+
+# Subjects are shared by all schools and matched on code: (name, code, category)
+DEFAULT_SUBJECTS = [
+    ('English Language', 'ENG', 'BOTH'),
+    ('Mathematics', 'MATH', 'BOTH'),
+    ('Integrated Science', 'SCI', 'BOTH'),
+    ('Creative Art', 'ART', 'BOTH'),
+    ('Computing', 'COMP', 'BOTH'),
+]
+
+DEFAULT_TEMPLATE = {
+    'terms': ['FIRST'],
+    'grading_scale': DEFAULT_GRADES,
+    'subjects': DEFAULT_SUBJECTS,
+    # Sections to create for every level in the chosen level groups
+    'class_sections': [],
+    # Assign every fitting template subject to every new class
+    'assign_subjects': False,
+}
+
+DEMO_TEMPLATE = {
+    **DEFAULT_TEMPLATE,
+    'terms': [name for name, _, _ in TERM_DATES],
+    'class_sections': ['A'],
+    'assign_subjects': True,
+}
+
+
+def academic_year_span(today=None):
+    """Name, start and end of the academic year (September to July) containing ``today``"""
+    today = today or date.today()
+    first = today.year if today.month >= 9 else today.year - 1
+    return f"{first}/{first + 1}", date(first, 9, 1), date(first + 1, 7, 31)
+
+
+def subject_fits_level(category, level):
+    return category == 'BOTH' or level in LEVEL_GROUPS.get(category, [])
+
+
+def provision_school(school, template=None, levels=('BOTH',), today=None):
+    """
+    Create the current academic year and the template's records for ``school``.
+
+    ``template`` keys override DEFAULT_TEMPLATE. ``levels`` picks the level
+    groups (PRIMARY, JHS, BOTH) classes are created for. Returns the created
+    academic year, terms, grading scale, subjects, classes and class subjects.
+    """
+    template = {**DEFAULT_TEMPLATE, **(template or {})}
+    name, start_date, end_date = academic_year_span(today)
+    term_dates = {term: (start, end) for term, start, end in TERM_DATES}
+
+    def term_date(month_day):
+        month, day = month_day
+        return date(start_date.year if month >= 9 else end_date.year, month, day)
+
+    class_levels = []
+    for group in levels:
+        class_levels += [level for level in LEVEL_GROUPS[group] if level not in class_levels]
+
+    with transaction.atomic():
+        academic_year = AcademicYear.objects.create(
+            school=school, name=name, start_date=start_date, end_date=end_date, is_current=True
+        )
+        terms = Term.objects.bulk_create([
+            Term(
+                academic_year=academic_year,
+                name=term,
+                start_date=term_date(term_dates[term][0]),
+                end_date=term_date(term_dates[term][1]),
+                is_current=index == 0,
+                total_days=0,
+            )
+            for index, term in enumerate(template['terms'])
+        ])
+        grading_scale = GradingScale.objects.bulk_create([
+            GradingScale(school=school, grade=grade, min_score=min_score, max_score=max_score, remark=remark)
+            for grade, min_score, max_score, remark in template['grading_scale']
+        ])
+
+        # Codes other schools already created are skipped; the re-read gives
+        # every template subject its primary key either way
+        codes = [code for _, code, _ in template['subjects']]
+        Subject.objects.bulk_create([
+            Subject(name=subject_name, code=code, category=category)
+            for subject_name, code, category in template['subjects']
+        ], ignore_conflicts=True)
+        subjects = list(Subject.objects.filter(code__in=codes)) if codes else []
+
+        classes = Class.objects.bulk_create([
+            Class(school=school, level=level, section=section)
+            for level in class_levels
+            for section in template['class_sections']
+        ])
+        class_subjects = []
+        if template['assign_subjects']:
+            class_subjects = ClassSubject.objects.bulk_create([
+                ClassSubject(class_instance=class_obj, subject=subject)
+                for class_obj in classes
+                for subject in subjects
+                if subject_fits_level(subject.category, class_obj.level)
+            ])
+        # bulk_create skips the post_save counters
+        adjust_stats(school_id=school.id, classes=len(classes))
+
+    # The terms were bulk created after the year's save had dropped the cache
+    invalidate_tenant(school.id)
+    invalidate_dashboard(school.id)
+    return {
+        'academic_year': academic_year,
+        'terms': terms,
+        'grading_scale': grading_scale,
+        'subjects': subjects,
+        'classes': classes,
+        'class_subjects': class_subjects,
+    }
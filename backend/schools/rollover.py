@@ -0,0 +1,113 @@
+"""
+Start a new academic year from the previous one.
+
+Class subject assignments (with their teachers) and the grading scale belong to
+the school rather than to a year, so they stay in force as they are; the rollover
+reports them in its summary and only creates the year and its terms. Optionally
+it also promotes students out of the old year in the same transaction.
+"""
+
+import calendar
+import re
+from datetime import date
+
+from django.db import transaction
+
+from school_report_saas.tenant import invalidate_tenant
+from students.promotion import promote_academic_year
+from .dashboard import invalidate_dashboard
+from .models import School, AcademicYear, Term, ClassSubject, GradingScale
+
+
+class RolloverError(Exception):
+    pass
+
+
+def shift_year(value, years=1):
+    """Same day and month ``years`` later; 29 February becomes the 28th"""
+    year = value.year + years
+    day = min(value.day, calendar.monthrange(year, value.month)[1])
+    return date(year, value.month, day)
+
+
+def next_year_name(name):
+    """'2024/2025' -> '2025/2026'; every four-digit year in the name moves on by one"""
+    if not re.search(r'\d{4}', name):
+        raise RolloverError(f"Cannot work out the year after '{name}'; give the new year a name")
+    return re.sub(r'\d{4}', lambda match: str(int(match.group()) + 1), name)
+
+
+def rollover_academic_year(school, source_year, name=None, make_current=True, promote=False, dry_run=False):
+    """
+    Create the academic year after ``source_year`` with the same terms, one year on.
+
+    Returns a summary of what was (or, with dry_run, would be) created. With
+    promote set, students are promoted out of ``source_year`` as well.
+    """
+    name = name or next_year_name(source_year.name)
+    if AcademicYear.objects.filter(school=school, name=name).exists():
+        raise RolloverError(f"Academic year {name} already exists")
+
+    source_terms = list(source_year.terms.order_by('start_date'))
+    if not source_terms:
+        raise RolloverError("The academic year has no terms to copy")
+
+    new_year = AcademicYear(
+        school=school,
+        name=name,
+        start_date=shift_year(source_year.start_date),
+        end_date=shift_year(source_year.end_date),
+        is_current=make_current,
+    )
+    new_terms = [
+        Term(
+            academic_year=new_year,
+            name=term.name,
+            start_date=shift_year(term.start_date),
+            end_date=shift_year(term.end_date),
+            total_days=term.total_days,
+            is_current=make_current and index == 0,
+        )
+        for index, term in enumerate(source_terms)
+    ]
+
+    assignments = ClassSubject.objects.filter(class_instance__school=school)
+    result = {
+        'academic_year': {
+            'name': new_year.name,
+            'start_date': new_year.start_date,
+            'end_date': new_year.end_date,
+            'is_current': new_year.is_current,
+        },
+        'terms': [
+            {'name': term.name, 'start_date': term.start_date, 'end_date': term.end_date, 'is_current': term.is_current}
+            for term in new_terms
+        ],
+        'class_subjects_kept': assignments.count(),
+        'class_subjects_with_teacher': assignments.filter(teacher__isnull=False).count(),
+        'grading_scale_kept': GradingScale.objects.filter(school=school).count(),
+        'promotion': None,
+    }
+    if dry_run:
+        if promote:
+            result['promotion'] = promote_academic_year(school, source_year, dry_run=True)
+        return result
+
+    with transaction.atomic():
+        if make_current:
+            AcademicYear.objects.filter(school=school, is_current=True).update(is_current=False)
+            Term.objects.filter(academic_year__school=school, is_current=True).update(is_current=False)
+            # The display field shown on reports and in settings follows the current year
+            display_name = name[:School._meta.get_field('current_academic_year').max_length]
+            School.objects.filter(pk=school.pk).update(current_academic_year=display_name)
+            school.current_academic_year = display_name
+        new_year.save()
+        Term.objects.bulk_create(new_terms)
+        if promote:
+            result['promotion'] = promote_academic_year(school, source_year)
+
+    result['academic_year']['id'] = new_year.id
+    # The flag updates and bulk_create bypass signals
+    invalidate_tenant(school.id)
+    invalidate_dashboard(school.id)
+    return result
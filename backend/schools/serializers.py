@@ -1,12 +1,27 @@
 from rest_framework import serializers
-from .models import School, AcademicYear, Term, Class, Subject, ClassSubject, GradingScale
+from school_report_saas.images import validate_image
+from .models import School, AcademicYear, Term, Class, Subject, ClassSubject, GradingScale, SchoolStats
+
+
+class SchoolStatsSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = SchoolStats
+        exclude = ['id', 'school']
 
 
 class SchoolSerializer(serializers.ModelSerializer):
+    stats = SchoolStatsSerializer(read_only=True)
+    
     class Meta:
         model = School
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
+    
+    def validate_logo(self, value):
+        return validate_image(value)
+    
+    def validate_principal_signature(self, value):
+        return validate_image(value)
 
 
 class SchoolSettingsSerializer(serializers.ModelSerializer):
@@ -17,7 +32,7 @@ class SchoolSettingsSerializer(serializers.ModelSerializer):
         fields = [
             # Basic Information
             'id', 'name', 'address', 'location', 'phone_number', 'email', 
-            'logo', 'motto', 'website', 'current_academic_year',
+            'logo', 'logo_thumbnail', 'motto', 'website', 'current_academic_year',
             
             # System Configuration
             'score_entry_mode', 'is_active',
@@ -37,6 +52,12 @@ class SchoolSettingsSerializer(serializers.ModelSerializer):
             'updated_at'
         ]
         read_only_fields = ['id', 'updated_at']
+    
+    def validate_logo(self, value):
+        return validate_image(value)
+    
+    def validate_principal_signature(self, value):
+        return validate_image(value)
         
     def validate_grade_scale(self, attrs):
         """Ensure grade scale values are in logical order"""
@@ -90,6 +111,10 @@ class ClassSerializer(serializers.ModelSerializer):
         return None
     
     def get_student_count(self, obj):
+        # Annotated by ClassViewSet.get_queryset; count directly for anything else
+        count = getattr(obj, 'active_student_count', None)
+        if count is not None:
+            return count
         return obj.students.filter(is_active=True).count()
 
     def get_level_display(self, obj):
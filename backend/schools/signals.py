@@ -0,0 +1,183 @@
+from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from school_report_saas.images import THUMBNAIL_SIZE, inches, refresh_derivatives
+from school_report_saas.tenant import invalidate_tenant
+from reports.models import ReportCard
+from students.models import Student
+from .dashboard import invalidate_dashboard
+from .stats import adjust_stats
+from .models import School, AcademicYear, Term, Class, ClassSubject, SchoolStats
+
+LOGO_DERIVATIVES = {
+    'logo_report': ('report', inches(0.8, 0.8)),
+    'logo_thumbnail': ('thumb', THUMBNAIL_SIZE),
+}
+SIGNATURE_DERIVATIVES = {
+    'principal_signature_report': ('report', inches(2.0, 0.6)),
+}
+
+
+@receiver(post_save, sender=School)
+def refresh_school_images(sender, instance, update_fields=None, **kwargs):
+    """Rebuild print-sized copies of the logo and signature when they change"""
+    if update_fields is not None and not {'logo', 'principal_signature'} & set(update_fields):
+        return
+    refresh_derivatives(instance, 'logo', LOGO_DERIVATIVES)
+    refresh_derivatives(instance, 'principal_signature', SIGNATURE_DERIVATIVES)
+
+
+@receiver([post_save, post_delete], sender=School)
+@receiver([post_save, post_delete], sender=Student)
+@receiver([post_save, post_delete], sender=Class)
+@receiver([post_save, post_delete], sender=AcademicYear)
+def invalidate_dashboard_for_school(sender, instance, **kwargs):
+    invalidate_dashboard(instance.pk if sender is School else instance.school_id)
+
+
+def _school_id_through(instance, relation):
+    """school_id of a related object, without a query when the relation is already loaded"""
+    field = instance._meta.get_field(relation)
+    if field.is_cached(instance):
+        related = getattr(instance, relation)
+        return related.school_id if related else None
+    related_id = getattr(instance, field.attname)
+    return field.related_model.objects.filter(pk=related_id).values_list('school_id', flat=True).first()
+
+
+@receiver([post_save, post_delete], sender=Term)
+def invalidate_dashboard_for_term(sender, instance, **kwargs):
+    invalidate_dashboard(_school_id_through(instance, 'academic_year'))
+
+
+@receiver([post_save, post_delete], sender=ClassSubject)
+def invalidate_dashboard_for_class_subject(sender, instance, **kwargs):
+    invalidate_dashboard(_school_id_through(instance, 'class_instance'))
+
+
+@receiver([post_save, post_delete], sender=ReportCard)
+def invalidate_dashboard_for_report(sender, instance, **kwargs):
+    invalidate_dashboard(_school_id_through(instance, 'student'))
+
+
+@receiver([post_save, post_delete], sender=School)
+@receiver([post_save, post_delete], sender=AcademicYear)
+def invalidate_tenant_for_school(sender, instance, **kwargs):
+    invalidate_tenant(instance.pk if sender is School else instance.school_id)
+
+
+@receiver([post_save, post_delete], sender=Term)
+def invalidate_tenant_for_term(sender, instance, **kwargs):
+    invalidate_tenant(_school_id_through(instance, 'academic_year'))
+
+
+# SchoolStats counters. pre_save reads the stored values of a row whose counted
+# fields may change, so post_save can apply the difference instead of recounting.
+
+User = get_user_model()
+
+
+@receiver(post_save, sender=School)
+def create_school_stats(sender, instance, created, **kwargs):
+    if created:
+        SchoolStats.objects.get_or_create(school=instance)
+
+
+# Fields each counted model's counters depend on, as attnames
+COUNTED_FIELDS = {
+    Student: ('school_id', 'is_active'),
+    User: ('school_id', 'role'),
+    ReportCard: ('status',),
+}
+# Marks a save whose update_fields leave every counted field alone
+UNCHANGED = object()
+
+
+def _counted_values(sender, values):
+    if sender is Student:
+        return (values['school_id'], values['is_active'])
+    if sender is User:
+        return (values['school_id'], values['role'] == 'TEACHER')
+    return values['status'] == 'PUBLISHED'
+
+
+@receiver(pre_save, sender=Student)
+@receiver(pre_save, sender=User)
+@receiver(pre_save, sender=ReportCard)
+def load_counted_values(sender, instance, update_fields=None, **kwargs):
+    fields = COUNTED_FIELDS[sender]
+    if instance._state.adding:
+        instance._stats_loaded = None
+    elif update_fields is not None and not {sender._meta.get_field(name).attname for name in update_fields} & set(fields):
+        # e.g. update_last_login saving only last_login
+        instance._stats_loaded = UNCHANGED
+    else:
+        values = sender._base_manager.filter(pk=instance.pk).values(*fields).first()
+        instance._stats_loaded = _counted_values(sender, values) if values else None
+
+
+def _move_counter(counter, old, new):
+    """Apply a change from (school_id, counted) ``old`` to ``new``"""
+    old_school, old_counted = old or (None, False)
+    new_school, new_counted = new or (None, False)
+    if (old_school, old_counted) == (new_school, new_counted):
+        return
+    if old_counted:
+        adjust_stats(school_id=old_school, **{counter: -1})
+        invalidate_dashboard(old_school)
+    if new_counted:
+        adjust_stats(school_id=new_school, **{counter: 1})
+        invalidate_dashboard(new_school)
+
+
+@receiver(post_save, sender=Student)
+def count_student(sender, instance, **kwargs):
+    if instance._stats_loaded is not UNCHANGED:
+        _move_counter('active_students', instance._stats_loaded, (instance.school_id, instance.is_active))
+
+
+@receiver(post_save, sender=User)
+def count_teacher(sender, instance, **kwargs):
+    if instance._stats_loaded is not UNCHANGED:
+        _move_counter('teachers', instance._stats_loaded, (instance.school_id, instance.role == 'TEACHER'))
+
+
+@receiver(post_save, sender=ReportCard)
+def count_report(sender, instance, created, **kwargs):
+    if instance._stats_loaded is UNCHANGED:
+        return
+    adjust_stats(
+        student_id=instance.student_id,
+        reports_generated=1 if created else 0,
+        reports_published=int(instance.status == 'PUBLISHED') - int(bool(instance._stats_loaded)),
+    )
+
+
+@receiver(post_save, sender=Class)
+def count_class(sender, instance, created, **kwargs):
+    if created:
+        adjust_stats(school_id=instance.school_id, classes=1)
+
+
+@receiver(post_delete, sender=Student)
+def uncount_student(sender, instance, **kwargs):
+    _move_counter('active_students', (instance.school_id, instance.is_active), None)
+
+
+@receiver(post_delete, sender=User)
+def uncount_teacher(sender, instance, **kwargs):
+    _move_counter('teachers', (instance.school_id, instance.role == 'TEACHER'), None)
+
+
+@receiver(post_delete, sender=ReportCard)
+def uncount_report(sender, instance, **kwargs):
+    adjust_stats(
+        student_id=instance.student_id,
+        reports_generated=-1,
+        reports_published=-1 if instance.status == 'PUBLISHED' else 0,
+    )
+
+
+@receiver(post_delete, sender=Class)
+def uncount_class(sender, instance, **kwargs):
+    adjust_stats(school_id=instance.school_id, classes=-1)
@@ -0,0 +1,101 @@
+"""
+Per-school counters.
+
+Counters are adjusted with F() increments in the same transaction as the write
+that changes them (see schools.signals, plus explicit calls from bulk paths that
+skip signals). rebuild_school_stats recounts from scratch; the nightly
+rebuild_school_stats command uses it to correct any drift.
+"""
+
+import logging
+
+from django.contrib.auth import get_user_model
+from django.db.models import F
+from django.utils import timezone
+
+from reports.models import ReportCard
+from students.models import Student
+from .models import School, SchoolStats, Class
+
+logger = logging.getLogger(__name__)
+
+COUNTERS = ('active_students', 'teachers', 'classes', 'reports_generated', 'reports_published')
+
+
+def adjust_stats(school_id=None, student_id=None, **deltas):
+    """
+    Add ``deltas`` to a school's counters with a single UPDATE.
+
+    The school is given directly or through one of its students. A school with
+    no stats row yet is skipped; the row is built from real counts on first read.
+    """
+    deltas = {name: value for name, value in deltas.items() if value}
+    if not deltas or not (school_id or student_id):
+        return
+    stats = SchoolStats.objects.filter(school_id=school_id) if school_id else SchoolStats.objects.filter(school__students=student_id)
+    stats.update(updated_at=timezone.now(), **{name: F(name) + value for name, value in deltas.items()})
+
+
+def _file_size(field_file):
+    if not field_file:
+        return 0
+    try:
+        return field_file.size
+    except Exception:
+        return 0
+
+
+def compute_storage_bytes(school):
+    total = sum(_file_size(getattr(school, name)) for name in (
+        'logo', 'logo_report', 'logo_thumbnail', 'principal_signature', 'principal_signature_report'
+    ))
+    for student in Student.objects.filter(school=school).exclude(photo='').exclude(photo__isnull=True).only(
+        'photo', 'photo_report', 'photo_thumbnail'
+    ).iterator():
+        total += _file_size(student.photo) + _file_size(student.photo_report) + _file_size(student.photo_thumbnail)
+    for report in ReportCard.objects.filter(student__school=school).only('pdf_file', 'qr_code').iterator():
+        total += _file_size(report.pdf_file) + _file_size(report.qr_code)
+    return total
+
+
+def compute_counts(school):
+    User = get_user_model()
+    reports = ReportCard.objects.filter(student__school=school)
+    return {
+        'active_students': Student.objects.filter(school=school, is_active=True).count(),
+        'teachers': User.objects.filter(school=school, role='TEACHER').count(),
+        'classes': Class.objects.filter(school=school).count(),
+        'reports_generated': reports.count(),
+        'reports_published': reports.filter(status='PUBLISHED').count(),
+    }
+
+
+def rebuild_school_stats(school, include_storage=False):
+    """Recount a school's stats and return the saved row"""
+    values = compute_counts(school)
+    if include_storage:
+        values['storage_bytes'] = compute_storage_bytes(school)
+    values['rebuilt_at'] = timezone.now()
+    stats, _ = SchoolStats.objects.update_or_create(school=school, defaults=values)
+    return stats
+
+
+def get_school_stats(school):
+    """Return the stats row, building it on first use"""
+    try:
+        return SchoolStats.objects.get(school=school)
+    except SchoolStats.DoesNotExist:
+        return rebuild_school_stats(school)
+
+
+def rebuild_all(include_storage=True):
+    drifted = 0
+    for school in School.objects.all().iterator():
+        before = SchoolStats.objects.filter(school=school).values(*COUNTERS).first()
+        stats = rebuild_school_stats(school, include_storage=include_storage)
+        after = {name: getattr(stats, name) for name in COUNTERS}
+        if before != after:
+            drifted += 1
+            if before:
+                logger.info(f"Corrected stats drift for school {school.id}: {before} -> {after}")
+    return drifted
@@ -0,0 +1,231 @@
+import shutil
+import tempfile
+from datetime import date
+
+from django.core.cache import cache
+from django.core.files.storage import default_storage
+from django.core.files.base import ContentFile
+from django.db.models.signals import post_init
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from accounts.models import User
+from reports.models import ReportCard
+from students.models import Student
+from teachers.scope import get_teacher_scope
+from .models import School, AcademicYear, Term, Class, ClassSubject, Subject, SchoolStats
+from .rollover import rollover_academic_year
+from .stats import rebuild_all
+
+
+def make_school(email='school@example.com'):
+    """A school with a current year and term, and its admin"""
+    school = School.objects.create(name='Test School', address='-', location='-', phone_number='0', email=email)
+    year = AcademicYear.objects.create(
+        school=school, name='2024/2025', start_date=date(2024, 9, 1), end_date=date(2025, 7, 31), is_current=True
+    )
+    Term.objects.create(
+        academic_year=year, name='FIRST', start_date=date(2024, 9, 1), end_date=date(2024, 12, 15), is_current=True
+    )
+    admin = User.objects.create_user(
+        email=f'admin@{email}', password='pw', first_name='A', last_name='D', role='SCHOOL_ADMIN', school=school
+    )
+    return school, admin
+
+
+def make_students(school, classes, count):
+    return Student.objects.bulk_create([
+        Student(
+            school=school, student_id=f'S{index}', first_name='Kofi', last_name='Mensah', gender='M',
+            date_of_birth=date(2015, 1, 1), current_class=classes[index % len(classes)], guardian_name='G',
+            guardian_phone='0', guardian_address='-', admission_date=date(2024, 9, 1),
+        )
+        for index in range(count)
+    ])
+
+
+class ClassQueryCountTests(TestCase):
+    """Query counts must not grow with the number of classes or students"""
+
+    def setUp(self):
+        cache.clear()
+        self.school, admin = make_school()
+        teacher = User.objects.create_user(
+            email='teacher@example.com', password='pw', first_name='T', last_name='E', role='TEACHER', school=self.school
+        )
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.classes = [self.make_class(1, teacher)]
+
+    def make_class(self, level, teacher=None):
+        return Class.objects.create(school=self.school, level=f'BASIC_{level}', section='A', class_teacher=teacher)
+
+    def assert_queries(self, path, count):
+        # The first request caches the tenant context
+        self.assertEqual(self.client.get(path).status_code, 200)
+        with self.assertNumQueries(count):
+            self.assertEqual(self.client.get(path).status_code, 200)
+
+    def test_list(self):
+        make_students(self.school, self.classes, 1)
+        self.assert_queries('/api/schools/classes/', 2)
+        teacher = self.classes[0].class_teacher
+        self.classes += [self.make_class(level, teacher) for level in range(2, 10)]
+        Student.objects.all().delete()
+        make_students(self.school, self.classes, 30)
+        self.assert_queries('/api/schools/classes/', 2)
+
+    def test_students(self):
+        path = f'/api/schools/classes/{self.classes[0].id}/students/'
+        make_students(self.school, self.classes, 1)
+        self.assert_queries(path, 2)
+        Student.objects.all().delete()
+        make_students(self.school, self.classes, 30)
+        self.assert_queries(path, 2)
+
+
+class SchoolStatsTests(TestCase):
+    def setUp(self):
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.school, _ = make_school()
+        self.class_obj = Class.objects.create(school=self.school, level='BASIC_1', section='A')
+        self.students = make_students(self.school, [self.class_obj], 10)
+
+    def test_storage_rebuild(self):
+        # Stored without save() so no image processing runs
+        for student in self.students:
+            name = default_storage.save(f'student_photos/{student.student_id}.jpg', ContentFile(b'x' * 100))
+            Student.objects.filter(pk=student.pk).update(photo=name)
+
+        rebuild_all(include_storage=True)
+        stats = SchoolStats.objects.get(school=self.school)
+        self.assertEqual(stats.storage_bytes, 1000)
+        self.assertEqual(stats.active_students, 10)
+
+    def test_saving_a_deferred_student_moves_the_counter(self):
+        rebuild_all(include_storage=False)
+        student = Student.objects.only('photo').get(pk=self.students[0].pk)
+        student.is_active = False
+        student.save()
+        self.assertEqual(SchoolStats.objects.get(school=self.school).active_students, 9)
+
+    def test_loading_rows_runs_no_callbacks(self):
+        for model in (Student, User, ReportCard):
+            self.assertFalse(post_init.has_listeners(model), model)
+
+    def test_save_of_uncounted_fields_skips_the_lookup(self):
+        rebuild_all(include_storage=False)
+        student = Student.objects.get(pk=self.students[0].pk)
+        student.guardian_phone = '0244000000'
+        with self.assertNumQueries(1):
+            student.save(update_fields=['guardian_phone'])
+        student.is_active = False
+        student.save(update_fields=['is_active'])
+        self.assertEqual(SchoolStats.objects.get(school=self.school).active_students, 9)
+
+
+class SchoolSettingsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.school, admin = make_school()
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_patch_does_not_write_back_cached_columns(self):
+        # Caches the tenant context, school row included
+        self.assertEqual(self.client.get('/api/schools/settings/').status_code, 200)
+        # A change the cached copy has not seen, as if made through another worker
+        School.objects.filter(pk=self.school.pk).update(motto='Changed elsewhere')
+
+        response = self.client.patch('/api/schools/settings/', {'name': 'Renamed School'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.school.refresh_from_db()
+        self.assertEqual((self.school.name, self.school.motto), ('Renamed School', 'Changed elsewhere'))
+
+
+class RolloverTests(TestCase):
+    def setUp(self):
+        self.school, _ = make_school()
+        School.objects.filter(pk=self.school.pk).update(current_academic_year='2024/2025')
+        self.school.refresh_from_db()
+
+    def test_current_rollover_updates_school_display_year(self):
+        rollover_academic_year(self.school, AcademicYear.objects.get())
+        self.school.refresh_from_db()
+        self.assertEqual(self.school.current_academic_year, '2025/2026')
+        self.assertEqual(AcademicYear.objects.get(is_current=True).name, '2025/2026')
+
+    def test_rollover_without_make_current_keeps_display_year(self):
+        rollover_academic_year(self.school, AcademicYear.objects.get(), make_current=False)
+        self.school.refresh_from_db()
+        self.assertEqual(self.school.current_academic_year, '2024/2025')
+
+
+class TeacherScopeTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        school, _ = make_school()
+        self.teacher = User.objects.create_user(
+            email='teacher@example.com', password='pw', first_name='T', last_name='E', role='TEACHER', school=school
+        )
+        self.class_obj = Class.objects.create(school=school, level='BASIC_1', section='A')
+        subject = Subject.objects.create(name='English', code='ENG', category='BOTH')
+        self.class_subject = ClassSubject.objects.create(class_instance=self.class_obj, subject=subject, teacher=self.teacher)
+        self.client = APIClient()
+        self.client.force_authenticate(self.teacher)
+
+    def test_subject_teacher_cannot_edit_another_form_class(self):
+        response = self.client.patch(f'/api/schools/class-subjects/{self.class_subject.id}/', {}, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['detail'], 'You can only manage subjects for your own class')
+
+    def test_reassigning_the_class_teacher_drops_both_scopes(self):
+        other = User.objects.create_user(
+            email='other@example.com', password='pw', first_name='O', last_name='T', role='TEACHER', school=self.class_obj.school
+        )
+        self.class_obj.class_teacher = other
+        self.class_obj.save()
+        self.assertTrue(get_teacher_scope(other).is_class_teacher_of(self.class_obj.id))
+        class_obj = Class.objects.get(pk=self.class_obj.pk)
+        class_obj.class_teacher = self.teacher
+        class_obj.save()
+        self.assertFalse(get_teacher_scope(other).is_class_teacher_of(self.class_obj.id))
+        self.assertTrue(get_teacher_scope(self.teacher).is_class_teacher_of(self.class_obj.id))
+        self.assertFalse(post_init.has_listeners(Class))
+
+    @override_settings(CACHE_USER_STATE=False)
+    def test_scope_is_not_cached_in_a_process_local_cache(self):
+        self.assertFalse(get_teacher_scope(self.teacher).is_class_teacher_of(self.class_obj.id))
+        # A queryset update sends no signal, so only a fresh load sees it
+        Class.objects.filter(pk=self.class_obj.pk).update(class_teacher=self.teacher)
+        self.assertTrue(get_teacher_scope(self.teacher).is_class_teacher_of(self.class_obj.id))
+
+
+class DashboardTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.school, admin = make_school()
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_counts_every_enrolled_student(self):
+        classes = [Class.objects.create(school=self.school, level='BASIC_1', section=section) for section in 'AB']
+        students = make_students(self.school, classes, 5)
+        Student.objects.filter(pk=students[0].pk).update(is_active=False)
+        data = self.client.get('/api/schools/dashboard/').data
+        self.assertEqual(data['counts']['students'], 5)
+        self.assertEqual(sum(c['students'] for c in data['charts']['students_by_class']), 5)
+        self.assertEqual(data['charts']['gender_distribution'], [{'name': 'M', 'value': 5}])
+
+    def test_if_none_match(self):
+        etag = self.client.get('/api/schools/dashboard/')['ETag']
+        for header in (etag, f'W/{etag}', f'"other", {etag}', '*'):
+            response = self.client.get('/api/schools/dashboard/', HTTP_IF_NONE_MATCH=header)
+            self.assertEqual(response.status_code, 304, header)
+            self.assertEqual(response['ETag'], etag)
+        self.assertEqual(self.client.get('/api/schools/dashboard/', HTTP_IF_NONE_MATCH='"other"').status_code, 200)
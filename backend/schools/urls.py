@@ -1,9 +1,11 @@
+from django.conf import settings
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 from .views import (
     SchoolViewSet, AcademicYearViewSet, TermViewSet,
     ClassViewSet, SubjectViewSet, ClassSubjectViewSet,
-    GradingScaleViewSet, SchoolDashboardView, SchoolSettingsView
+    GradingScaleViewSet, SchoolDashboardView, SchoolSettingsView,
+    school_dashboard
 )
 
 router = DefaultRouter()
@@ -18,6 +20,6 @@ router.register(r'grading-scales', GradingScaleViewSet, basename='grading-scale'
 router.register(r'', SchoolViewSet, basename='school')
 
 urlpatterns = [
-    path('dashboard/', SchoolDashboardView.as_view(), name='school_dashboard'),
+    path('dashboard/', school_dashboard if settings.ASGI_MODE else SchoolDashboardView.as_view(), name='school_dashboard'),
     path('settings/', SchoolSettingsView.as_view(), name='school_settings'),
 ] + router.urls
@@ -1,8 +1,15 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.views import APIView
 from rest_framework.decorators import action
+from rest_framework.exceptions import PermissionDenied
 from rest_framework.response import Response
+from django.http import JsonResponse
+from django.utils.cache import get_conditional_response
+from school_report_saas.async_views import async_api_view
+from school_report_saas.tenant import TenantContextMixin, invalidate_tenant
 from .models import School, AcademicYear, Term, Class, Subject, ClassSubject, GradingScale
+from .dashboard import aget_dashboard, get_dashboard, invalidate_dashboard
+from .rollover import rollover_academic_year, RolloverError
 from .serializers import (
     SchoolSerializer, AcademicYearSerializer, TermSerializer,
     ClassSerializer, SubjectSerializer, ClassSubjectSerializer,
@@ -10,15 +17,14 @@ from .serializers import (
     SchoolSettingsSerializer
 )
 from django.contrib.auth import get_user_model
-from students.models import Student
-from reports.models import ReportCard
+from students.promotion import PromotionError
 from django.db import models
 from django.db.models import Count
 
 User = get_user_model()
 
 
-class SchoolViewSet(viewsets.ModelViewSet):
+class SchoolViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """School CRUD operations"""
     queryset = School.objects.all()
     serializer_class = SchoolSerializer
@@ -30,9 +36,9 @@ class SchoolViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.is_super_admin:
-            return School.objects.all()
+            return School.objects.select_related('stats')
         elif user.school:
-            return School.objects.filter(id=user.school.id)
+            return School.objects.select_related('stats').filter(id=user.school.id)
         return School.objects.none()
     
     @action(detail=True, methods=['post'])
@@ -44,7 +50,7 @@ class SchoolViewSet(viewsets.ModelViewSet):
         return Response({"message": "Default subjects setup initiated"})
 
 
-class AcademicYearViewSet(viewsets.ModelViewSet):
+class AcademicYearViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Academic Year operations"""
     queryset = AcademicYear.objects.all()
     serializer_class = AcademicYearSerializer
@@ -58,9 +64,41 @@ class AcademicYearViewSet(viewsets.ModelViewSet):
     
     def perform_create(self, serializer):
         serializer.save(school=self.request.user.school)
+    
+    @action(detail=True, methods=['post'])
+    def rollover(self, request, pk=None):
+        """Start the next academic year with this year's terms, one year on"""
+        if getattr(request.user, 'role', None) == 'TEACHER':
+            return Response(
+                {"error": "Teachers cannot start a new academic year"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        academic_year = self.get_object()
+        
+        dry_run = str(request.data.get('dry_run', False)).lower() == 'true'
+        make_current = str(request.data.get('make_current', True)).lower() == 'true'
+        promote = str(request.data.get('promote', False)).lower() == 'true'
+        
+        try:
+            result = rollover_academic_year(
+                request.user.school, academic_year,
+                name=request.data.get('name') or None,
+                make_current=make_current,
+                promote=promote,
+                dry_run=dry_run
+            )
+        except (RolloverError, PromotionError) as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        name = result['academic_year']['name']
+        message = f"Academic year {name} would be created" if dry_run else f"Academic year {name} created"
+        return Response(
+            {"message": message, "dry_run": dry_run, **result},
+            status=status.HTTP_200_OK if dry_run else status.HTTP_201_CREATED
+        )
 
 
-class TermViewSet(viewsets.ModelViewSet):
+class TermViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Term operations"""
     queryset = Term.objects.all()
     serializer_class = TermSerializer
@@ -79,10 +117,12 @@ class TermViewSet(viewsets.ModelViewSet):
         Term.objects.filter(academic_year__school=request.user.school).update(is_current=False)
         term.is_current = True
         term.save()
+        # The UPDATE above bypasses signals; drop the cached current term for certain
+        invalidate_tenant(request.user.school_id)
         return Response({"message": "Term set as current"})
 
 
-class ClassViewSet(viewsets.ModelViewSet):
+class ClassViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Class operations"""
     queryset = Class.objects.all()
     serializer_class = ClassSerializer
@@ -91,12 +131,14 @@ class ClassViewSet(viewsets.ModelViewSet):
     def get_queryset(self):
         user = self.request.user
         if user.school:
-            return Class.objects.filter(school=user.school)
+            return Class.objects.filter(school=user.school).select_related('class_teacher').annotate(
+                active_student_count=Count('students', filter=models.Q(students__is_active=True))
+            ).order_by('level', 'section')
         return Class.objects.none()
     
     def perform_create(self, serializer):
         if not getattr(self.request.user, 'school', None):
-            raise permissions.PermissionDenied("User is not attached to a school")
+            raise PermissionDenied("User is not attached to a school")
         serializer.save(school=self.request.user.school)
     
     @action(detail=True, methods=['get'])
@@ -115,7 +157,7 @@ class ClassViewSet(viewsets.ModelViewSet):
         user = request.user
         
         if user.school:
-            queryset = Class.objects.filter(school=user.school)
+            queryset = self.get_queryset()
             
             if level_group == 'PRIMARY':
                 # Basic 1-6
@@ -134,14 +176,26 @@ class ClassViewSet(viewsets.ModelViewSet):
         return Response([])
 
 
-class SubjectViewSet(viewsets.ModelViewSet):
+class SubjectViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Subject operations"""
     queryset = Subject.objects.all()
     serializer_class = SubjectSerializer
     permission_classes = [permissions.IsAuthenticated]
 
 
-class ClassSubjectViewSet(viewsets.ModelViewSet):
+def subject_category_error(class_obj, subject):
+    """PRIMARY subjects only for Basic 1-6; JHS only for Basic 7-9; BOTH allowed everywhere"""
+    level = class_obj.level
+    is_primary_level = level.startswith('BASIC_') and int(level.split('_')[1]) <= 6
+    is_jhs_level = level.startswith('BASIC_') and int(level.split('_')[1]) >= 7
+    if subject.category == 'PRIMARY' and not is_primary_level:
+        return "Subject is for primary classes only"
+    if subject.category == 'JHS' and not is_jhs_level:
+        return "Subject is for JHS classes only"
+    return None
+
+
+class ClassSubjectViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Class Subject assignment"""
     queryset = ClassSubject.objects.all()
     serializer_class = ClassSubjectSerializer
@@ -153,7 +207,8 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
             qs = ClassSubject.objects.filter(class_instance__school=user.school)
             # Teachers can only see assignments for classes they are class_teacher (owner) or where they are set as teacher for the subject
             if user.role == 'TEACHER':
-                qs = qs.filter(models.Q(class_instance__class_teacher=user) | models.Q(teacher=user))
+                scope = self.tenant.teacher_scope
+                qs = qs.filter(models.Q(class_instance_id__in=scope.class_ids) | models.Q(id__in=scope.class_subject_ids))
             class_id = self.request.query_params.get('class_instance')
             if class_id:
                 qs = qs.filter(class_instance_id=class_id)
@@ -165,8 +220,8 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
 
     def _ensure_teacher_class_permission(self, class_obj: Class):
         user = self.request.user
-        if user.role == 'TEACHER' and class_obj.class_teacher_id != user.id:
-            raise permissions.PermissionDenied("You can only manage subjects for your own class")
+        if user.role == 'TEACHER' and not self.tenant.teacher_scope.is_class_teacher_of(class_obj.id):
+            raise PermissionDenied("You can only manage subjects for your own class")
 
     def perform_create(self, serializer):
         user = self.request.user
@@ -174,24 +229,20 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
         try:
             class_obj = Class.objects.get(id=class_id, school=user.school)
         except Class.DoesNotExist:
-            raise permissions.PermissionDenied("Invalid class for this school")
+            raise PermissionDenied("Invalid class for this school")
         self._ensure_teacher_class_permission(class_obj)
         if user.role == 'TEACHER':
             # Teachers cannot introduce new subjects; admin/principal must pre-populate
-            raise permissions.PermissionDenied("Teachers cannot add new subjects. Admin must assign them first.")
+            raise PermissionDenied("Teachers cannot add new subjects. Admin must assign them first.")
         # Category compatibility: PRIMARY subjects only for Basic 1-6; JHS only for Basic 7-9; BOTH allowed everywhere
         subject_id = self.request.data.get('subject')
         try:
             subject_obj = Subject.objects.get(id=subject_id)
         except Subject.DoesNotExist:
-            raise permissions.PermissionDenied("Invalid subject")
-        level = class_obj.level
-        is_primary_level = level.startswith('BASIC_') and int(level.split('_')[1]) <= 6
-        is_jhs_level = level.startswith('BASIC_') and int(level.split('_')[1]) >= 7
-        if subject_obj.category == 'PRIMARY' and not is_primary_level:
-            raise permissions.PermissionDenied("Subject is for primary classes only")
-        if subject_obj.category == 'JHS' and not is_jhs_level:
-            raise permissions.PermissionDenied("Subject is for JHS classes only")
+            raise PermissionDenied("Invalid subject")
+        reason = subject_category_error(class_obj, subject_obj)
+        if reason:
+            raise PermissionDenied(reason)
         serializer.save()
 
     def perform_update(self, serializer):
@@ -200,22 +251,18 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
         # Optional: ensure updated subject still matches category if subject changed
         new_subject = serializer.validated_data.get('subject')
         if new_subject:
-            level = instance.class_instance.level
-            is_primary_level = level.startswith('BASIC_') and int(level.split('_')[1]) <= 6
-            is_jhs_level = level.startswith('BASIC_') and int(level.split('_')[1]) >= 7
-            if new_subject.category == 'PRIMARY' and not is_primary_level:
-                raise permissions.PermissionDenied("Subject is for primary classes only")
-            if new_subject.category == 'JHS' and not is_jhs_level:
-                raise permissions.PermissionDenied("Subject is for JHS classes only")
+            reason = subject_category_error(instance.class_instance, new_subject)
+            if reason:
+                raise PermissionDenied(reason)
         user = self.request.user
         if user.role == 'TEACHER':
             # Teachers can only claim or unclaim (set teacher to self or null). They cannot change subject or class.
             disallowed_keys = {'class_instance', 'subject'} & set(serializer.validated_data.keys())
             if disallowed_keys:
-                raise permissions.PermissionDenied("Teachers cannot modify subject or class; only claim/unclaim.")
+                raise PermissionDenied("Teachers cannot modify subject or class; only claim/unclaim.")
             teacher_obj = serializer.validated_data.get('teacher')
             if teacher_obj and teacher_obj.id != user.id:
-                raise permissions.PermissionDenied("You can only claim a subject for yourself.")
+                raise PermissionDenied("You can only claim a subject for yourself.")
         serializer.save()
 
     def perform_destroy(self, instance):
@@ -240,7 +287,7 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
         class_ids = serializer.validated_data['class_ids']
         
         # Validate subjects exist and get them
-        subjects = Subject.objects.filter(id__in=subject_ids)
+        subjects = list(Subject.objects.filter(id__in=subject_ids))
         if len(subjects) != len(subject_ids):
             return Response(
                 {"detail": "Some subjects not found"}, 
@@ -248,41 +295,35 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
             )
         
         # Validate classes exist and belong to user's school
-        classes = Class.objects.filter(id__in=class_ids, school=user.school)
+        classes = list(Class.objects.filter(id__in=class_ids, school=user.school))
         if len(classes) != len(class_ids):
             return Response(
                 {"detail": "Some classes not found or don't belong to your school"}, 
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # Every pair that already exists, in one query
+        existing = set(ClassSubject.objects.filter(
+            class_instance__in=classes, subject__in=subjects
+        ).values_list('class_instance_id', 'subject_id'))
+        
         created_assignments = []
         skipped_assignments = []
         invalid_assignments = []
+        to_create = []
         
         for class_obj in classes:
             for subject in subjects:
-                # Check category compatibility
-                level = class_obj.level
-                is_primary_level = level.startswith('BASIC_') and int(level.split('_')[1]) <= 6
-                is_jhs_level = level.startswith('BASIC_') and int(level.split('_')[1]) >= 7
-                
-                if subject.category == 'PRIMARY' and not is_primary_level:
+                reason = subject_category_error(class_obj, subject)
+                if reason:
                     invalid_assignments.append({
                         'class': str(class_obj),
                         'subject': subject.name,
-                        'reason': 'Subject is for primary classes only'
-                    })
-                    continue
-                if subject.category == 'JHS' and not is_jhs_level:
-                    invalid_assignments.append({
-                        'class': str(class_obj),
-                        'subject': subject.name,
-                        'reason': 'Subject is for JHS classes only'
+                        'reason': reason
                     })
                     continue
                 
-                # Check if assignment already exists
-                if ClassSubject.objects.filter(class_instance=class_obj, subject=subject).exists():
+                if (class_obj.id, subject.id) in existing:
                     skipped_assignments.append({
                         'class': str(class_obj),
                         'subject': subject.name,
@@ -290,16 +331,28 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
                     })
                     continue
                 
-                # Create assignment
-                assignment = ClassSubject.objects.create(
-                    class_instance=class_obj,
-                    subject=subject
-                )
-                created_assignments.append({
-                    'id': assignment.id,
-                    'class': str(class_obj),
-                    'subject': subject.name
-                })
+                to_create.append(ClassSubject(class_instance=class_obj, subject=subject))
+        
+        if to_create:
+            # A pair inserted concurrently is ignored rather than failing the batch
+            ClassSubject.objects.bulk_create(to_create, ignore_conflicts=True)
+            # ignore_conflicts leaves primary keys unset, so read them back
+            ids = {
+                (class_id, subject_id): assignment_id
+                for class_id, subject_id, assignment_id in ClassSubject.objects.filter(
+                    class_instance__in=classes, subject__in=subjects
+                ).values_list('class_instance_id', 'subject_id', 'id')
+            }
+            created_assignments = [
+                {
+                    'id': ids.get((assignment.class_instance.id, assignment.subject.id)),
+                    'class': str(assignment.class_instance),
+                    'subject': assignment.subject.name
+                }
+                for assignment in to_create
+            ]
+            # bulk_create skips post_save
+            invalidate_dashboard(user.school_id)
         
         return Response({
             'created': created_assignments,
@@ -336,14 +389,18 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
             class_instance__school=user.school
         )
         
-        removed_assignments = []
-        for assignment in assignments:
-            removed_assignments.append({
+        removed_assignments = [
+            {
                 'class': str(assignment.class_instance),
                 'subject': assignment.subject.name
-            })
+            }
+            for assignment in assignments.select_related('class_instance', 'subject')
+        ]
         
-        assignments.delete()
+        if removed_assignments:
+            # The post_delete handlers read class_instance; QuerySet.delete() drops
+            # select_related but keeps prefetches, so that costs one query, not one per row
+            assignments.prefetch_related('class_instance').delete()
         
         return Response({
             'removed': removed_assignments,
@@ -353,7 +410,7 @@ class ClassSubjectViewSet(viewsets.ModelViewSet):
         })
 
 
-class GradingScaleViewSet(viewsets.ModelViewSet):
+class GradingScaleViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Grading Scale operations"""
     queryset = GradingScale.objects.all()
     serializer_class = GradingScaleSerializer
@@ -369,7 +426,7 @@ class GradingScaleViewSet(viewsets.ModelViewSet):
         serializer.save(school=self.request.user.school)
 
 
-class SchoolDashboardView(APIView):
+class SchoolDashboardView(TenantContextMixin, APIView):
     """Return dashboard metrics for the current user's school"""
     permission_classes = [permissions.IsAuthenticated]
 
@@ -378,65 +435,29 @@ class SchoolDashboardView(APIView):
         if not getattr(user, 'school', None):
             return Response({"detail": "User is not attached to a school"}, status=status.HTTP_403_FORBIDDEN)
 
-        school = user.school
-        # Counts
-        students_count = Student.objects.filter(school=school).count()
-        teachers_count = User.objects.filter(school=school, role='TEACHER').count()
-        classes_count = Class.objects.filter(school=school).count()
-        subjects_count = Subject.objects.filter(assigned_classes__class_instance__school=school).distinct().count()
-        reports_count = ReportCard.objects.filter(student__school=school).count()
+        data, etag = get_dashboard(user.school)
+        # Handles weak validators, lists of tags and "*" in If-None-Match
+        response = get_conditional_response(request, etag=etag) or Response(data)
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, no-cache'
+        return response
 
-        # Current AY/Term
-        current_year = AcademicYear.objects.filter(school=school, is_current=True).first()
-        current_term = Term.objects.filter(academic_year__school=school, is_current=True).first()
 
-        # Chart data: Students per class
-        classes = Class.objects.filter(school=school).annotate(student_count=Count('students'))
-        students_by_class = [
-            {"name": f"{c.get_level_display() or c.level}{' ' + c.section if c.section else ''}", "students": c.student_count}
-            for c in classes
-        ]
+@async_api_view
+async def school_dashboard(request):
+    """SchoolDashboardView as an async view, routed in its place under ASGI_MODE"""
+    school = request.tenant.school
+    if school is None:
+        return JsonResponse({"detail": "User is not attached to a school"}, status=403)
 
-        # Chart data: Gender distribution
-        gender_dist = Student.objects.filter(school=school).values('gender').annotate(count=Count('id'))
-        gender_data = [{"name": item['gender'], "value": item['count']} for item in gender_dist]
-
-        # Chart data: Subjects by category
-        subject_category_dist = Subject.objects.filter(
-            assigned_classes__class_instance__school=school
-        ).values('category').annotate(count=Count('id', distinct=True))
-        subjects_by_category = [{"name": item['category'], "value": item['count']} for item in subject_category_dist]
-
-        data = {
-            "school": {
-                "id": school.id, 
-                "name": school.name,
-                "score_entry_mode": school.score_entry_mode,
-                "report_template": school.report_template,
-                "show_class_average": school.show_class_average,
-                "show_position_in_class": school.show_position_in_class,
-            },
-            "counts": {
-                "students": students_count,
-                "teachers": teachers_count,
-                "classes": classes_count,
-                "subjects": subjects_count,
-                "reports": reports_count,
-            },
-            "current": {
-                "academic_year": current_year.name if current_year else None,
-                "term": current_term.get_name_display() if current_term else None,
-            },
-            "charts": {
-                "students_by_class": students_by_class,
-                "gender_distribution": gender_data,
-                "subjects_by_category": subjects_by_category,
-            }
-        }
-        return Response(data)
+    data, etag = await aget_dashboard(school)
+    response = get_conditional_response(request, etag=etag) or JsonResponse(data)
+    response['ETag'] = etag
+    response['Cache-Control'] = 'private, no-cache'
+    return response
 
 
-class SchoolSettingsView(APIView):
+class SchoolSettingsView(TenantContextMixin, APIView):
     """Manage school settings and configuration"""
     permission_classes = [permissions.IsAuthenticated]
     
@@ -468,8 +489,11 @@ class SchoolSettingsView(APIView):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        # user.school may be the tenant cache's copy; save over a fresh row so
+        # columns this request does not touch are not written back stale
+        school = School.objects.get(pk=user.school_id)
         serializer = SchoolSettingsSerializer(
-            user.school, 
+            school, 
             data=request.data, 
             partial=True
         )
@@ -0,0 +1,106 @@
+import statistics
+import time
+from datetime import date
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.test import APIRequestFactory, force_authenticate
+from accounts.models import User
+from schools.models import School
+from schools.provisioning import provision_school
+from students.models import Student
+from scores.models import SubjectResult
+from scores.views import SubjectResultViewSet
+
+PAGE_SIZE = 50
+
+
+class Command(BaseCommand):
+    help = 'Compare page-number and keyset pagination latency on subject results (seeded data is rolled back)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--pages', type=int, default=500, help='Deepest page to measure')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per measurement')
+
+    def handle(self, *args, **options):
+        pages = options['pages']
+        self.repeat = options['repeat']
+
+        with transaction.atomic():
+            user = self._seed(rows=pages * PAGE_SIZE + PAGE_SIZE)
+            self.view = SubjectResultViewSet.as_view({'get': 'list'})
+            # Next links are absolute, so requests need a host the settings accept
+            host = next((h for h in settings.ALLOWED_HOSTS if h and '*' not in h), 'localhost')
+            self.factory = APIRequestFactory(HTTP_HOST=host)
+            self.user = user
+            fields = {'fields': 'id,student,total_score,grade'}
+
+            results = [
+                ('page number, page 1', self._time({**fields, 'page': 1})),
+                (f'page number, page {pages}', self._time({**fields, 'page': pages})),
+                ('keyset, page 1', self._time({**fields, 'pagination': 'cursor'})),
+                (f'keyset, page {pages}', self._time(self._cursor_params(fields, pages))),
+            ]
+            transaction.set_rollback(True)
+
+        for label, elapsed in results:
+            self.stdout.write(f"{label:<28} {elapsed * 1000:8.2f} ms")
+
+    def _seed(self, rows):
+        school = School.objects.create(
+            name='Pagination Benchmark', address='-', location='-', phone_number='0',
+            email='pagination-benchmark@example.com'
+        )
+        user = User.objects.create_user(
+            email='pagination-benchmark@example.com', password=None, first_name='Bench', last_name='Mark',
+            role='SCHOOL_ADMIN', school=school
+        )
+        subjects_per_student = 20
+        provisioned = provision_school(school, {
+            'grading_scale': [],
+            'subjects': [(f'Bench Subject {i}', f'BENCH-{i}', 'JHS') for i in range(subjects_per_student)],
+            'class_sections': ['A'],
+            'assign_subjects': True,
+        }, levels=('JHS',))
+        term = provisioned['terms'][0]
+        class_instance = provisioned['classes'][0]
+        class_subjects = [cs for cs in provisioned['class_subjects'] if cs.class_instance_id == class_instance.id]
+        students = Student.objects.bulk_create([
+            Student(
+                school=school, student_id=f'BENCH-{i}', first_name='Bench', last_name=f'Student {i}', gender='M',
+                date_of_birth=date(2012, 1, 1), current_class=class_instance, guardian_name='-',
+                guardian_phone='0', guardian_address='-', admission_date=date(2020, 1, 1)
+            )
+            for i in range(-(-rows // subjects_per_student))
+        ], batch_size=1000)
+        SubjectResult.objects.bulk_create([
+            SubjectResult(student=student, class_subject=class_subject, term=term,
+                          ca_score=30, exam_score=40, total_score=70, grade='B')
+            for student in students for class_subject in class_subjects
+        ][:rows], batch_size=2000)
+        return user
+
+    def _get(self, params):
+        request = self.factory.get('/api/scores/subject-results/', params)
+        force_authenticate(request, user=self.user)
+        response = self.view(request)
+        response.render()
+        return response
+
+    def _time(self, params):
+        self._get(params)  # warm up
+        timings = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            self._get(params)
+            timings.append(time.perf_counter() - start)
+        return statistics.median(timings)
+
+    def _cursor_params(self, fields, pages):
+        """Follow next links to reach the query parameters of the deepest page"""
+        from urllib.parse import parse_qs, urlparse
+        params = {**fields, 'pagination': 'cursor'}
+        for _ in range(pages - 1):
+            next_url = self._get(params).data['next']
+            params = {key: values[0] for key, values in parse_qs(urlparse(next_url).query).items()}
+        return params
@@ -1,8 +1,9 @@
 from rest_framework import serializers
+from school_report_saas.serializers import SparseFieldsetMixin
 from .models import ContinuousAssessment, ExamScore, SubjectResult, TermResult
 
 
-class ContinuousAssessmentSerializer(serializers.ModelSerializer):
+class ContinuousAssessmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     subject_name = serializers.CharField(source='class_subject.subject.name', read_only=True)
     total_ca_score = serializers.FloatField(read_only=True)
@@ -13,7 +14,7 @@ class ContinuousAssessmentSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class ExamScoreSerializer(serializers.ModelSerializer):
+class ExamScoreSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     subject_name = serializers.CharField(source='class_subject.subject.name', read_only=True)
     
@@ -23,7 +24,7 @@ class ExamScoreSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class SubjectResultSerializer(serializers.ModelSerializer):
+class SubjectResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     subject_name = serializers.CharField(source='class_subject.subject.name', read_only=True)
     
@@ -33,7 +34,7 @@ class SubjectResultSerializer(serializers.ModelSerializer):
         read_only_fields = ['created_at', 'updated_at']
 
 
-class TermResultSerializer(serializers.ModelSerializer):
+class TermResultSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     student_name = serializers.CharField(source='student.get_full_name', read_only=True)
     student_id = serializers.CharField(source='student.student_id', read_only=True)
     class_name = serializers.CharField(source='class_instance.full_name', read_only=True)
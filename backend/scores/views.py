@@ -1,6 +1,8 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from school_report_saas.pagination import KeysetPaginationMixin
+from school_report_saas.tenant import TenantContextMixin
 from django.db import transaction
 from django.db.models import Sum, Avg, Count
 from .models import ContinuousAssessment, ExamScore, SubjectResult, TermResult
@@ -12,7 +14,7 @@ from students.models import Student
 from schools.models import ClassSubject, Term
 
 
-class ContinuousAssessmentViewSet(viewsets.ModelViewSet):
+class ContinuousAssessmentViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """CA Score management"""
     queryset = ContinuousAssessment.objects.all()
     serializer_class = ContinuousAssessmentSerializer
@@ -39,7 +41,7 @@ class ContinuousAssessmentViewSet(viewsets.ModelViewSet):
         return ContinuousAssessment.objects.none()
 
 
-class ExamScoreViewSet(viewsets.ModelViewSet):
+class ExamScoreViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """Exam Score management"""
     queryset = ExamScore.objects.all()
     serializer_class = ExamScoreSerializer
@@ -66,7 +68,7 @@ class ExamScoreViewSet(viewsets.ModelViewSet):
         return ExamScore.objects.none()
 
 
-class SubjectResultViewSet(viewsets.ModelViewSet):
+class SubjectResultViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """Subject Result management"""
     queryset = SubjectResult.objects.all()
     serializer_class = SubjectResultSerializer
@@ -89,7 +91,7 @@ class SubjectResultViewSet(viewsets.ModelViewSet):
         return SubjectResult.objects.none()
 
 
-class TermResultViewSet(viewsets.ModelViewSet):
+class TermResultViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """Term Result management"""
     queryset = TermResult.objects.all()
     serializer_class = TermResultSerializer
@@ -142,7 +144,7 @@ class TermResultViewSet(viewsets.ModelViewSet):
         })
 
 
-class ScoreManagementViewSet(viewsets.ViewSet):
+class ScoreManagementViewSet(TenantContextMixin, viewsets.ViewSet):
     """Combined score entry and computation"""
     permission_classes = [permissions.IsAuthenticated]
     
@@ -168,14 +170,12 @@ class ScoreManagementViewSet(viewsets.ViewSet):
             except Student.DoesNotExist:
                 return Response({"error": "Invalid student"}, status=status.HTTP_400_BAD_REQUEST)
             
-            try:
-                cs = ClassSubject.objects.get(id=data['class_subject_id'])
-            except ClassSubject.DoesNotExist:
-                return Response({"error": "Invalid class subject"}, status=status.HTTP_400_BAD_REQUEST)
-            
             # Check if teacher has permission to enter scores for this student/subject combination
-            is_class_teacher = student.current_class and student.current_class.class_teacher_id == user.id
-            is_subject_teacher = cs.teacher_id == user.id if cs.teacher_id else False
+            scope = self.tenant.teacher_scope
+            is_subject_teacher = scope.teaches(data['class_subject_id'])
+            if not is_subject_teacher and not ClassSubject.objects.filter(id=data['class_subject_id']).exists():
+                return Response({"error": "Invalid class subject"}, status=status.HTTP_400_BAD_REQUEST)
+            is_class_teacher = scope.is_class_teacher_of(student.current_class_id)
             
             # Allow access if teacher is either the class teacher OR the subject teacher
             if not (is_class_teacher or is_subject_teacher):
@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Student, Attendance, Behaviour, StudentPromotion
+from .models import Student, Attendance, AttendanceRegister, Behaviour, StudentPromotion, StudentImportJob
 
 # Register your models here.
 
@@ -14,6 +14,11 @@ class AttendanceAdmin(admin.ModelAdmin):
 	list_display = ("student", "term", "days_present", "days_absent", "times_late")
 	list_filter = ("term",)
 
+@admin.register(AttendanceRegister)
+class AttendanceRegisterAdmin(admin.ModelAdmin):
+	list_display = ("class_instance", "date", "term", "marked_by", "updated_at")
+	list_filter = ("term", "class_instance")
+
 @admin.register(Behaviour)
 class BehaviourAdmin(admin.ModelAdmin):
 	list_display = ("student", "term", "conduct", "attitude", "interest", "punctuality")
@@ -23,3 +28,8 @@ class BehaviourAdmin(admin.ModelAdmin):
 class StudentPromotionAdmin(admin.ModelAdmin):
 	list_display = ("student", "from_class", "to_class", "academic_year", "promoted_date", "is_graduated")
 	list_filter = ("academic_year", "is_graduated")
+
+@admin.register(StudentImportJob)
+class StudentImportJobAdmin(admin.ModelAdmin):
+	list_display = ("school", "status", "total_rows", "created_count", "created_at", "finished_at")
+	list_filter = ("status",)
@@ -0,0 +1,106 @@
+from collections import defaultdict
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+from schools.models import Term
+from .models import Attendance, AttendanceRegister
+
+STATUS_NAMES = {code: name for name, code in AttendanceRegister.STATUS_CODES.items()}
+
+
+class AttendanceError(Exception):
+    pass
+
+
+def _counters(code):
+    """(present, absent, late) contribution of one status code to the term totals"""
+    if code is None:
+        return (0, 0, 0)
+    return (int(code in ('P', 'L')), int(code == 'A'), int(code == 'L'))
+
+
+def term_for_date(school, date):
+    term = Term.objects.filter(
+        academic_year__school=school, start_date__lte=date, end_date__gte=date
+    ).first()
+    if not term:
+        raise AttendanceError(f"No term covers {date}")
+    return term
+
+
+def mark_class(class_instance, date, records, marked_by=None):
+    """
+    Record the register for one class on one day.
+
+    ``records`` is a list of {'student_id', 'status'} dicts. Students not in the
+    payload keep whatever was marked before. The term-level Attendance totals are
+    adjusted by the difference between the old and new marks, so re-submitting
+    the same register changes nothing.
+    """
+    term = term_for_date(class_instance.school, date)
+    roster = set(class_instance.students.filter(is_active=True).values_list('id', flat=True))
+
+    errors = []
+    new_marks = {}
+    for record in records:
+        student_id = record.get('student_id')
+        code = AttendanceRegister.STATUS_CODES.get(str(record.get('status', '')).upper())
+        try:
+            student_id = int(student_id)
+        except (TypeError, ValueError):
+            errors.append({'student_id': student_id, 'error': 'Invalid student_id'})
+            continue
+        if student_id not in roster:
+            errors.append({'student_id': student_id, 'error': 'Student is not in this class'})
+        elif code is None:
+            errors.append({'student_id': student_id, 'error': 'status must be PRESENT, ABSENT or LATE'})
+        else:
+            new_marks[str(student_id)] = code
+
+    with transaction.atomic():
+        register, _ = AttendanceRegister.objects.select_for_update().get_or_create(
+            class_instance=class_instance, date=date,
+            defaults={'term': term, 'marked_by': marked_by},
+        )
+        old_marks = register.statuses
+
+        # Students grouped by how their counters change; at most a few groups
+        deltas = defaultdict(list)
+        for student_id, code in new_marks.items():
+            old = _counters(old_marks.get(student_id))
+            new = _counters(code)
+            delta = tuple(n - o for n, o in zip(new, old))
+            if any(delta):
+                deltas[delta].append(int(student_id))
+
+        register.statuses = {**old_marks, **new_marks}
+        register.marked_by = marked_by
+        register.save(update_fields=['statuses', 'marked_by', 'updated_at'])
+
+        changed = [student_id for ids in deltas.values() for student_id in ids]
+        if changed:
+            Attendance.objects.bulk_create(
+                [Attendance(student_id=student_id, term=register.term) for student_id in changed],
+                ignore_conflicts=True,
+            )
+            now = timezone.now()
+            for (present, absent, late), student_ids in deltas.items():
+                Attendance.objects.filter(term=register.term, student_id__in=student_ids).update(
+                    days_present=F('days_present') + present,
+                    days_absent=F('days_absent') + absent,
+                    times_late=F('times_late') + late,
+                    updated_at=now,
+                )
+
+    codes = list(register.statuses.values())
+    return {
+        'register_id': register.id,
+        'date': str(date),
+        'term_id': register.term_id,
+        'marked_count': len(new_marks),
+        'updated_totals': len(changed),
+        'present': sum(code in ('P', 'L') for code in codes),
+        'absent': codes.count('A'),
+        'late': codes.count('L'),
+        'errors': errors,
+    }
@@ -0,0 +1,231 @@
+import csv
+import io
+from datetime import timedelta
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.db.models import Q
+from django.utils import timezone
+from schools.dashboard import invalidate_dashboard
+from schools.models import Class
+from schools.stats import adjust_stats
+from .models import Student, StudentImportJob
+from .search import index_students
+
+# Expected columns: student_id, first_name, last_name, other_names, gender,
+# date_of_birth, current_class_id, guardian_name, guardian_phone,
+# guardian_email, guardian_address, admission_date
+COLUMNS = [
+    'student_id', 'first_name', 'last_name', 'other_names', 'gender',
+    'date_of_birth', 'current_class_id', 'guardian_name', 'guardian_phone',
+    'guardian_email', 'guardian_address', 'admission_date',
+]
+OPTIONAL_COLUMNS = {'other_names', 'current_class_id', 'guardian_email'}
+SUPPORTED_EXTENSIONS = ('.xlsx', '.xlsm', '.csv')
+
+# A RUNNING job whose heartbeat is older than this lost its worker
+IMPORT_STALE_AFTER = timedelta(minutes=10)
+
+
+def iter_rows(uploaded_file, name=None):
+    """Yield (row_number, values) for every data row without loading the whole file"""
+    name = (name or getattr(uploaded_file, 'name', '') or '').lower()
+    if name.endswith('.csv'):
+        text = io.TextIOWrapper(getattr(uploaded_file, 'file', uploaded_file), encoding='utf-8-sig', newline='')
+        try:
+            reader = csv.reader(text)
+            next(reader, None)  # header
+            for row_num, row in enumerate(reader, start=2):
+                yield row_num, row
+        finally:
+            # Leave the underlying upload open for its owner to close
+            text.detach()
+        return
+
+    import openpyxl
+    workbook = openpyxl.load_workbook(uploaded_file, read_only=True, data_only=True)
+    try:
+        sheet = workbook.active
+        for row_num, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
+            yield row_num, row
+    finally:
+        workbook.close()
+
+
+def clean_cell(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    return value
+
+
+class StudentImporter:
+    """
+    Validate and insert student rows in chunks.
+
+    Class ids are pre-loaded once for the school; existing student_ids are looked
+    up once per chunk. A bad row is reported and skipped without affecting the
+    rest of the file. ``on_flush`` is called after every chunk is written.
+    """
+
+    def __init__(self, school, chunk_size=500, on_flush=None):
+        self.school = school
+        self.chunk_size = chunk_size
+        self.on_flush = on_flush
+        self.valid_class_ids = set(Class.objects.filter(school=school).values_list('id', flat=True))
+        self.seen_student_ids = set()
+        self.created = 0
+        self.total_rows = 0
+        self.errors = []
+        self._pending = []
+
+    def run(self, rows):
+        for row_num, row in rows:
+            if not any(clean_cell(value) is not None for value in row):
+                continue
+            self.total_rows += 1
+            student = self._build(row_num, row)
+            if student is not None:
+                self._pending.append((row_num, student))
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+        self._flush()
+        return {
+            'total_rows': self.total_rows,
+            'created': self.created,
+            'errors': [f"Row {row_num}: {message}" for row_num, message in sorted(self.errors, key=lambda error: error[0])],
+        }
+
+    def _build(self, row_num, row):
+        values = [clean_cell(value) for value in list(row)[:len(COLUMNS)]]
+        values += [None] * (len(COLUMNS) - len(values))
+        data = dict(zip(COLUMNS, values))
+
+        missing = [column for column in COLUMNS if column not in OPTIONAL_COLUMNS and data[column] is None]
+        if missing:
+            self.errors.append((row_num, f"missing {', '.join(missing)}"))
+            return None
+
+        data['student_id'] = str(data['student_id'])
+        if data['student_id'] in self.seen_student_ids:
+            self.errors.append((row_num, f"duplicate student_id {data['student_id']} in file"))
+            return None
+
+        class_id = data['current_class_id']
+        if class_id is not None:
+            try:
+                class_id = int(class_id)
+            except (TypeError, ValueError):
+                class_id = None
+            if class_id not in self.valid_class_ids:
+                self.errors.append((row_num, f"class {data['current_class_id']} does not belong to this school"))
+                return None
+        data['current_class_id'] = class_id
+
+        data['gender'] = str(data['gender'])[:1].upper()
+        for column in ('first_name', 'last_name', 'other_names', 'guardian_name',
+                       'guardian_phone', 'guardian_address'):
+            if data[column] is not None:
+                data[column] = str(data[column])
+        data['other_names'] = data['other_names'] or ''
+
+        student = Student(school=self.school, **data)
+        try:
+            # Field-level validation only; uniqueness is checked per chunk
+            student.clean_fields(exclude=['school', 'current_class', 'photo'])
+        except ValidationError as e:
+            messages = '; '.join(f"{field}: {' '.join(errors)}" for field, errors in e.message_dict.items())
+            self.errors.append((row_num, messages))
+            return None
+        # Only ids of valid rows count as taken, so a corrected later row still imports
+        self.seen_student_ids.add(data['student_id'])
+        return student
+
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        existing = set(Student.objects.filter(
+            student_id__in=[student.student_id for _, student in pending]
+        ).values_list('student_id', flat=True))
+
+        to_create = []
+        for row_num, student in pending:
+            if student.student_id in existing:
+                self.errors.append((row_num, f"student_id {student.student_id} already exists"))
+            else:
+                to_create.append((row_num, student))
+
+        if to_create:
+            with transaction.atomic():
+                created = self._insert(to_create)
+                # bulk_create skips post_save, so index the new rows here
+                index_students([student for _, student in created])
+            self.created += len(created)
+            if created:
+                adjust_stats(school_id=self.school.id, active_students=len(created))
+                invalidate_dashboard(self.school.id)
+        if self.on_flush:
+            self.on_flush()
+
+    def _insert(self, rows):
+        """Insert (row_number, student) pairs, returning the ones saved"""
+        try:
+            with transaction.atomic():
+                Student.objects.bulk_create([student for _, student in rows], batch_size=self.chunk_size)
+            return rows
+        except IntegrityError:
+            pass
+        # Another upload or an API create took an id after the existence check;
+        # insert row by row so only the clashing rows are reported
+        created = []
+        for row_num, student in rows:
+            try:
+                with transaction.atomic():
+                    Student.objects.bulk_create([student])
+            except IntegrityError:
+                self.errors.append((row_num, f"student_id {student.student_id} already exists"))
+            else:
+                created.append((row_num, student))
+        return created
+
+
+def claimable_jobs(now=None):
+    """Jobs waiting to run, plus RUNNING jobs whose worker stopped reporting"""
+    now = now or timezone.now()
+    stale = Q(heartbeat_at__isnull=True) | Q(heartbeat_at__lt=now - IMPORT_STALE_AFTER)
+    return StudentImportJob.objects.filter(Q(status='PENDING') | Q(stale, status='RUNNING'))
+
+
+def run_import_job(job_id):
+    """
+    Process a queued StudentImportJob, unless another worker is running it
+
+    A stale RUNNING job is started again from the top; the rows its previous
+    worker had already written are reported as existing student_ids.
+    """
+    now = timezone.now()
+    claimed = claimable_jobs(now).filter(id=job_id).update(status='RUNNING', heartbeat_at=now)
+    if not claimed:
+        return None
+    job = StudentImportJob.objects.select_related('school').get(id=job_id)
+
+    def heartbeat():
+        StudentImportJob.objects.filter(id=job.id).update(heartbeat_at=timezone.now())
+
+    try:
+        with job.file.open('rb') as uploaded_file:
+            importer = StudentImporter(job.school, on_flush=heartbeat)
+            result = importer.run(iter_rows(uploaded_file, name=job.file.name))
+        job.total_rows = result['total_rows']
+        job.created_count = result['created']
+        job.errors = result['errors']
+        job.status = 'COMPLETED'
+    except Exception as e:
+        job.errors = [f"Failed to process file: {str(e)}"]
+        job.status = 'FAILED'
+    job.finished_at = timezone.now()
+    job.save()
+    return job
@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from students.importer import claimable_jobs, run_import_job
+
+
+class Command(BaseCommand):
+    help = 'Process pending background student imports and restart those whose worker died'
+
+    def handle(self, *args, **options):
+        job_ids = list(claimable_jobs().order_by('created_at').values_list('id', flat=True))
+        for job_id in job_ids:
+            job = run_import_job(job_id)
+            if job:
+                self.stdout.write(f"Import {job.id}: {job.status}, {job.created_count} created, {len(job.errors)} errors")
@@ -0,0 +1,66 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:25
+
+from django.db import migrations, models
+import django.db.models.deletion
+import re
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'other_names', 'student_id')
+
+
+def create_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(
+                f'CREATE INDEX IF NOT EXISTS students_{field}_trgm ON students USING gin ({field} gin_trgm_ops)'
+            )
+        return
+
+    # Backfill the fallback trigram table for existing students
+    Student = apps.get_model('students', 'Student')
+    StudentSearchTrigram = apps.get_model('students', 'StudentSearchTrigram')
+    rows = []
+    for student in Student.objects.only('id', 'school_id', *SEARCH_FIELDS).iterator():
+        grams = set()
+        for word in re.findall(r'\w+', ' '.join(getattr(student, field) or '' for field in SEARCH_FIELDS).lower()):
+            padded = f"  {word} "
+            grams.update(padded[i:i + 3] for i in range(len(padded) - 2))
+        rows.extend(
+            StudentSearchTrigram(school_id=student.school_id, student_id=student.id, trigram=gram)
+            for gram in grams
+        )
+        if len(rows) >= 5000:
+            StudentSearchTrigram.objects.bulk_create(rows)
+            rows = []
+    StudentSearchTrigram.objects.bulk_create(rows)
+
+
+def drop_search_index(apps, schema_editor):
+    if schema_editor.connection.vendor == 'postgresql':
+        for field in SEARCH_FIELDS:
+            schema_editor.execute(f'DROP INDEX IF EXISTS students_{field}_trgm')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_alter_school_report_template'),
+        ('students', '0002_studentimportjob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StudentSearchTrigram',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('trigram', models.CharField(max_length=3)),
+                ('school', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='schools.school')),
+                ('student', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_trigrams', to='students.student')),
+            ],
+            options={
+                'db_table': 'student_search_trigrams',
+                'indexes': [models.Index(fields=['school', 'trigram'], name='student_trgm_school_idx')],
+            },
+        ),
+        migrations.RunPython(create_search_index, drop_search_index),
+    ]
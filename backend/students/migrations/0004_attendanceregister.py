@@ -0,0 +1,35 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:27
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('schools', '0004_alter_school_report_template'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('students', '0003_studentsearchtrigram'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttendanceRegister',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('date', models.DateField()),
+                ('statuses', models.JSONField(default=dict)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('class_instance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_registers', to='schools.class')),
+                ('marked_by', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to=settings.AUTH_USER_MODEL)),
+                ('term', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='attendance_registers', to='schools.term')),
+            ],
+            options={
+                'db_table': 'attendance_registers',
+                'ordering': ['-date'],
+                'unique_together': {('class_instance', 'date')},
+            },
+        ),
+    ]
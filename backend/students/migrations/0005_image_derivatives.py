@@ -0,0 +1,23 @@
+# Generated by Django 4.2.7 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0004_attendanceregister'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='student',
+            name='photo_report',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='student_photos/'),
+        ),
+        migrations.AddField(
+            model_name='student',
+            name='photo_thumbnail',
+            field=models.FileField(blank=True, editable=False, null=True, upload_to='student_photos/'),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 06:48
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('students', '0005_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='studentimportjob',
+            name='heartbeat_at',
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+    ]
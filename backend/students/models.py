@@ -28,6 +28,9 @@ class Student(models.Model):
     # Student Photo
     # Use FileField initially to avoid Pillow requirement
     photo = models.FileField(upload_to='student_photos/', null=True, blank=True)
+    # Derivatives built from photo on upload (see school_report_saas.images)
+    photo_report = models.FileField(upload_to='student_photos/', null=True, blank=True, editable=False)
+    photo_thumbnail = models.FileField(upload_to='student_photos/', null=True, blank=True, editable=False)
     
     # Enrollment
     admission_date = models.DateField()
@@ -49,6 +52,11 @@ class Student(models.Model):
             return f"{self.first_name} {self.other_names} {self.last_name}"
         return f"{self.first_name} {self.last_name}"
     
+    @property
+    def report_photo(self):
+        """Print-sized photo for report rendering, falling back to the original"""
+        return self.photo_report or self.photo
+    
     @property
     def age(self):
         from datetime import date
@@ -89,6 +97,33 @@ class Attendance(models.Model):
         return round((self.days_present / total) * 100, 2)
 
 
+class AttendanceRegister(models.Model):
+    """Daily class register: one row per class per day"""
+    
+    STATUS_CODES = {
+        'PRESENT': 'P',
+        'ABSENT': 'A',
+        'LATE': 'L',
+    }
+    
+    class_instance = models.ForeignKey(Class, on_delete=models.CASCADE, related_name='attendance_registers')
+    term = models.ForeignKey(Term, on_delete=models.CASCADE, related_name='attendance_registers')
+    date = models.DateField()
+    # Packed {student_id: status code} for every student marked that day
+    statuses = models.JSONField(default=dict)
+    marked_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='+')
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        db_table = 'attendance_registers'
+        unique_together = ['class_instance', 'date']
+        ordering = ['-date']
+    
+    def __str__(self):
+        return f"{self.class_instance} - {self.date}"
+
+
 class Behaviour(models.Model):
     """Student Behaviour/Conduct Model"""
     
@@ -143,3 +178,53 @@ class StudentPromotion(models.Model):
         if self.is_graduated:
             return f"{self.student.get_full_name()} - Graduated from {self.from_class}"
         return f"{self.student.get_full_name()} - {self.from_class} to {self.to_class}"
+
+
+class StudentImportJob(models.Model):
+    """Bulk student upload processed in the background"""
+    
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('RUNNING', 'Running'),
+        ('COMPLETED', 'Completed'),
+        ('FAILED', 'Failed'),
+    ]
+    
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='student_import_jobs')
+    uploaded_by = models.ForeignKey('accounts.User', on_delete=models.SET_NULL, null=True, blank=True, related_name='student_import_jobs')
+    file = models.FileField(upload_to='student_imports/')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='PENDING')
+    
+    total_rows = models.IntegerField(default=0)
+    created_count = models.IntegerField(default=0)
+    errors = models.JSONField(default=list, blank=True)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    # Set when a worker claims the job and after every chunk it imports; a
+    # RUNNING job that stops updating it is reclaimed (students.importer)
+    heartbeat_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        db_table = 'student_import_jobs'
+        ordering = ['-created_at']
+    
+    def __str__(self):
+        return f"Student import {self.id} - {self.school.name} ({self.status})"
+
+
+class StudentSearchTrigram(models.Model):
+    """Trigram index of student names for databases without pg_trgm"""
+    
+    school = models.ForeignKey(School, on_delete=models.CASCADE, related_name='+')
+    student = models.ForeignKey(Student, on_delete=models.CASCADE, related_name='search_trigrams')
+    trigram = models.CharField(max_length=3)
+    
+    class Meta:
+        db_table = 'student_search_trigrams'
+        indexes = [
+            models.Index(fields=['school', 'trigram'], name='student_trgm_school_idx'),
+        ]
+    
+    def __str__(self):
+        return f"{self.student_id} - {self.trigram}"
@@ -0,0 +1,129 @@
+from collections import defaultdict
+from django.db import models, transaction
+from django.db.models import Case, Count, F, Value, When
+from schools.dashboard import invalidate_dashboard
+from schools.models import Class
+from schools.stats import adjust_stats
+from .models import Student, StudentPromotion
+
+LEVEL_ORDER = [level for level, _ in Class.LEVEL_CHOICES]
+NEXT_LEVEL = dict(zip(LEVEL_ORDER, LEVEL_ORDER[1:]))
+
+
+class PromotionError(Exception):
+    pass
+
+
+def build_promotion_plan(school):
+    """
+    Map every class in the school to the class its students move into.
+
+    The target is the class one level up with the same section, or the only class
+    at that level. Classes at the final level map to None (graduation). Classes
+    with no usable target are returned separately.
+    """
+    classes = list(Class.objects.filter(school=school))
+    by_level = defaultdict(list)
+    for cls in classes:
+        by_level[cls.level].append(cls)
+
+    plan = {}
+    unmatched = []
+    for cls in classes:
+        if cls.level not in NEXT_LEVEL:
+            plan[cls.id] = (cls, None)
+            continue
+        candidates = by_level.get(NEXT_LEVEL[cls.level], [])
+        same_section = [c for c in candidates if c.section == cls.section]
+        if same_section:
+            plan[cls.id] = (cls, same_section[0])
+        elif len(candidates) == 1:
+            plan[cls.id] = (cls, candidates[0])
+        else:
+            unmatched.append(cls)
+    return plan, unmatched
+
+
+def promote_academic_year(school, academic_year, require_promoted=False, dry_run=False):
+    """
+    Promote every active student to the next level at the end of academic_year.
+
+    Students already promoted for this academic year are left alone, so running
+    it twice is harmless. When require_promoted is set only students whose
+    TermResult for the last term of the year is marked promoted move up.
+    """
+    plan, unmatched = build_promotion_plan(school)
+
+    students = Student.objects.filter(
+        school=school,
+        is_active=True,
+        current_class_id__in=list(plan.keys())
+    ).exclude(promotions__academic_year=academic_year)
+
+    if require_promoted:
+        final_term = academic_year.terms.order_by('-end_date').first()
+        if not final_term:
+            raise PromotionError("The academic year has no terms to check promotion results against")
+        students = students.filter(term_results__term=final_term, term_results__promoted=True)
+
+    counts = dict(students.order_by().values_list('current_class_id').annotate(total=Count('id')))
+    summary = [
+        {
+            'from_class_id': cls.id,
+            'from_class': str(cls),
+            'to_class_id': to_class.id if to_class else None,
+            'to_class': str(to_class) if to_class else None,
+            'graduating': to_class is None,
+            'students': counts[class_id],
+        }
+        for class_id, (cls, to_class) in plan.items()
+        if counts.get(class_id)
+    ]
+    summary.sort(key=lambda row: (LEVEL_ORDER.index(plan[row['from_class_id']][0].level), row['from_class']))
+
+    result = {
+        'classes': summary,
+        'skipped_classes': [{'id': cls.id, 'name': str(cls), 'reason': 'No class at the next level'} for cls in unmatched],
+        'promoted_count': sum(row['students'] for row in summary if not row['graduating']),
+        'graduated_count': sum(row['students'] for row in summary if row['graduating']),
+    }
+    if dry_run or not summary:
+        return result
+
+    graduating_class_ids = [class_id for class_id, (_, to_class) in plan.items() if to_class is None]
+
+    with transaction.atomic():
+        rows = list(students.select_for_update().order_by().values_list('id', 'current_class_id'))
+
+        # Every SET expression reads the pre-update row, so classes never cascade
+        students.update(
+            current_class_id=Case(
+                *[When(current_class_id=class_id, then=Value(to_class.id if to_class else None))
+                  for class_id, (_, to_class) in plan.items()],
+                default=F('current_class_id'),
+                output_field=models.BigIntegerField(),
+            ),
+            is_active=Case(
+                When(current_class_id__in=graduating_class_ids, then=Value(False)),
+                default=F('is_active'),
+                output_field=models.BooleanField(),
+            ),
+        )
+
+        StudentPromotion.objects.bulk_create([
+            StudentPromotion(
+                student_id=student_id,
+                from_class_id=class_id,
+                to_class=plan[class_id][1],
+                academic_year=academic_year,
+                is_graduated=plan[class_id][1] is None,
+            )
+            for student_id, class_id in rows
+        ], batch_size=1000)
+
+        # The update above bypasses signals; graduates are no longer active
+        graduated = sum(1 for _, class_id in rows if plan[class_id][1] is None)
+        adjust_stats(school_id=school.id, active_students=-graduated)
+
+    invalidate_dashboard(school.id)
+    return result
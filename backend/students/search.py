@@ -0,0 +1,97 @@
+import re
+from django.db import connection
+from django.db.models import Count
+from .models import Student, StudentSearchTrigram
+
+SEARCH_FIELDS = ('first_name', 'last_name', 'other_names', 'student_id')
+
+# Minimum share of the query's trigrams a student must contain to match
+MIN_TRIGRAM_SCORE = 0.5
+
+_WORD_RE = re.compile(r'\w+')
+
+
+def uses_pg_trgm():
+    return connection.vendor == 'postgresql'
+
+
+def trigrams(text):
+    """Return the set of padded, lowercased trigrams of every word in text, like pg_trgm"""
+    result = set()
+    for word in _WORD_RE.findall((text or '').lower()):
+        padded = f"  {word} "
+        result.update(padded[i:i + 3] for i in range(len(padded) - 2))
+    return result
+
+
+def student_trigrams(student):
+    return trigrams(' '.join(str(getattr(student, field) or '') for field in SEARCH_FIELDS))
+
+
+def index_students(students):
+    """Rebuild the fallback trigram rows for the given students. No-op on PostgreSQL."""
+    students = [student for student in students if student.pk]
+    if uses_pg_trgm() or not students:
+        return 0
+    StudentSearchTrigram.objects.filter(student_id__in=[s.id for s in students]).delete()
+    rows = [
+        StudentSearchTrigram(school_id=student.school_id, student_id=student.id, trigram=trigram)
+        for student in students
+        for trigram in student_trigrams(student)
+    ]
+    StudentSearchTrigram.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+def search_students(school, queryset, query, limit=20):
+    """
+    Fuzzy search by name or student ID within ``queryset``, best match first.
+
+    ``queryset`` carries the caller's scoping (school, teacher classes, filters)
+    and is only ever used as a subquery. Returns a list of students with a
+    ``score`` attribute between 0 and 1.
+    """
+    if uses_pg_trgm():
+        return _search_pg(queryset, query, limit)
+    return _search_trigram_table(school, queryset, query, limit)
+
+
+def _search_pg(queryset, query, limit):
+    from django.contrib.postgres.search import TrigramWordSimilarity
+    from django.db.models import Q
+    from django.db.models.functions import Greatest
+
+    # Each branch (%> with the default word_similarity_threshold) is served by
+    # the per-column GIN gin_trgm_ops indexes
+    condition = Q()
+    for field in SEARCH_FIELDS:
+        condition |= Q(**{f'{field}__trigram_word_similar': query})
+
+    return list(
+        queryset.filter(condition)
+        .annotate(score=Greatest(*[TrigramWordSimilarity(query, field) for field in SEARCH_FIELDS]))
+        .select_related('current_class')
+        .order_by('-score', 'last_name', 'first_name')[:limit]
+    )
+
+
+def _search_trigram_table(school, queryset, query, limit):
+    query_trigrams = trigrams(query)
+    if not query_trigrams:
+        return []
+
+    hits = (
+        StudentSearchTrigram.objects
+        .filter(school=school, trigram__in=query_trigrams, student__in=queryset.values('id'))
+        .values('student_id')
+        .annotate(hits=Count('id'))
+        .filter(hits__gte=max(1, round(len(query_trigrams) * MIN_TRIGRAM_SCORE)))
+        .order_by('-hits')[:limit]
+    )
+    scores = {row['student_id']: row['hits'] / len(query_trigrams) for row in hits}
+
+    students = list(Student.objects.filter(id__in=scores).select_related('current_class'))
+    for student in students:
+        student.score = round(scores[student.id], 3)
+    students.sort(key=lambda s: (-s.score, s.last_name, s.first_name))
+    return students
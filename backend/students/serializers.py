@@ -1,8 +1,10 @@
 from rest_framework import serializers
-from .models import Student, Attendance, Behaviour, StudentPromotion
+from school_report_saas.serializers import SparseFieldsetMixin
+from school_report_saas.images import validate_image
+from .models import Student, Attendance, Behaviour, StudentPromotion, StudentImportJob
 
 
-class StudentSerializer(serializers.ModelSerializer):
+class StudentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
     class_name = serializers.CharField(source='current_class.full_name', read_only=True)
     age = serializers.IntegerField(read_only=True)
     full_name = serializers.CharField(source='get_full_name', read_only=True)
@@ -11,6 +13,9 @@ class StudentSerializer(serializers.ModelSerializer):
         model = Student
         fields = '__all__'
         read_only_fields = ['created_at', 'updated_at']
+    
+    def validate_photo(self, value):
+        return validate_image(value)
 
 
 class StudentCreateSerializer(serializers.ModelSerializer):
@@ -19,11 +24,28 @@ class StudentCreateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Student
         exclude = ['school']
+    
+    def validate_photo(self, value):
+        return validate_image(value)
 
 
 class BulkStudentUploadSerializer(serializers.Serializer):
-    """Serializer for bulk student upload via Excel"""
+    """Serializer for bulk student upload via Excel or CSV"""
     file = serializers.FileField()
+    background = serializers.BooleanField(required=False, default=False)
+    
+    def validate_file(self, value):
+        from .importer import SUPPORTED_EXTENSIONS
+        if not value.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise serializers.ValidationError("Upload an .xlsx or .csv file")
+        return value
+
+
+class StudentImportJobSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = StudentImportJob
+        fields = ['id', 'status', 'total_rows', 'created_count', 'errors', 'created_at', 'finished_at']
+        read_only_fields = fields
 
 
 class AttendanceSerializer(serializers.ModelSerializer):
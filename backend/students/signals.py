@@ -0,0 +1,26 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from school_report_saas.images import THUMBNAIL_SIZE, inches, refresh_derivatives
+from .models import Student
+from .search import SEARCH_FIELDS, index_students
+
+PHOTO_DERIVATIVES = {
+    'photo_report': ('report', inches(1.2, 1.5)),
+    'photo_thumbnail': ('thumb', THUMBNAIL_SIZE),
+}
+
+
+@receiver(post_save, sender=Student)
+def refresh_search_trigrams(sender, instance, created, update_fields=None, **kwargs):
+    """Keep the fallback search index in step with student names"""
+    if update_fields is not None and not set(update_fields) & set(SEARCH_FIELDS):
+        return
+    index_students([instance])
+
+
+@receiver(post_save, sender=Student)
+def refresh_photo_derivatives(sender, instance, update_fields=None, **kwargs):
+    """Rebuild the print-sized photo and thumbnail when the photo changes"""
+    if update_fields is not None and 'photo' not in update_fields:
+        return
+    refresh_derivatives(instance, 'photo', PHOTO_DERIVATIVES)
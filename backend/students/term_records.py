@@ -0,0 +1,64 @@
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+ATTENDANCE_FIELDS = ['days_present', 'days_absent', 'times_late']
+BEHAVIOUR_FIELDS = ['conduct', 'attitude', 'interest', 'punctuality', 'remarks']
+
+
+def upsert_term_records(model, fields, class_instance, term, records):
+    """
+    Insert or update one ``model`` row (Attendance or Behaviour) per student for a term.
+
+    Every record is validated on its own; invalid ones are reported and the rest
+    are written with INSERT ... ON CONFLICT (student, term) DO UPDATE, one per
+    set of fields the records supply. An existing row keeps the fields a record
+    leaves out (e.g. register-derived days_present); a new row takes the model
+    default for them.
+    """
+    roster = set(class_instance.students.filter(is_active=True).values_list('id', flat=True))
+
+    rows = {}
+    errors = []
+    for record in records:
+        student_id = record.get('student_id')
+        try:
+            student_id = int(student_id)
+        except (TypeError, ValueError):
+            errors.append({'student_id': student_id, 'errors': {'student_id': ['Invalid student_id']}})
+            continue
+        if student_id not in roster:
+            errors.append({'student_id': student_id, 'errors': {'student_id': ['Student is not in this class']}})
+            continue
+
+        supplied = tuple(field for field in fields if record.get(field) is not None)
+        instance = model(student_id=student_id, term=term, **{field: record[field] for field in supplied})
+        try:
+            instance.clean_fields(exclude=['student', 'term'])
+            negative = [field for field in fields if isinstance(getattr(instance, field), int) and getattr(instance, field) < 0]
+            if negative:
+                raise ValidationError({field: ['Must not be negative'] for field in negative})
+        except ValidationError as e:
+            errors.append({'student_id': student_id, 'errors': e.message_dict})
+            rows.pop(student_id, None)
+            continue
+        # The last record for a student wins
+        rows[student_id] = (instance, supplied)
+
+    groups = {}
+    for instance, supplied in rows.values():
+        groups.setdefault(supplied, []).append(instance)
+
+    if groups:
+        with transaction.atomic():
+            for supplied, instances in groups.items():
+                model.objects.bulk_create(
+                    instances,
+                    update_conflicts=True,
+                    unique_fields=['student', 'term'],
+                    update_fields=list(supplied) + ['updated_at'],
+                )
+
+    return {
+        'saved_count': len(rows),
+        'errors': errors,
+    }
@@ -0,0 +1,158 @@
+import io
+import shutil
+import tempfile
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from schools.models import Class, Term
+from schools.tests import make_school, make_students
+from .importer import IMPORT_STALE_AFTER, StudentImporter, run_import_job
+from .models import Student, StudentImportJob, Attendance, Behaviour
+from .term_records import upsert_term_records, ATTENDANCE_FIELDS, BEHAVIOUR_FIELDS
+
+
+class StudentImporterTests(TestCase):
+    def setUp(self):
+        self.school, _ = make_school()
+        self.class_obj = Class.objects.create(school=self.school, level='BASIC_1', section='A')
+
+    def row(self, student_id, class_id):
+        return [
+            student_id, 'Kofi', 'Mensah', '', 'M', date(2015, 1, 1), class_id,
+            'Guardian', '0200000000', '', 'Accra', date(2024, 9, 1),
+        ]
+
+    def test_invalid_row_does_not_reserve_its_student_id(self):
+        rows = enumerate([self.row('S1', 99999), self.row('S1', self.class_obj.id)], start=2)
+        result = StudentImporter(self.school).run(rows)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], ['Row 2: class 99999 does not belong to this school'])
+        self.assertEqual(Student.objects.get(student_id='S1').current_class, self.class_obj)
+
+    def test_duplicate_valid_rows_are_rejected(self):
+        rows = enumerate([self.row('S1', self.class_obj.id), self.row('S1', self.class_obj.id)], start=2)
+        result = StudentImporter(self.school).run(rows)
+        self.assertEqual(result['created'], 1)
+        self.assertEqual(result['errors'], ['Row 3: duplicate student_id S1 in file'])
+
+
+    def test_id_taken_after_the_existence_check_fails_only_its_row(self):
+        importer = StudentImporter(self.school)
+        rows = [(2, importer._build(2, self.row('S1', self.class_obj.id))), (3, importer._build(3, self.row('S2', self.class_obj.id)))]
+        # Created between _flush's lookup and its insert, e.g. by another upload
+        Student.objects.bulk_create([Student(
+            school=self.school, student_id='S1', first_name='Ama', last_name='Owusu', gender='F',
+            date_of_birth=date(2015, 1, 1), guardian_name='G', guardian_phone='0', guardian_address='-',
+            admission_date=date(2024, 9, 1),
+        )])
+        created = importer._insert(rows)
+        self.assertEqual([row_num for row_num, _ in created], [3])
+        self.assertEqual(importer.errors, [(2, 'student_id S1 already exists')])
+        self.assertTrue(Student.objects.filter(student_id='S2').exists())
+
+
+class StudentImportJobTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media_root)
+        settings_override = override_settings(MEDIA_ROOT=media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        self.school, _ = make_school()
+        self.class_obj = Class.objects.create(school=self.school, level='BASIC_1', section='A')
+        csv = 'header\nS1,Kofi,Mensah,,M,2015-01-01,{0},Guardian,0200000000,,Accra,2024-09-01\n'.format(self.class_obj.id)
+        self.job = StudentImportJob(school=self.school, status='RUNNING')
+        self.job.file.save('students.csv', ContentFile(csv.encode()), save=False)
+
+    def test_live_running_job_is_left_alone(self):
+        self.job.heartbeat_at = timezone.now()
+        self.job.save()
+        self.assertIsNone(run_import_job(self.job.id))
+
+    def test_stale_running_job_is_reclaimed(self):
+        self.job.heartbeat_at = timezone.now() - IMPORT_STALE_AFTER - timedelta(minutes=1)
+        self.job.save()
+        call_command('process_student_imports', stdout=io.StringIO())
+        self.job.refresh_from_db()
+        self.assertEqual((self.job.status, self.job.created_count), ('COMPLETED', 1))
+        self.assertGreater(self.job.heartbeat_at, timezone.now() - IMPORT_STALE_AFTER)
+
+
+class StudentQueryCountTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.school, admin = make_school()
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+        self.classes = [Class.objects.create(school=self.school, level=f'BASIC_{level}', section='A') for level in range(1, 4)]
+
+    def assert_queries(self, count):
+        # The first request caches the tenant context
+        self.assertEqual(self.client.get('/api/students/').status_code, 200)
+        with self.assertNumQueries(count):
+            self.assertEqual(self.client.get('/api/students/').status_code, 200)
+
+    def test_list(self):
+        make_students(self.school, self.classes, 1)
+        self.assert_queries(2)
+        Student.objects.all().delete()
+        make_students(self.school, self.classes, 30)
+        self.assert_queries(2)
+
+
+class AttendanceRegisterDateTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        school, admin = make_school()
+        self.class_obj = Class.objects.create(school=school, level='BASIC_1', section='A')
+        self.client = APIClient()
+        self.client.force_authenticate(admin)
+
+    def test_mark_class_rejects_impossible_date(self):
+        response = self.client.post('/api/students/attendance/mark_class/', {
+            'class_id': self.class_obj.id, 'date': '2024-02-30', 'records': [],
+        }, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'date must be in YYYY-MM-DD format'})
+
+    def test_register_rejects_impossible_date(self):
+        response = self.client.get('/api/students/attendance/register/', {'class_id': self.class_obj.id, 'date': '2024-02-30'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'error': 'date must be in YYYY-MM-DD format'})
+
+
+class TermRecordUpsertTests(TestCase):
+    def setUp(self):
+        school, _ = make_school()
+        self.term = Term.objects.get()
+        self.class_obj = Class.objects.create(school=school, level='BASIC_1', section='A')
+        self.first, self.second = make_students(school, [self.class_obj], 2)
+
+    def test_partial_record_keeps_other_fields(self):
+        Behaviour.objects.create(
+            student=self.first, term=self.term, conduct='GOOD', attitude='EXCELLENT', remarks='Helpful'
+        )
+        result = upsert_term_records(Behaviour, BEHAVIOUR_FIELDS, self.class_obj, self.term, [
+            {'student_id': self.first.id, 'conduct': 'VERY_GOOD'},
+            {'student_id': self.second.id, 'conduct': 'SATISFACTORY', 'remarks': 'New'},
+        ])
+        self.assertEqual(result, {'saved_count': 2, 'errors': []})
+        first = Behaviour.objects.get(student=self.first)
+        self.assertEqual((first.conduct, first.attitude, first.remarks), ('VERY_GOOD', 'EXCELLENT', 'Helpful'))
+        second = Behaviour.objects.get(student=self.second)
+        self.assertEqual((second.conduct, second.attitude, second.remarks), ('SATISFACTORY', 'GOOD', 'New'))
+
+    def test_partial_attendance_keeps_register_days(self):
+        Attendance.objects.create(student=self.first, term=self.term, days_present=40, days_absent=2)
+        upsert_term_records(Attendance, ATTENDANCE_FIELDS, self.class_obj, self.term, [
+            {'student_id': self.first.id, 'times_late': 3},
+        ])
+        attendance = Attendance.objects.get(student=self.first)
+        self.assertEqual((attendance.days_present, attendance.days_absent, attendance.times_late), (40, 2, 3))
@@ -0,0 +1,96 @@
+import hashlib
+import json
+from django.core.cache import cache
+from scores.models import SubjectResult, TermResult
+from .models import Attendance
+
+TRANSCRIPT_PDF_TIMEOUT = 60 * 60 * 24
+
+
+def build_transcript(student):
+    """
+    Every term's results for one student, oldest term first.
+
+    Three queries (subject results, term results, attendance) pivoted by term.
+    """
+    terms = {}
+
+    def term_entry(term):
+        if term.id not in terms:
+            terms[term.id] = {
+                'term_id': term.id,
+                'term': term.get_name_display(),
+                'academic_year': term.academic_year.name,
+                'start_date': str(term.start_date),
+                'class_name': None,
+                'subjects': [],
+                'total_score': None,
+                'average_score': None,
+                'class_position': None,
+                'total_students': None,
+                'promoted': None,
+                'attendance': None,
+            }
+        return terms[term.id]
+
+    subject_results = (
+        SubjectResult.objects.filter(student=student)
+        .select_related('term__academic_year', 'class_subject__subject')
+        .order_by('term__start_date', 'class_subject__subject__name')
+    )
+    for result in subject_results:
+        term_entry(result.term)['subjects'].append({
+            'subject': result.class_subject.subject.name,
+            'ca_score': str(result.ca_score),
+            'exam_score': str(result.exam_score),
+            'total_score': str(result.total_score),
+            'grade': result.grade,
+            'remark': result.remark,
+        })
+
+    for result in TermResult.objects.filter(student=student).select_related('term__academic_year', 'class_instance'):
+        entry = term_entry(result.term)
+        entry.update({
+            'class_name': result.class_instance.full_name,
+            'total_score': str(result.total_score),
+            'average_score': str(result.average_score),
+            'class_position': result.class_position,
+            'total_students': result.total_students,
+            'promoted': result.promoted,
+        })
+
+    for attendance in Attendance.objects.filter(student=student).select_related('term__academic_year'):
+        term_entry(attendance.term)['attendance'] = {
+            'days_present': attendance.days_present,
+            'days_absent': attendance.days_absent,
+            'times_late': attendance.times_late,
+        }
+
+    return {
+        'student_id': student.student_id,
+        'name': student.get_full_name(),
+        'terms': sorted(terms.values(), key=lambda entry: entry['start_date']),
+    }
+
+
+def render_transcript_pdf(student, transcript=None):
+    """
+    Render the transcript PDF, reusing a cached copy while the data is unchanged.
+
+    The cache key includes a digest of the transcript and the school's last
+    update, so edited results or settings produce a fresh PDF without explicit
+    invalidation.
+    """
+    from reports.pdf_generator import ReportGenerator
+
+    transcript = transcript or build_transcript(student)
+    school = student.school
+    payload = json.dumps([transcript, school.updated_at], sort_keys=True, default=str)
+    digest = hashlib.sha1(payload.encode()).hexdigest()
+    cache_key = f"transcript-pdf:{student.id}:{digest}"
+
+    pdf = cache.get(cache_key)
+    if pdf is None:
+        pdf = ReportGenerator(student, school, None).generate_transcript_pdf(transcript).getvalue()
+        cache.set(cache_key, pdf, TRANSCRIPT_PDF_TIMEOUT)
+    return pdf
@@ -3,9 +3,10 @@ from rest_framework.routers import DefaultRouter
 from .views import StudentViewSet, AttendanceViewSet, BehaviourViewSet, StudentPromotionViewSet
 
 router = DefaultRouter()
-router.register(r'', StudentViewSet, basename='student')
 router.register(r'attendance', AttendanceViewSet, basename='attendance')
 router.register(r'behaviour', BehaviourViewSet, basename='behaviour')
 router.register(r'promotions', StudentPromotionViewSet, basename='promotion')
+# Registered last so its detail route doesn't swallow the prefixes above
+router.register(r'', StudentViewSet, basename='student')
 
 urlpatterns = router.urls
@@ -1,15 +1,30 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from school_report_saas.pagination import KeysetPaginationMixin
+from school_report_saas.tenant import TenantContextMixin, get_tenant
+from django.conf import settings
+from django.http import HttpResponse
 from django.db import transaction
-from .models import Student, Attendance, Behaviour, StudentPromotion
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+from school_report_saas.background import run_in_background
+from schools.dashboard import invalidate_dashboard
+from .models import Student, Attendance, AttendanceRegister, Behaviour, StudentPromotion, StudentImportJob
 from .serializers import (
     StudentSerializer, StudentCreateSerializer, AttendanceSerializer,
-    BehaviourSerializer, StudentPromotionSerializer, BulkStudentUploadSerializer
+    BehaviourSerializer, StudentPromotionSerializer, BulkStudentUploadSerializer,
+    StudentImportJobSerializer
 )
+from .importer import StudentImporter, iter_rows, run_import_job
+from .promotion import promote_academic_year, PromotionError
+from .search import search_students
+from .attendance import mark_class, AttendanceError, STATUS_NAMES
+from .term_records import upsert_term_records, ATTENDANCE_FIELDS, BEHAVIOUR_FIELDS
+from .transcript import build_transcript, render_transcript_pdf
 
 
-class StudentViewSet(viewsets.ModelViewSet):
+class StudentViewSet(TenantContextMixin, KeysetPaginationMixin, viewsets.ModelViewSet):
     """Student CRUD operations"""
     queryset = Student.objects.all()
     permission_classes = [permissions.IsAuthenticated]
@@ -24,21 +39,12 @@ class StudentViewSet(viewsets.ModelViewSet):
         if not getattr(user, 'school', None):
             return Student.objects.none()
 
-        queryset = Student.objects.filter(school=user.school)
+        queryset = Student.objects.filter(school=user.school).select_related('current_class')
 
         # Teachers can see students in classes they teach
         if getattr(user, 'role', None) == 'TEACHER':
-            from schools.models import ClassSubject, Class
-            # Get classes where user is class teacher OR subject teacher
-            class_teacher_classes = Class.objects.filter(
-                school=user.school,
-                class_teacher=user
-            ).values_list('id', flat=True)
-            subject_classes = ClassSubject.objects.filter(
-                teacher=user
-            ).values_list('class_instance_id', flat=True)
-            teacher_classes = list(class_teacher_classes) + list(subject_classes)
-            queryset = queryset.filter(current_class_id__in=teacher_classes)
+            # Classes where user is class teacher OR subject teacher
+            queryset = queryset.filter(current_class_id__in=self.tenant.teacher_scope.visible_class_ids)
 
         # Filter by class if provided
         class_id = self.request.query_params.get('class_id')
@@ -104,69 +110,109 @@ class StudentViewSet(viewsets.ModelViewSet):
             raise permissions.PermissionDenied("Teachers cannot delete student records")
         instance.delete()
     
+    @action(detail=True, methods=['get'])
+    def transcript(self, request, pk=None):
+        """Get the student's results, positions and attendance for every term"""
+        return Response(build_transcript(self.get_object()))
+    
+    @action(detail=True, methods=['get'], url_path='transcript/pdf')
+    def transcript_pdf(self, request, pk=None):
+        """Download the multi-term transcript as a PDF"""
+        student = self.get_object()
+        try:
+            pdf = render_transcript_pdf(student)
+        except RuntimeError as e:
+            return Response(
+                {"error": str(e)},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        response = HttpResponse(pdf, content_type='application/pdf')
+        response['Content-Disposition'] = f'attachment; filename="transcript_{student.student_id}.pdf"'
+        return response
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """Fuzzy search students by name or student ID, best matches first"""
+        query = request.query_params.get('q', '').strip()
+        if len(query) < 2:
+            return Response(
+                {"error": "q must be at least 2 characters"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            limit = min(max(int(request.query_params.get('limit', 20)), 1), 50)
+        except ValueError:
+            limit = 20
+        
+        students = search_students(request.user.school, self.get_queryset(), query, limit=limit)
+        results = StudentSerializer(students, many=True, context={'request': request}).data
+        for data, student in zip(results, students):
+            data['score'] = student.score
+        
+        return Response({
+            "query": query,
+            "count": len(results),
+            "results": results
+        })
+    
     @action(detail=False, methods=['post'])
     def bulk_upload(self, request):
-        """Bulk upload students from Excel file"""
+        """Bulk upload students from an Excel or CSV file"""
         serializer = BulkStudentUploadSerializer(data=request.data)
         
         if not serializer.is_valid():
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
         
-        excel_file = request.FILES['file']
+        school = getattr(request.user, 'school', None)
+        if not school:
+            return Response(
+                {"error": "User is not attached to a school"},
+                status=status.HTTP_403_FORBIDDEN
+            )
         
-        try:
-            try:
-                import openpyxl
-            except Exception as e:
-                return Response(
-                    {"error": "openpyxl is not installed. Please add 'openpyxl' to requirements to enable bulk upload."},
-                    status=status.HTTP_501_NOT_IMPLEMENTED
-                )
-            workbook = openpyxl.load_workbook(excel_file)
-            sheet = workbook.active
-            
-            students_created = 0
-            errors = []
-            
-            with transaction.atomic():
-                for row_num, row in enumerate(sheet.iter_rows(min_row=2, values_only=True), start=2):
-                    try:
-                        # Expected columns: student_id, first_name, last_name, other_names, gender, 
-                        # date_of_birth, current_class_id, guardian_name, guardian_phone, 
-                        # guardian_email, guardian_address, admission_date
-                        
-                        student_data = {
-                            'school': request.user.school,
-                            'student_id': row[0],
-                            'first_name': row[1],
-                            'last_name': row[2],
-                            'other_names': row[3] or '',
-                            'gender': row[4],
-                            'date_of_birth': row[5],
-                            'current_class_id': row[6],
-                            'guardian_name': row[7],
-                            'guardian_phone': row[8],
-                            'guardian_email': row[9] or '',
-                            'guardian_address': row[10],
-                            'admission_date': row[11],
-                        }
-                        
-                        Student.objects.create(**student_data)
-                        students_created += 1
-                        
-                    except Exception as e:
-                        errors.append(f"Row {row_num}: {str(e)}")
-            
+        upload = serializer.validated_data['file']
+        
+        # Large files are stored and imported off the request thread
+        if serializer.validated_data['background'] or upload.size > settings.STUDENT_IMPORT_BACKGROUND_THRESHOLD:
+            job = StudentImportJob.objects.create(school=school, uploaded_by=request.user, file=upload)
+            run_in_background(run_import_job, job.id)
             return Response({
-                "message": f"Successfully created {students_created} students",
-                "errors": errors
-            }, status=status.HTTP_201_CREATED)
-            
+                "message": "File accepted for background processing",
+                "job": StudentImportJobSerializer(job).data
+            }, status=status.HTTP_202_ACCEPTED)
+        
+        try:
+            result = StudentImporter(school).run(iter_rows(upload))
+        except ImportError:
+            return Response(
+                {"error": "openpyxl is not installed. Please add 'openpyxl' to requirements to enable bulk upload."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
         except Exception as e:
             return Response(
                 {"error": f"Failed to process file: {str(e)}"},
                 status=status.HTTP_400_BAD_REQUEST
             )
+        
+        return Response({
+            "message": f"Successfully created {result['created']} students",
+            "created_count": result['created'],
+            "total_rows": result['total_rows'],
+            "errors": result['errors']
+        }, status=status.HTTP_201_CREATED)
+    
+    @action(detail=False, methods=['get'], url_path=r'bulk_upload/(?P<job_id>\d+)')
+    def bulk_upload_status(self, request, job_id=None):
+        """Get the progress of a background bulk upload"""
+        try:
+            job = StudentImportJob.objects.get(id=job_id, school=request.user.school)
+        except StudentImportJob.DoesNotExist:
+            return Response(
+                {"error": "Import job not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(StudentImportJobSerializer(job).data)
     
     @action(detail=False, methods=['post'])
     def promote_students(self, request):
@@ -181,37 +227,142 @@ class StudentViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        promoted_count = 0
+        from schools.models import Class
+        if not Class.objects.filter(id=to_class_id, school=request.user.school).exists():
+            return Response(
+                {"error": "Class not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
         
         with transaction.atomic():
-            for student_id in student_ids:
-                try:
-                    student = Student.objects.get(id=student_id, school=request.user.school)
-                    from_class = student.current_class
-                    
-                    # Create promotion record
-                    StudentPromotion.objects.create(
-                        student=student,
-                        from_class=from_class,
-                        to_class_id=to_class_id,
-                        academic_year_id=academic_year_id
-                    )
-                    
-                    # Update student's current class
-                    student.current_class_id = to_class_id
-                    student.save()
-                    
-                    promoted_count += 1
-                    
-                except Student.DoesNotExist:
-                    continue
+            students = Student.objects.filter(id__in=student_ids, school=request.user.school)
+            rows = list(students.select_for_update().values_list('id', 'current_class_id'))
+            
+            StudentPromotion.objects.bulk_create([
+                StudentPromotion(
+                    student_id=student_id,
+                    from_class_id=from_class_id,
+                    to_class_id=to_class_id,
+                    academic_year_id=academic_year_id
+                )
+                for student_id, from_class_id in rows
+            ])
+            students.update(current_class_id=to_class_id)
+        invalidate_dashboard(request.user.school.id)
         
         return Response({
-            "message": f"Successfully promoted {promoted_count} students"
+            "message": f"Successfully promoted {len(rows)} students"
         })
+    
+    @action(detail=False, methods=['post'])
+    def promote_year(self, request):
+        """Promote every class to the next level at the end of an academic year"""
+        user = request.user
+        if getattr(user, 'role', None) == 'TEACHER':
+            return Response(
+                {"error": "Teachers cannot promote students"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        academic_year_id = request.data.get('academic_year_id')
+        if not academic_year_id:
+            return Response(
+                {"error": "academic_year_id is required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        from schools.models import AcademicYear
+        try:
+            academic_year = AcademicYear.objects.get(id=academic_year_id, school=user.school)
+        except AcademicYear.DoesNotExist:
+            return Response(
+                {"error": "Academic year not found"},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        
+        dry_run = str(request.data.get('dry_run', False)).lower() == 'true'
+        require_promoted = str(request.data.get('require_promoted', False)).lower() == 'true'
+        
+        try:
+            result = promote_academic_year(
+                user.school, academic_year,
+                require_promoted=require_promoted,
+                dry_run=dry_run
+            )
+        except PromotionError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        if dry_run:
+            message = f"{result['promoted_count']} students would be promoted and {result['graduated_count']} would graduate"
+        else:
+            message = f"Promoted {result['promoted_count']} students and graduated {result['graduated_count']}"
+        
+        return Response({"message": message, "dry_run": dry_run, **result})
+
+
+def parse_register_date(value):
+    """The date for a YYYY-MM-DD value, or None if it is malformed or not a real day"""
+    try:
+        return parse_date(str(value))
+    except ValueError:
+        # Well-formed but impossible, e.g. 2024-02-30
+        return None
+
+
+INVALID_DATE = {"error": "date must be in YYYY-MM-DD format"}
+
+
+def get_class_teacher_class(request, class_id):
+    """Return (class, error_response) for a class the user keeps records for"""
+    from schools.models import Class
+    user = request.user
+    try:
+        class_instance = Class.objects.select_related('school').get(id=class_id, school=user.school)
+    except (Class.DoesNotExist, ValueError, TypeError):
+        return None, Response(
+            {"error": "Class not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    if getattr(user, 'role', None) == 'TEACHER' and class_instance.class_teacher_id != user.id:
+        return None, Response(
+            {"error": "Only the class teacher can update records for this class"},
+            status=status.HTTP_403_FORBIDDEN
+        )
+    return class_instance, None
+
+
+def bulk_upsert_response(request, model, fields):
+    """Shared body of the Attendance and Behaviour bulk_upsert actions"""
+    from schools.models import Term
+    class_id = request.data.get('class_id')
+    term_id = request.data.get('term_id')
+    records = request.data.get('records')
+    if not class_id or not term_id or not isinstance(records, list):
+        return Response(
+            {"error": "class_id, term_id and a list of records are required"},
+            status=status.HTTP_400_BAD_REQUEST
+        )
+    
+    class_instance, error = get_class_teacher_class(request, class_id)
+    if error:
+        return error
+    
+    try:
+        term = get_tenant(request).get_term(term_id)
+    except (Term.DoesNotExist, ValueError, TypeError):
+        return Response(
+            {"error": "Term not found"},
+            status=status.HTTP_404_NOT_FOUND
+        )
+    
+    result = upsert_term_records(model, fields, class_instance, term, records)
+    return Response({
+        "message": f"Saved {result['saved_count']} records",
+        **result
+    })
 
 
-class AttendanceViewSet(viewsets.ModelViewSet):
+class AttendanceViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Attendance management"""
     queryset = Attendance.objects.all()
     serializer_class = AttendanceSerializer
@@ -232,9 +383,75 @@ class AttendanceViewSet(viewsets.ModelViewSet):
             
             return queryset
         return Attendance.objects.none()
+    
+    @action(detail=False, methods=['post'])
+    def mark_class(self, request):
+        """Mark the daily register for a whole class and update term totals"""
+        class_id = request.data.get('class_id')
+        records = request.data.get('records')
+        if not class_id or not isinstance(records, list):
+            return Response(
+                {"error": "class_id and a list of records are required"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        date = parse_register_date(request.data['date']) if request.data.get('date') else timezone.localdate()
+        if not date:
+            return Response(INVALID_DATE, status=status.HTTP_400_BAD_REQUEST)
+        
+        class_instance, error = get_class_teacher_class(request, class_id)
+        if error:
+            return error
+        
+        try:
+            result = mark_class(class_instance, date, records, marked_by=request.user)
+        except AttendanceError as e:
+            return Response({"error": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        
+        return Response({
+            "message": f"Register saved for {result['marked_count']} students",
+            **result
+        })
+    
+    @action(detail=False, methods=['post'])
+    def bulk_upsert(self, request):
+        """Save term attendance totals for a whole class in one request"""
+        return bulk_upsert_response(request, Attendance, ATTENDANCE_FIELDS)
+    
+    @action(detail=False, methods=['get'])
+    def register(self, request):
+        """Get the daily register for a class"""
+        class_id = request.query_params.get('class_id')
+        date = timezone.localdate()
+        if request.query_params.get('date'):
+            date = parse_register_date(request.query_params['date'])
+            if not date:
+                return Response(INVALID_DATE, status=status.HTTP_400_BAD_REQUEST)
+        class_instance, error = get_class_teacher_class(request, class_id)
+        if error:
+            return error
+        
+        register = AttendanceRegister.objects.filter(class_instance=class_instance, date=date).first()
+        statuses = register.statuses if register else {}
+        students = class_instance.students.filter(is_active=True).values('id', 'student_id', 'first_name', 'last_name')
+        
+        return Response({
+            "class_id": class_instance.id,
+            "date": str(date),
+            "marked": register is not None,
+            "students": [
+                {
+                    "id": student['id'],
+                    "student_id": student['student_id'],
+                    "name": f"{student['first_name']} {student['last_name']}",
+                    "status": STATUS_NAMES.get(statuses.get(str(student['id'])))
+                }
+                for student in students
+            ]
+        })
 
 
-class BehaviourViewSet(viewsets.ModelViewSet):
+class BehaviourViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Behaviour/Conduct management"""
     queryset = Behaviour.objects.all()
     serializer_class = BehaviourSerializer
@@ -255,9 +472,14 @@ class BehaviourViewSet(viewsets.ModelViewSet):
             
             return queryset
         return Behaviour.objects.none()
+    
+    @action(detail=False, methods=['post'])
+    def bulk_upsert(self, request):
+        """Save conduct ratings for a whole class in one request"""
+        return bulk_upsert_response(request, Behaviour, BEHAVIOUR_FIELDS)
 
 
-class StudentPromotionViewSet(viewsets.ReadOnlyModelViewSet):
+class StudentPromotionViewSet(TenantContextMixin, viewsets.ReadOnlyModelViewSet):
     """Student promotion history"""
     queryset = StudentPromotion.objects.all()
     serializer_class = StudentPromotionSerializer
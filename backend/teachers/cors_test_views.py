@@ -9,8 +9,7 @@ import json
 @csrf_exempt
 def cors_test(request):
     """Test endpoint to verify CORS configuration"""
-    
-    response = JsonResponse({
+    return JsonResponse({
         'status': 'success',
         'message': 'CORS is working correctly!',
         'method': request.method,
@@ -18,19 +17,6 @@ def cors_test(request):
         'user_agent': request.META.get('HTTP_USER_AGENT', 'Unknown'),
         'headers': dict(request.headers)
     })
-    
-    # Add explicit CORS headers
-    response['Access-Control-Allow-Origin'] = '*'
-    response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS, HEAD, PATCH'
-    response['Access-Control-Allow-Headers'] = (
-        'Accept, Accept-Encoding, Accept-Language, Authorization, Content-Type, '
-        'DNT, Origin, User-Agent, X-CSRFToken, X-Requested-With, Cache-Control'
-    )
-    response['Access-Control-Allow-Credentials'] = 'true'
-    response['Access-Control-Max-Age'] = '86400'
-    response['Vary'] = 'Origin'
-    
-    return response
 
 @csrf_exempt
 @require_http_methods(["GET", "POST", "OPTIONS"])
@@ -65,15 +51,4 @@ def teacher_cors_test(request):
             'note': 'This endpoint tests CORS for teacher operations without authentication requirements.'
         })
     
-    # Add explicit CORS headers
-    response['Access-Control-Allow-Origin'] = '*'
-    response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS, HEAD, PATCH'
-    response['Access-Control-Allow-Headers'] = (
-        'Accept, Accept-Encoding, Accept-Language, Authorization, Content-Type, '
-        'DNT, Origin, User-Agent, X-CSRFToken, X-Requested-With, Cache-Control'
-    )
-    response['Access-Control-Allow-Credentials'] = 'true'
-    response['Access-Control-Max-Age'] = '86400'
-    response['Vary'] = 'Origin'
-    
     return response
\ No newline at end of file
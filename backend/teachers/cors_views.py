@@ -1,5 +1,6 @@
 """
-Direct CORS-enabled teacher endpoint as a backup solution
+Direct teacher endpoint as a backup solution; CORS headers come from
+school_report_saas.cors like every other response
 """
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
@@ -16,34 +17,22 @@ from .serializers import TeacherSerializer
 
 User = get_user_model()
 
-def add_cors_headers(response):
-    """Add CORS headers to any response"""
-    response['Access-Control-Allow-Origin'] = '*'
-    response['Access-Control-Allow-Methods'] = 'GET, POST, PUT, DELETE, OPTIONS'
-    response['Access-Control-Allow-Headers'] = 'Content-Type, Authorization, X-Requested-With, Origin'
-    response['Access-Control-Allow-Credentials'] = 'true'
-    response['Access-Control-Max-Age'] = '3600'
-    return response
-
 @csrf_exempt
 def teachers_cors_endpoint(request):
-    """Teacher endpoint with explicit CORS handling"""
+    """Teacher endpoint outside DRF"""
     
-    # Handle preflight OPTIONS request
+    # Plain OPTIONS; CORS preflights are answered by school_report_saas.cors
     if request.method == 'OPTIONS':
-        response = JsonResponse({'status': 'ok'})
-        return add_cors_headers(response)
+        return JsonResponse({'status': 'ok'})
     
     # Handle GET request (list teachers)
     if request.method == 'GET':
         try:
             teachers = Teacher.objects.all()
             serializer = TeacherSerializer(teachers, many=True)
-            response = JsonResponse({'results': serializer.data})
-            return add_cors_headers(response)
+            return JsonResponse({'results': serializer.data})
         except Exception as e:
-            response = JsonResponse({'error': str(e)}, status=500)
-            return add_cors_headers(response)
+            return JsonResponse({'error': str(e)}, status=500)
     
     # Handle POST request (create teacher)
     if request.method == 'POST':
@@ -61,8 +50,7 @@ def teachers_cors_endpoint(request):
             
             # Check if user exists
             if User.objects.filter(email=user_data['email']).exists():
-                response = JsonResponse({'error': 'User with this email already exists'}, status=400)
-                return add_cors_headers(response)
+                return JsonResponse({'error': 'User with this email already exists'}, status=400)
             
             # Create user
             user = User.objects.create_user(**user_data)
@@ -80,16 +68,12 @@ def teachers_cors_endpoint(request):
             teacher = Teacher.objects.create(**teacher_data)
             serializer = TeacherSerializer(teacher)
             
-            response = JsonResponse(serializer.data, status=201)
-            return add_cors_headers(response)
+            return JsonResponse(serializer.data, status=201)
             
         except json.JSONDecodeError:
-            response = JsonResponse({'error': 'Invalid JSON'}, status=400)
-            return add_cors_headers(response)
+            return JsonResponse({'error': 'Invalid JSON'}, status=400)
         except Exception as e:
-            response = JsonResponse({'error': str(e)}, status=500)
-            return add_cors_headers(response)
+            return JsonResponse({'error': str(e)}, status=500)
     
     # Method not allowed
-    response = JsonResponse({'error': 'Method not allowed'}, status=405)
-    return add_cors_headers(response)
\ No newline at end of file
+    return JsonResponse({'error': 'Method not allowed'}, status=405)
\ No newline at end of file
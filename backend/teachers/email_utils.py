@@ -1,60 +1,93 @@
-from django.core.mail import send_mail
-from django.template.loader import render_to_string
-from django.utils.html import strip_tags
+from urllib.parse import urlencode
 from django.conf import settings
+from django.contrib.auth.tokens import default_token_generator
+from django.utils.encoding import force_bytes
+from django.utils.http import urlsafe_base64_encode
+from notifications.outbox import queue_email
 import logging
 
 logger = logging.getLogger(__name__)
 
 
-def send_teacher_welcome_email(teacher, password, assigned_class=None, subjects=None):
+def _teacher_context(teacher):
+    """Plain values the email templates read, safe to store as JSON in the outbox"""
+    school = teacher.school
+    return {
+        'teacher': {
+            'employee_id': teacher.employee_id,
+            'user': {'first_name': teacher.user.first_name, 'last_name': teacher.user.last_name},
+        },
+        'school': {'name': school.name, 'email': school.email, 'phone': school.phone_number},
+    }
+
+
+def set_password_url(user):
+    """
+    One-time link to the frontend's set-password page
+
+    The token covers the password hash and last login, so it stops working once
+    the password is set or the user signs in, and after PASSWORD_RESET_TIMEOUT.
+    """
+    uid = urlsafe_base64_encode(force_bytes(user.pk))
+    return f"{settings.FRONTEND_URL}/set-password?{urlencode({'uid': uid, 'token': default_token_generator.make_token(user)})}"
+
+
+def welcome_email(teacher, assigned_class=None, subjects=None):
+    """
+    Outbox message (see notifications.outbox.queue_emails) welcoming a new teacher
+
+    The email carries a set-password link rather than the password, so no
+    credential is stored in the outbox.
+    """
+    context = {
+        **_teacher_context(teacher),
+        'email': teacher.user.email,
+        'set_password_url': set_password_url(teacher.user),
+        'login_url': f"{settings.FRONTEND_URL}/login" if hasattr(settings, 'FRONTEND_URL') else "https://elitetechreport.netlify.app/login",
+        'assigned_class': {
+            'level': assigned_class.level,
+            'level_display': assigned_class.get_level_display(),
+            'section': assigned_class.section,
+        } if assigned_class else None,
+        'subjects': [
+            {'name': subject.name, 'description': subject.description}
+            for subject in subjects or []
+        ],
+    }
+    return {
+        'to_email': teacher.user.email,
+        'subject': f'Welcome to {teacher.school.name} - Your Teaching Account Details',
+        'template_name': 'emails/teacher_welcome.html',
+        'context': context,
+        'school': teacher.school,
+    }
+
+
+def send_teacher_welcome_email(teacher, assigned_class=None, subjects=None):
     """
-    Send welcome email to newly created teacher with login credentials and assignments
+    Queue the welcome email for a newly created teacher with a set-password link and assignments
+    
+    The email is written to the outbox in the caller's transaction and delivered
+    by the send_outbox command, so the request never waits on the mail server.
     
     Args:
         teacher: Teacher instance
-        password: Plain text password for the teacher
         assigned_class: Class instance if teacher is assigned as form/class teacher
         subjects: List of Subject instances if teacher has subject specializations
     """
     try:
-        # Prepare context for email template
-        context = {
-            'teacher': teacher,
-            'school': teacher.school,
-            'email': teacher.user.email,
-            'password': password,
-            'login_url': f"{settings.FRONTEND_URL}/login" if hasattr(settings, 'FRONTEND_URL') else "https://elitetechreport.netlify.app/login",
-            'assigned_class': assigned_class,
-            'subjects': subjects or [],
-        }
-        
-        # Render email template
-        subject = f'Welcome to {teacher.school.name} - Your Teaching Account Details'
-        html_message = render_to_string('emails/teacher_welcome.html', context)
-        plain_message = strip_tags(html_message)
-        
-        # Send email
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[teacher.user.email],
-            fail_silently=False,
-        )
-        
-        logger.info(f"Welcome email sent successfully to teacher: {teacher.user.email}")
+        queue_email(**welcome_email(teacher, assigned_class, subjects))
+        logger.info(f"Welcome email queued for teacher: {teacher.user.email}")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send welcome email to teacher {teacher.user.email}: {str(e)}")
+        logger.error(f"Failed to queue welcome email for teacher {teacher.user.email}: {str(e)}")
         return False
 
 
 def send_teacher_assignment_email(teacher, assignment_type, assignment_details):
     """
-    Send email notification when teacher gets new assignments
+    Queue an email notification for when a teacher gets new assignments
     
     Args:
         teacher: Teacher instance
@@ -63,28 +96,22 @@ def send_teacher_assignment_email(teacher, assignment_type, assignment_details):
     """
     try:
         context = {
-            'teacher': teacher,
-            'school': teacher.school,
+            **_teacher_context(teacher),
             'assignment_type': assignment_type,
             'assignment_details': assignment_details,
         }
         
-        subject = f'New Teaching Assignment - {teacher.school.name}'
-        html_message = render_to_string('emails/teacher_assignment.html', context)
-        plain_message = strip_tags(html_message)
-        
-        send_mail(
-            subject=subject,
-            message=plain_message,
-            html_message=html_message,
-            from_email=settings.DEFAULT_FROM_EMAIL,
-            recipient_list=[teacher.user.email],
-            fail_silently=False,
+        queue_email(
+            to_email=teacher.user.email,
+            subject=f'New Teaching Assignment - {teacher.school.name}',
+            template_name='emails/teacher_assignment.html',
+            context=context,
+            school=teacher.school,
         )
         
-        logger.info(f"Assignment email sent successfully to teacher: {teacher.user.email}")
+        logger.info(f"Assignment email queued for teacher: {teacher.user.email}")
         return True
         
     except Exception as e:
-        logger.error(f"Failed to send assignment email to teacher {teacher.user.email}: {str(e)}")
+        logger.error(f"Failed to queue assignment email for teacher {teacher.user.email}: {str(e)}")
         return False
\ No newline at end of file
@@ -0,0 +1,184 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from notifications.outbox import queue_emails
+from schools.dashboard import invalidate_dashboard
+from schools.models import Class
+from schools.stats import adjust_stats
+from students.importer import clean_cell
+from .email_utils import welcome_email
+from .models import Teacher
+
+User = get_user_model()
+
+# Expected columns: employee_id, first_name, last_name, email, phone_number,
+# password, hire_date, qualification, experience_years, emergency_contact,
+# address, class_id
+COLUMNS = [
+    'employee_id', 'first_name', 'last_name', 'email', 'phone_number',
+    'password', 'hire_date', 'qualification', 'experience_years',
+    'emergency_contact', 'address', 'class_id',
+]
+REQUIRED_COLUMNS = ['employee_id', 'first_name', 'last_name', 'email', 'hire_date']
+USER_COLUMNS = {'first_name', 'last_name', 'email', 'phone_number', 'password'}
+MIN_PASSWORD_LENGTH = 6
+
+
+class TeacherImporter:
+    """
+    Create teacher accounts from spreadsheet rows in one transaction.
+
+    Emails and employee_ids already in use are found with one query each, users
+    and teachers are inserted with bulk_create and the welcome emails go to the
+    outbox in the same transaction. The welcome email carries a set-password
+    link, so rows without a password get an unusable one, which costs no hashing.
+
+    Passwords are hashed in the request thread (PBKDF2 takes a few hundred
+    milliseconds each), so a file may hold at most TEACHER_IMPORT_MAX_ROWS rows.
+    """
+
+    def __init__(self, school):
+        self.school = school
+        # class id -> current class teacher id, for the optional class assignment
+        self.classes = dict(Class.objects.filter(school=school).values_list('id', 'class_teacher_id'))
+        self.total_rows = 0
+        self.errors = []
+
+    def run(self, rows):
+        pending = []
+        for row_num, row in rows:
+            if not any(clean_cell(value) is not None for value in row):
+                continue
+            self.total_rows += 1
+            if self.total_rows > settings.TEACHER_IMPORT_MAX_ROWS:
+                raise ValueError(f"at most {settings.TEACHER_IMPORT_MAX_ROWS} teachers can be imported per file")
+            built = self._build(row_num, row)
+            if built is not None:
+                pending.append(built)
+
+        pending = self._drop_existing(pending)
+        created = self._create(pending) if pending else 0
+        return {
+            'total_rows': self.total_rows,
+            'created': created,
+            'errors': [f"Row {row_num}: {message}" for row_num, message in sorted(self.errors, key=lambda error: error[0])],
+        }
+
+    def _build(self, row_num, row):
+        values = [clean_cell(value) for value in list(row)[:len(COLUMNS)]]
+        values += [None] * (len(COLUMNS) - len(values))
+        data = dict(zip(COLUMNS, values))
+
+        missing = [column for column in REQUIRED_COLUMNS if data[column] is None]
+        if missing:
+            self.errors.append((row_num, f"missing {', '.join(missing)}"))
+            return None
+
+        for column in ('employee_id', 'first_name', 'last_name', 'email', 'phone_number', 'password',
+                       'qualification', 'emergency_contact', 'address'):
+            if data[column] is not None:
+                data[column] = str(data[column])
+
+        password = data['password']
+        if password is not None and len(password) < MIN_PASSWORD_LENGTH:
+            self.errors.append((row_num, f"password must be at least {MIN_PASSWORD_LENGTH} characters"))
+            return None
+
+        class_id = data.pop('class_id')
+        if class_id is not None:
+            try:
+                class_id = int(class_id)
+            except (TypeError, ValueError):
+                class_id = None
+            if class_id not in self.classes:
+                self.errors.append((row_num, "class does not belong to this school"))
+                return None
+            if self.classes[class_id] is not None:
+                self.errors.append((row_num, "class already has a class teacher"))
+                return None
+            # Later rows cannot take the same class
+            self.classes[class_id] = True
+
+        user = User(
+            email=User.objects.normalize_email(data['email']),
+            first_name=data['first_name'],
+            last_name=data['last_name'],
+            phone_number=data['phone_number'] or '',
+            role='TEACHER',
+            school=self.school,
+        )
+        teacher = Teacher(
+            school=self.school,
+            is_class_teacher=class_id is not None,
+            **{column: value for column, value in data.items() if column not in USER_COLUMNS and value is not None}
+        )
+        try:
+            user.clean_fields(exclude=['password', 'school', 'profile_picture'])
+            teacher.clean_fields(exclude=['user', 'school'])
+        except ValidationError as e:
+            messages = '; '.join(f"{field}: {' '.join(errors)}" for field, errors in e.message_dict.items())
+            self.errors.append((row_num, messages))
+            if class_id is not None:
+                self.classes[class_id] = None
+            return None
+        return row_num, user, teacher, password, class_id
+
+    def _drop_existing(self, pending):
+        """Drop rows whose email or employee_id is taken, in the file or the database"""
+        taken_emails = set(User.objects.filter(
+            email__in=[user.email for _, user, _, _, _ in pending]
+        ).values_list('email', flat=True))
+        taken_ids = set(Teacher.objects.filter(
+            employee_id__in=[teacher.employee_id for _, _, teacher, _, _ in pending]
+        ).values_list('employee_id', flat=True))
+
+        kept = []
+        for item in pending:
+            row_num, user, teacher, _, class_id = item
+            if user.email in taken_emails:
+                self.errors.append((row_num, f"email {user.email} already exists"))
+            elif teacher.employee_id in taken_ids:
+                self.errors.append((row_num, f"employee_id {teacher.employee_id} already exists"))
+            else:
+                taken_emails.add(user.email)
+                taken_ids.add(teacher.employee_id)
+                kept.append(item)
+                continue
+            if class_id is not None:
+                self.classes[class_id] = None
+        return kept
+
+    def _create(self, pending):
+        users = []
+        for _, user, _, password, _ in pending:
+            # make_password(None) is an unusable password until the link is used
+            user.password = make_password(password)
+            users.append(user)
+
+        classes = {cls.id: cls for cls in Class.objects.filter(id__in=[c for *_, c in pending if c is not None])}
+        with transaction.atomic():
+            User.objects.bulk_create(users)
+            teachers = []
+            for _, user, teacher, _, _ in pending:
+                teacher.user = user
+                teachers.append(teacher)
+            Teacher.objects.bulk_create(teachers)
+
+            assigned = []
+            for _, user, _, _, class_id in pending:
+                if class_id is not None:
+                    classes[class_id].class_teacher = user
+                    assigned.append(classes[class_id])
+            if assigned:
+                Class.objects.bulk_update(assigned, ['class_teacher'])
+
+            queue_emails(
+                welcome_email(teacher, classes.get(class_id))
+                for _, _, teacher, _, class_id in pending
+            )
+            # bulk_create and bulk_update skip the post_save handlers
+            adjust_stats(school_id=self.school.id, teachers=len(pending))
+        invalidate_dashboard(self.school.id)
+        return len(pending)
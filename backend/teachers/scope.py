@@ -0,0 +1,74 @@
+"""
+What a teacher is allowed to see and edit.
+
+A teacher's reach is the classes they are class teacher of plus the class
+subjects assigned to them. It is loaded with two queries, cached per user in the
+shared cache and dropped by teachers.signals whenever Class.class_teacher or
+ClassSubject.teacher changes. The short TTL bounds how long a missed invalidation
+can last; with a per-process cache (settings.CACHE_USER_STATE off) it is not
+cached at all.
+"""
+
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import cache
+
+from schools.models import Class, ClassSubject
+
+TEACHER_SCOPE_TTL = 5 * 60
+
+
+def teacher_scope_cache_key(user_id):
+    return f"teacher-scope:{user_id}"
+
+
+def invalidate_teacher_scope(*user_ids):
+    keys = [teacher_scope_cache_key(user_id) for user_id in user_ids if user_id]
+    if keys:
+        cache.delete_many(keys)
+
+
+class TeacherScope:
+    """Class ids, class subject ids and subject ids per class for one teacher"""
+
+    def __init__(self, class_ids=(), assignments=()):
+        # Classes the teacher is class (form) teacher of
+        self.class_ids = frozenset(class_ids)
+        # (class_subject_id, class_id, subject_id) for each subject assignment
+        self.assignments = tuple(assignments)
+        self.class_subject_ids = frozenset(class_subject_id for class_subject_id, _, _ in self.assignments)
+        subjects = defaultdict(set)
+        for _, class_id, subject_id in self.assignments:
+            subjects[class_id].add(subject_id)
+        self.subject_ids_by_class = {class_id: frozenset(ids) for class_id, ids in subjects.items()}
+
+    @classmethod
+    def load(cls, user):
+        return cls(
+            class_ids=Class.objects.filter(school_id=user.school_id, class_teacher=user).values_list('id', flat=True),
+            assignments=ClassSubject.objects.filter(teacher=user).values_list('id', 'class_instance_id', 'subject_id'),
+        )
+
+    @property
+    def visible_class_ids(self):
+        """Classes whose students the teacher can see: form classes and taught classes"""
+        return self.class_ids | self.subject_ids_by_class.keys()
+
+    def is_class_teacher_of(self, class_id):
+        return class_id in self.class_ids
+
+    def teaches(self, class_subject_id):
+        return class_subject_id in self.class_subject_ids
+
+
+def get_teacher_scope(user):
+    """The cached TeacherScope for ``user``, loading it on a miss"""
+    if not settings.CACHE_USER_STATE:
+        return TeacherScope.load(user)
+    key = teacher_scope_cache_key(user.id)
+    scope = cache.get(key)
+    if scope is None:
+        scope = TeacherScope.load(user)
+        cache.set(key, scope, TEACHER_SCOPE_TTL)
+    return scope
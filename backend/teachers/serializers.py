@@ -98,7 +98,6 @@ class TeacherCreateSerializer(serializers.ModelSerializer):
         """Create user account and teacher profile with optional class assignment"""
         # Extract user fields
         class_id = validated_data.pop('class_id', None)
-        password = validated_data['password']  # Store password for email
         
         user_data = {
             'first_name': validated_data.pop('first_name'),
@@ -137,19 +136,29 @@ class TeacherCreateSerializer(serializers.ModelSerializer):
             except Class.DoesNotExist:
                 logger.warning(f"Class with id {class_id} not found for teacher {user.email}")
         
-        # Send welcome email with login credentials and assignments
+        # Send welcome email with a set-password link and assignments
         try:
             email_sent = send_teacher_welcome_email(
                 teacher=teacher,
-                password=password,
                 assigned_class=assigned_class,
                 subjects=list(specializations)
             )
             if email_sent:
-                logger.info(f"Welcome email sent successfully to {user.email}")
+                logger.info(f"Welcome email queued for {user.email}")
             else:
-                logger.warning(f"Failed to send welcome email to {user.email}")
+                logger.warning(f"Failed to queue welcome email for {user.email}")
         except Exception as e:
-            logger.error(f"Error sending welcome email to {user.email}: {str(e)}")
+            logger.error(f"Error queueing welcome email for {user.email}: {str(e)}")
         
-        return teacher
\ No newline at end of file
+        return teacher
+
+
+class BulkTeacherUploadSerializer(serializers.Serializer):
+    """Serializer for bulk teacher import via Excel or CSV"""
+    file = serializers.FileField()
+    
+    def validate_file(self, value):
+        from students.importer import SUPPORTED_EXTENSIONS
+        if not value.name.lower().endswith(SUPPORTED_EXTENSIONS):
+            raise serializers.ValidationError("Upload an .xlsx or .csv file")
+        return value
@@ -0,0 +1,53 @@
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.dispatch import receiver
+from schools.models import Class, ClassSubject
+from .scope import invalidate_teacher_scope
+
+
+# pre_save reads the stored teacher so a reassignment clears both scopes
+
+TEACHER_FIELDS = {
+    Class: 'class_teacher_id',
+    ClassSubject: 'teacher_id',
+}
+# Marks a save whose update_fields leave the teacher alone
+UNCHANGED = object()
+
+
+@receiver(pre_save, sender=Class)
+@receiver(pre_save, sender=ClassSubject)
+def load_previous_teacher(sender, instance, update_fields=None, **kwargs):
+    attname = TEACHER_FIELDS[sender]
+    if instance._state.adding:
+        instance._scope_teacher_id = None
+    elif update_fields is not None and attname not in {sender._meta.get_field(name).attname for name in update_fields}:
+        instance._scope_teacher_id = UNCHANGED
+    else:
+        instance._scope_teacher_id = sender._base_manager.filter(pk=instance.pk).values_list(attname, flat=True).first()
+
+
+@receiver(post_save, sender=Class)
+def class_teacher_changed(sender, instance, created, **kwargs):
+    if instance._scope_teacher_id is UNCHANGED:
+        return
+    if created or instance.class_teacher_id != instance._scope_teacher_id:
+        invalidate_teacher_scope(instance._scope_teacher_id, instance.class_teacher_id)
+
+
+@receiver(post_save, sender=ClassSubject)
+def subject_teacher_changed(sender, instance, created, **kwargs):
+    if instance._scope_teacher_id is UNCHANGED:
+        return
+    # A new assignment changes the teacher's class subject ids even without a reassignment
+    if created or instance.teacher_id != instance._scope_teacher_id:
+        invalidate_teacher_scope(instance._scope_teacher_id, instance.teacher_id)
+
+
+@receiver(post_delete, sender=Class)
+def class_removed(sender, instance, **kwargs):
+    invalidate_teacher_scope(instance.class_teacher_id)
+
+
+@receiver(post_delete, sender=ClassSubject)
+def subject_assignment_removed(sender, instance, **kwargs):
+    invalidate_teacher_scope(instance.teacher_id)
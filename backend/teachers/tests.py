@@ -0,0 +1,32 @@
+from datetime import date
+
+from django.test import TestCase, override_settings
+
+from accounts.models import User
+from notifications.models import OutboxEmail
+from schools.tests import make_school
+from .importer import TeacherImporter
+
+
+class TeacherImporterTests(TestCase):
+    def setUp(self):
+        self.school, _ = make_school()
+
+    def row(self, n, password=None):
+        return [f'T{n}', 'Ama', 'Owusu', f'teacher{n}@example.com', '', password, date(2024, 9, 1)]
+
+    def test_creates_teachers_with_link_instead_of_generated_password(self):
+        result = TeacherImporter(self.school).run(enumerate([self.row(1, 'given-pass'), self.row(2)], start=2))
+        self.assertEqual((result['created'], result['errors']), (2, []))
+
+        self.assertTrue(User.objects.get(email='teacher1@example.com').check_password('given-pass'))
+        self.assertFalse(User.objects.get(email='teacher2@example.com').has_usable_password())
+        contexts = OutboxEmail.objects.values_list('context', flat=True)
+        self.assertTrue(all('set_password_url' in c and 'password' not in c for c in contexts))
+
+    @override_settings(TEACHER_IMPORT_MAX_ROWS=2)
+    def test_rejects_files_over_the_row_limit(self):
+        rows = enumerate([self.row(n) for n in range(3)], start=2)
+        with self.assertRaisesMessage(ValueError, 'at most 2 teachers'):
+            TeacherImporter(self.school).run(rows)
+        self.assertFalse(User.objects.filter(role='TEACHER').exists())
@@ -1,12 +1,16 @@
 from rest_framework import viewsets, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from school_report_saas.tenant import TenantContextMixin
 from django.contrib.auth import get_user_model
 from django.db import transaction
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 from .models import Teacher
-from .serializers import TeacherSerializer, TeacherCreateSerializer
+from .serializers import TeacherSerializer, TeacherCreateSerializer, BulkTeacherUploadSerializer
+from .importer import TeacherImporter
+from .scope import TeacherScope
+from students.importer import iter_rows
 from schools.models import Class, ClassSubject
 
 User = get_user_model()
@@ -30,7 +34,7 @@ class CORSPermission(permissions.BasePermission):
 
 
 @method_decorator(csrf_exempt, name='dispatch')
-class TeacherViewSet(viewsets.ModelViewSet):
+class TeacherViewSet(TenantContextMixin, viewsets.ModelViewSet):
     """Teacher CRUD operations"""
     queryset = Teacher.objects.all()
     permission_classes = [CORSPermission]
@@ -106,18 +110,15 @@ class TeacherViewSet(viewsets.ModelViewSet):
                 'error': 'Authentication required'
             }, status=status.HTTP_401_UNAUTHORIZED)
             
-        user = request.user
+        scope = self.tenant.teacher_scope or TeacherScope.load(request.user)
         
         # Get classes where user is class teacher
-        class_teacher_assignments = Class.objects.filter(
-            school=user.school,
-            class_teacher=user
-        )
+        class_teacher_assignments = Class.objects.filter(id__in=scope.class_ids) if scope.class_ids else []
         
         # Get subject teaching assignments
         subject_assignments = ClassSubject.objects.filter(
-            teacher=user
-        ).select_related('class_instance', 'subject')
+            id__in=scope.class_subject_ids
+        ).select_related('class_instance', 'subject') if scope.class_subject_ids else []
         
         # Build response with both types
         results = []
@@ -202,7 +203,7 @@ class TeacherViewSet(viewsets.ModelViewSet):
                 # Prepare response with teacher data
                 from .serializers import TeacherSerializer
                 response_data = TeacherSerializer(teacher).data
-                response_data['message'] = f"Teacher {teacher.get_full_name()} created successfully! Welcome email with login credentials has been sent to {teacher.user.email}."
+                response_data['message'] = f"Teacher {teacher.get_full_name()} created successfully! A welcome email with login credentials will be sent to {teacher.user.email}."
                 
                 return Response(
                     response_data, 
@@ -220,6 +221,44 @@ class TeacherViewSet(viewsets.ModelViewSet):
                 'detail': str(e)
             }, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
     
+    @action(detail=False, methods=['post'])
+    def bulk_upload(self, request):
+        """Create teacher accounts from an Excel or CSV file"""
+        if not request.user.is_authenticated or not request.user.school:
+            return Response({
+                'error': 'No school associated',
+                'detail': 'User must be associated with a school to create teachers'
+            }, status=status.HTTP_403_FORBIDDEN)
+        if not (request.user.is_school_admin or request.user.is_principal):
+            return Response(
+                {"error": "Only school admins and principals can create teachers"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        serializer = BulkTeacherUploadSerializer(data=request.data)
+        if not serializer.is_valid():
+            return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
+        
+        try:
+            result = TeacherImporter(request.user.school).run(iter_rows(serializer.validated_data['file']))
+        except ImportError:
+            return Response(
+                {"error": "openpyxl is not installed. Please add 'openpyxl' to requirements to enable bulk upload."},
+                status=status.HTTP_501_NOT_IMPLEMENTED
+            )
+        except Exception as e:
+            return Response(
+                {"error": f"Failed to process file: {str(e)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        return Response({
+            "message": f"Successfully created {result['created']} teachers",
+            "created_count": result['created'],
+            "total_rows": result['total_rows'],
+            "errors": result['errors']
+        }, status=status.HTTP_201_CREATED)
+    
     @action(detail=True, methods=['get'])
     def teaching_schedule(self, request, pk=None):
         """Get teacher's complete teaching schedule"""
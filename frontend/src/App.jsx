@@ -1,6 +1,7 @@
 import { Routes, Route, Navigate } from 'react-router-dom'
 import Login from './pages/Login'
 import RegisterSchool from './pages/RegisterSchool'
+import SetPassword from './pages/SetPassword'
 import Landing from './pages/Landing'
 import Teachers from './pages/Teachers'
 import Dashboard from './pages/Dashboard'
@@ -22,6 +23,7 @@ export default function App() {
         <Route path="/" element={<Landing />} />
   <Route path="/login" element={<Login />} />
   <Route path="/register-school" element={<RegisterSchool />} />
+  <Route path="/set-password" element={<SetPassword />} />
         <Route
           path="/*"
           element={
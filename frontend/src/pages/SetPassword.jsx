@@ -0,0 +1,145 @@
+import { useState } from 'react'
+import { Link, useNavigate, useSearchParams } from 'react-router-dom'
+import api from '../utils/api'
+import { FaGraduationCap } from 'react-icons/fa'
+
+const inputStyle = {
+  width: '100%',
+  padding: '16px',
+  fontSize: '16px', // Always 16px to prevent zoom on iOS
+  border: '2px solid #e5e7eb',
+  borderRadius: '12px',
+  outline: 'none',
+  background: 'white',
+  color: '#1f2937',
+  fontFamily: 'inherit',
+  boxSizing: 'border-box',
+  marginBottom: '20px'
+}
+
+const labelStyle = {
+  display: 'block',
+  marginBottom: '8px',
+  fontSize: '15px',
+  fontWeight: '600',
+  color: '#374151'
+}
+
+// Landing page of the one-time link in the teacher welcome email
+export default function SetPassword() {
+  const [searchParams] = useSearchParams()
+  const [password, setPassword] = useState('')
+  const [confirmPassword, setConfirmPassword] = useState('')
+  const [error, setError] = useState('')
+  const [loading, setLoading] = useState(false)
+  const navigate = useNavigate()
+
+  const handleSubmit = async (e) => {
+    e.preventDefault()
+    setError('')
+    setLoading(true)
+    try {
+      await api.post('/auth/set-password/', {
+        uid: searchParams.get('uid'),
+        token: searchParams.get('token'),
+        new_password: password,
+        confirm_password: confirmPassword
+      })
+      navigate('/login', { replace: true })
+    } catch (err) {
+      const data = err.response?.data || {}
+      const message = data.token || data.new_password || data.confirm_password || data.uid
+      setError(Array.isArray(message) ? message[0] : message || 'Could not set your password')
+    } finally {
+      setLoading(false)
+    }
+  }
+
+  return (
+    <div style={{
+      minHeight: '100vh',
+      background: 'linear-gradient(135deg, #667eea 0%, #764ba2 100%)',
+      display: 'flex',
+      alignItems: 'center',
+      justifyContent: 'center',
+      padding: '16px'
+    }}>
+      <div style={{ width: '100%', maxWidth: '420px' }}>
+        <div style={{ textAlign: 'center', marginBottom: '24px' }}>
+          <FaGraduationCap style={{ fontSize: '36px', color: 'white' }} />
+          <h1 style={{
+            margin: '8px 0 0',
+            fontSize: '28px',
+            fontWeight: '800',
+            color: 'white',
+            textShadow: '0 2px 10px rgba(0,0,0,0.3)'
+          }}>Set your password</h1>
+        </div>
+
+        <form onSubmit={handleSubmit} style={{
+          background: 'rgba(255,255,255,0.95)',
+          borderRadius: '20px',
+          padding: '28px 24px',
+          boxShadow: '0 20px 40px rgba(0,0,0,0.1)'
+        }}>
+          {error && (
+            <div style={{
+              background: '#fee2e2',
+              border: '1px solid #fca5a5',
+              color: '#dc2626',
+              padding: '12px 16px',
+              borderRadius: '12px',
+              marginBottom: '20px',
+              fontSize: '14px',
+              fontWeight: '500',
+              textAlign: 'center'
+            }}>
+              {error}
+            </div>
+          )}
+
+          <label style={labelStyle}>New Password</label>
+          <input
+            type="password"
+            value={password}
+            onChange={(e) => setPassword(e.target.value)}
+            required
+            minLength={8}
+            autoComplete="new-password"
+            style={inputStyle}
+          />
+
+          <label style={labelStyle}>Confirm Password</label>
+          <input
+            type="password"
+            value={confirmPassword}
+            onChange={(e) => setConfirmPassword(e.target.value)}
+            required
+            minLength={8}
+            autoComplete="new-password"
+            style={inputStyle}
+          />
+
+          <button type="submit" disabled={loading} style={{
+            width: '100%',
+            padding: '16px',
+            fontSize: '16px',
+            fontWeight: '700',
+            color: 'white',
+            background: 'linear-gradient(135deg, #3b82f6 0%, #1d4ed8 100%)',
+            border: 'none',
+            borderRadius: '12px',
+            cursor: loading ? 'not-allowed' : 'pointer',
+            opacity: loading ? 0.7 : 1
+          }}>
+            {loading ? 'Saving...' : 'Set Password'}
+          </button>
+
+          <p style={{ textAlign: 'center', marginTop: '16px', fontSize: '14px' }}>
+            <Link to="/login" style={{ color: '#3b82f6' }}>Back to sign in</Link>
+          </p>
+        </form>
+      </div>
+    </div>
+  )
+}